@@ -0,0 +1,415 @@
+"""Fachada assíncrona (asyncio) das árvores, com agrupamento de requisições.
+
+``ArvoreAssincrona`` envolve uma ``ArvoreAVL`` ou ``ArvoreRubroNegro`` para
+serviços que atendem muitos clientes no mesmo laço de eventos. Cada
+requisição entra numa fila única, despachada por um callback agendado no
+laço (``call_soon``); tudo o que chega na mesma volta do laço é atendido
+de uma vez:
+
+- sequências de consultas (``contem``, ``get``) são respondidas juntas,
+  com uma única chamada a ``buscar_muitos`` (ordena as chaves e desce uma
+  vez pela árvore) a partir de ``_MINIMO_BUSCAR_MUITOS`` consultas;
+- sequências de escritas (``inserir``, ``remover``, ``atribuir``) formam
+  um microlote aplicado de uma vez, na ordem de chegada, sem devolver o
+  controle ao laço entre uma escrita e outra;
+- percursos longos (``intervalo``, ``mostrar``) devolvem o controle ao
+  laço a cada ``passos_por_pausa`` chaves.
+
+A fila preserva a ordem de chegada entre leituras e escritas: uma consulta
+vê todas as escritas pedidas antes dela. Os percursos em ordem não guardam
+pilha entre as pausas: cada pedaço recomeça pelo ``sucessor`` da última
+chave produzida, em O(log n), então as escritas seguem sendo atendidas
+durante eles. O resultado é fracamente consistente, como o de um cursor:
+sai em ordem, sem repetições, com toda chave que esteve na árvore o
+percurso inteiro; chaves inseridas ou removidas no meio podem aparecer ou
+não. Pré e pós-ordem dependem da forma da árvore, então as escritas que
+chegam durante esses percursos esperam eles terminarem.
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import Callable, Iterator
+from itertools import islice
+
+from avl import ArvoreAVL
+from binaria_de_busca import ArvoreBST, Chave, NoBST
+
+_CONTEM = 0
+_OBTER = 1
+_INSERIR = 2
+_REMOVER = 3
+_ATRIBUIR = 4
+_PERCORRER = 5
+_VARRER = 6
+
+# Grupos de consultas a partir deste tamanho descem juntos por
+# ``buscar_muitos``, qualquer que seja o tamanho da árvore; abaixo dele a
+# ordenação das chaves custa mais do que o caminho comum economiza.
+_MINIMO_BUSCAR_MUITOS = 16
+
+# Requisições do mesmo grupo são atendidas juntas: 0 leitura, 1 escrita.
+_GRUPO = {_CONTEM: 0, _OBTER: 0, _INSERIR: 1, _REMOVER: 1, _ATRIBUIR: 1}
+
+
+class _Varredura:
+    """Percurso em ordem por ``[a, b)`` retomável pela última chave produzida.
+
+    ``a`` ou ``b`` ``None`` deixam o intervalo aberto daquele lado.
+    """
+
+    __slots__ = ("a", "b", "reverso", "chaves")
+
+    def __init__(self, a: Chave | None, b: Chave | None, reverso: bool):
+        self.a = a
+        self.b = b
+        self.reverso = reverso
+        self.chaves = []
+
+    def avancar(self, arvore: ArvoreBST, passos: int) -> bool:
+        """Produz até ``passos`` chaves; retorna ``True`` se o percurso acabou."""
+        a, b, chaves = self.a, self.b, self.chaves
+        if self.reverso:
+            if chaves:
+                no = arvore.antecessor(chaves[-1])
+            elif b is not None:
+                no = arvore.antecessor(b)
+            else:
+                no = arvore.raiz
+                while no is not None and no.direita is not None:
+                    no = no.direita
+            while no is not None and (a is None or not no.chave < a):
+                if not passos:
+                    return False
+                chaves.append(no.chave)
+                passos -= 1
+                no = arvore._anterior(no)
+        else:
+            if chaves:
+                no = arvore.sucessor(chaves[-1])
+            elif a is not None:
+                no = arvore.teto(a)
+            else:
+                no = arvore.raiz
+                while no is not None and no.esquerda is not None:
+                    no = no.esquerda
+            while no is not None and (b is None or no.chave < b):
+                if not passos:
+                    return False
+                chaves.append(no.chave)
+                passos -= 1
+                no = arvore._proximo(no)
+        return True
+
+
+class ArvoreAssincrona:
+    """Árvore balanceada para uso dentro de um laço asyncio.
+
+    Todos os métodos de acesso são corrotinas e devem ser aguardados no
+    laço que a usa; a instância não é segura entre threads (para isso há
+    ``ArvoreConcorrente``).
+
+    Args:
+        classe (optional): ``ArvoreAVL`` (padrão) ou ``ArvoreRubroNegro``.
+        mapa (bool, optional): Guarda valores (ver ``ArvoreBST``).
+        key (Callable | None, optional): Função de chave (ver ``ArvoreBST``).
+        passos_por_pausa (int, optional): Chaves produzidas por um percurso
+            entre duas devoluções do controle ao laço.
+        lote_maximo (int, optional): Requisições atendidas por volta do
+            laço; o excedente fica para a volta seguinte.
+
+    Raises:
+        ValueError: Se ``passos_por_pausa`` ou ``lote_maximo`` não forem
+            positivos.
+    """
+
+    def __init__(
+        self,
+        classe=ArvoreAVL,
+        mapa: bool = False,
+        key: Callable | None = None,
+        passos_por_pausa: int = 1024,
+        lote_maximo: int = 4096,
+    ):
+        if passos_por_pausa < 1:
+            raise ValueError("passos_por_pausa deve ser pelo menos 1.")
+        if lote_maximo < 1:
+            raise ValueError("lote_maximo deve ser pelo menos 1.")
+        self._arvore: ArvoreBST = classe(mapa, key)
+        self._passos_por_pausa = passos_por_pausa
+        self._lote_maximo = lote_maximo
+        self._fila = deque()
+        self._agendado = False
+        self._percursos = 0
+        self._tarefas = set()
+
+    def __len__(self) -> int:
+        return len(self._arvore)
+
+    # Consultas agrupadas
+
+    async def contem(self, chave: Chave) -> bool:
+        """Indica se a ``chave`` está na árvore.
+
+        Args:
+            chave (Chave): Chave procurada.
+
+        Returns:
+            bool: ``True`` se a chave existe.
+        """
+        return await self._enfileirar(_CONTEM, chave)
+
+    async def get(self, chave: Chave, padrao=None):
+        """Retorna o valor da ``chave`` (modo mapa), ou ``padrao``.
+
+        Raises:
+            TypeError: Se a árvore não guardar valores.
+        """
+        self._arvore._exigir_mapa()
+        return await self._enfileirar(_OBTER, chave, padrao)
+
+    # Escritas em microlotes
+
+    async def inserir(self, item) -> bool:
+        """Insere uma chave (ou item, no modo ``key``).
+
+        Returns:
+            bool: ``True`` se a chave era nova.
+        """
+        return await self._enfileirar(_INSERIR, None, item)
+
+    async def remover(self, chave: Chave) -> bool:
+        """Remove a ``chave``.
+
+        Returns:
+            bool: ``True`` se a chave existia.
+        """
+        return await self._enfileirar(_REMOVER, chave)
+
+    async def atribuir(self, chave: Chave, valor) -> None:
+        """Associa ``valor`` à ``chave`` (upsert, modo mapa).
+
+        Raises:
+            TypeError: Se a árvore não guardar valores.
+        """
+        self._arvore._exigir_mapa()
+        await self._enfileirar(_ATRIBUIR, chave, valor)
+
+    # Percursos que cedem o laço
+
+    async def intervalo(self, a: Chave, b: Chave, reverso: bool = False) -> list:
+        """Retorna as chaves em ``[a, b)``, cedendo o laço durante a leitura.
+
+        Returns:
+            list: Chaves no intervalo, em ordem (decrescente se ``reverso``).
+        """
+        return await self._enfileirar(_VARRER, None, _Varredura(a, b, reverso))
+
+    async def mostrar(self, ordem: str = "em_ordem") -> list:
+        """Retorna as chaves na ordem pedida, cedendo o laço durante a leitura.
+
+        Args:
+            ordem (str, optional): ``"pre_ordem"``, ``"em_ordem"`` (padrão)
+                ou ``"pos_ordem"``.
+
+        Returns:
+            list: Chaves na ordem escolhida.
+
+        Raises:
+            ValueError: Se ``ordem`` não for uma das opções válidas.
+        """
+        if ordem == "pre_ordem":
+            chaves = self._arvore.iter_pre_ordem()
+        elif ordem == "em_ordem":
+            return await self._enfileirar(_VARRER, None, _Varredura(None, None, False))
+        elif ordem == "pos_ordem":
+            chaves = self._arvore.iter_pos_ordem()
+        else:
+            raise ValueError(
+                "Ordem inválida. Use 'pre_ordem', 'em_ordem' ou 'pos_ordem'."
+            )
+        return await self._enfileirar(_PERCORRER, None, chaves)
+
+    # Despacho
+
+    def _enfileirar(self, tipo: int, chave: Chave, argumento=None) -> asyncio.Future:
+        """Põe uma requisição na fila e garante que o despacho está agendado."""
+        futuro = asyncio.get_running_loop().create_future()
+        self._fila.append((tipo, chave, argumento, futuro))
+        self._agendar()
+        return futuro
+
+    def _agendar(self) -> None:
+        if not self._agendado:
+            self._agendado = True
+            asyncio.get_running_loop().call_soon(self._despachar)
+
+    def _despachar(self) -> None:
+        """Atende a fila em ordem, agrupando requisições vizinhas do mesmo tipo.
+
+        Para numa escrita enquanto houver percurso em pré ou pós-ordem em
+        andamento (o fim do percurso agenda o despacho de novo) e depois de
+        ``lote_maximo`` requisições, reagendando-se para a próxima volta do
+        laço.
+        """
+        self._agendado = False
+        fila = self._fila
+        restantes = self._lote_maximo
+        while fila and restantes:
+            tipo = fila[0][0]
+            if tipo == _VARRER or tipo == _PERCORRER:
+                _, _, percurso, futuro = fila.popleft()
+                restantes -= 1
+                if futuro.done():
+                    continue
+                if tipo == _VARRER:
+                    self._varrer(percurso, futuro)
+                else:
+                    self._percursos += 1
+                    self._criar_tarefa(self._percorrer(percurso, futuro))
+                continue
+            grupo = _GRUPO[tipo]
+            if grupo and self._percursos:
+                return
+            requisicoes = []
+            while fila and len(requisicoes) < restantes:
+                if _GRUPO.get(fila[0][0]) != grupo:
+                    break
+                requisicao = fila.popleft()
+                if not requisicao[3].done():
+                    requisicoes.append(requisicao)
+            restantes -= len(requisicoes)
+            if grupo:
+                self._escrever(requisicoes)
+            else:
+                self._ler(requisicoes)
+        if fila:
+            self._agendar()
+
+    def _ler(self, requisicoes: list) -> None:
+        """Responde um grupo de consultas, numa descida ordenada se não for pequeno.
+
+        Na descida conjunta, um erro de ``buscar_muitos`` (por exemplo, uma
+        chave incomparável com as outras) é entregue a todas as consultas do
+        grupo, que foram respondidas pela mesma chamada.
+        """
+        arvore = self._arvore
+        if len(requisicoes) >= _MINIMO_BUSCAR_MUITOS:
+            try:
+                nos = arvore.buscar_muitos([chave for _, chave, _, _ in requisicoes])
+            except Exception as erro:
+                for requisicao in requisicoes:
+                    requisicao[3].set_exception(erro)
+            else:
+                for requisicao, no in zip(requisicoes, nos):
+                    self._responder(requisicao, no)
+            return
+        buscar = arvore.buscar
+        for requisicao in requisicoes:
+            try:
+                no = buscar(requisicao[1])
+            except Exception as erro:
+                requisicao[3].set_exception(erro)
+            else:
+                self._responder(requisicao, no)
+
+    @staticmethod
+    def _responder(requisicao: tuple, no: NoBST | None) -> None:
+        tipo, _, padrao, futuro = requisicao
+        if tipo == _CONTEM:
+            futuro.set_result(no is not None)
+        else:
+            futuro.set_result(padrao if no is None else no.valor)
+
+    def _escrever(self, requisicoes: list) -> None:
+        """Aplica um microlote de escritas, na ordem de chegada.
+
+        Qualquer exceção de uma escrita (inclusive da função ``key`` ou do
+        modo de depuração) vai para o futuro dela, e o microlote continua.
+
+        Ordenar o microlote e aplicá-lo a partir do dedo não compensou para
+        chaves esparsas; o ganho do microlote é atender todas as escritas
+        da volta do laço num só callback.
+        """
+        arvore = self._arvore
+        for tipo, chave, argumento, futuro in requisicoes:
+            try:
+                if tipo == _INSERIR:
+                    futuro.set_result(arvore.inserir(argumento))
+                elif tipo == _REMOVER:
+                    futuro.set_result(arvore.remover(chave))
+                else:
+                    arvore[chave] = argumento
+                    futuro.set_result(None)
+            except Exception as erro:
+                futuro.set_exception(erro)
+
+    def _criar_tarefa(self, corrotina) -> None:
+        tarefa = asyncio.get_running_loop().create_task(corrotina)
+        self._tarefas.add(tarefa)
+        tarefa.add_done_callback(self._tarefas.discard)
+
+    def _varrer(self, varredura: _Varredura, futuro: asyncio.Future) -> None:
+        """Produz o primeiro pedaço já no despacho; o resto segue numa tarefa.
+
+        Intervalos curtos são respondidos sem criar tarefa nenhuma.
+        """
+        try:
+            acabou = varredura.avancar(self._arvore, self._passos_por_pausa)
+        except Exception as erro:
+            futuro.set_exception(erro)
+            return
+        if acabou:
+            futuro.set_result(varredura.chaves)
+        else:
+            self._criar_tarefa(self._continuar_varredura(varredura, futuro))
+
+    async def _continuar_varredura(
+        self, varredura: _Varredura, futuro: asyncio.Future
+    ) -> None:
+        """Retoma ``varredura`` a cada volta do laço até ela acabar.
+
+        Se a tarefa for cancelada (por exemplo, no fechamento do laço), o
+        futuro é cancelado junto, para o cliente não esperar para sempre.
+        """
+        try:
+            while True:
+                await asyncio.sleep(0)
+                if futuro.done():
+                    return
+                try:
+                    acabou = varredura.avancar(self._arvore, self._passos_por_pausa)
+                except Exception as erro:
+                    futuro.set_exception(erro)
+                    return
+                if acabou:
+                    futuro.set_result(varredura.chaves)
+                    return
+        finally:
+            if not futuro.done():
+                futuro.cancel()
+
+    async def _percorrer(self, chaves: Iterator, futuro: asyncio.Future) -> None:
+        """Consome ``chaves`` (pré ou pós-ordem) em pedaços, cedendo o laço.
+
+        Como em ``_continuar_varredura``, o futuro nunca fica pendente: recebe
+        o resultado, o erro ou, se a tarefa for cancelada, o cancelamento.
+        """
+        resultado = []
+        try:
+            while True:
+                pedaco = list(islice(chaves, self._passos_por_pausa))
+                resultado += pedaco
+                if len(pedaco) < self._passos_por_pausa or futuro.done():
+                    break
+                await asyncio.sleep(0)
+            if not futuro.done():
+                futuro.set_result(resultado)
+        except Exception as erro:
+            if not futuro.done():
+                futuro.set_exception(erro)
+        finally:
+            if not futuro.done():
+                futuro.cancel()
+            self._percursos -= 1
+            if self._fila:
+                self._agendar()
@@ -4,29 +4,56 @@ Extende a BST com balanceamento automático por rotações após inserções
 ou remoções, garantindo altura O(log n).
 """
 
-from binaria_de_busca import NoBST, ArvoreBST
+from collections.abc import Callable
+from operator import itemgetter
+
+from binaria_de_busca import ArvoreBST, Chave, NoBST
+from instrumentacao import reequilibrio_instrumentado
 
 
 class NoAVL(NoBST):
     """Nó de uma Árvore AVL.
 
-    Herda de ``NoBST`` e adiciona `altura` e `fator_balanceamento`.
+    Herda de ``NoBST`` e adiciona `altura`. O `fator_balanceamento` é
+    derivado das alturas dos filhos em vez de ocupar um slot por nó.
     """
 
-    def __init__(self, chave: int):
+    __slots__ = ("altura",)
+
+    def __init__(self, chave: Chave):
         super().__init__(chave)
         self.altura = 1
-        self.fator_balanceamento = 0
+
+    @property
+    def fator_balanceamento(self) -> int:
+        """Diferença entre as alturas das subárvores esquerda e direita."""
+        altura_esquerda = self.esquerda.altura if self.esquerda else 0
+        altura_direita = self.direita.altura if self.direita else 0
+        return altura_esquerda - altura_direita
 
     def __str__(self) -> str:
         return f"{self.chave} (Altura: {self.altura}, FB: {self.fator_balanceamento})"
 
     def atualizar(self) -> None:
-        """Atualiza a altura e o fator de balanceamento do nó."""
+        """Atualiza a altura e o tamanho da subárvore do nó."""
         altura_esquerda = self.esquerda.altura if self.esquerda else 0
         altura_direita = self.direita.altura if self.direita else 0
         self.altura = 1 + max(altura_esquerda, altura_direita)
-        self.fator_balanceamento = altura_esquerda - altura_direita
+        self.tamanho = (
+            1
+            + (self.esquerda.tamanho if self.esquerda else 0)
+            + (self.direita.tamanho if self.direita else 0)
+        )
+
+
+class NoAVLMapa(NoAVL):
+    """Nó AVL do modo mapa: acrescenta o `valor` associado à chave."""
+
+    __slots__ = ("valor",)
+
+    def __init__(self, chave: Chave):
+        super().__init__(chave)
+        self.valor = None
 
 
 class ArvoreAVL(ArvoreBST):
@@ -35,10 +62,58 @@ class ArvoreAVL(ArvoreBST):
     Mantém |fator_balanceamento| <= 1 para todos os nós.
     Usa ``NoAVL`` como tipo de nó e as rotações herdadas da BST,
     com atualização de altura/fator a cada ajuste.
+
+    Args:
+        mapa (bool, optional): Se ``True``, usa ``NoAVLMapa`` e habilita a
+            interface de dicionário ordenado; sem ele os nós não gastam
+            memória com valores.
+        key (Callable | None, optional): Função que extrai a chave de cada
+            item inserido; implica ``mapa=True``, com o item como valor.
     """
 
-    def __init__(self):
-        super().__init__(NoAVL)
+    _TIPO_ARQUIVO = 1
+    _METODOS_INSTRUMENTADOS = ArvoreBST._METODOS_INSTRUMENTADOS + ("_reequilibrar",)
+
+    def __init__(self, mapa: bool = False, key: Callable | None = None):
+        mapa = mapa or key is not None
+        super().__init__(NoAVLMapa if mapa else NoAVL)
+        self.mapa = mapa
+        self._usar_funcao_chave(key)
+
+    @classmethod
+    def construir_em_lote(cls, chaves) -> "ArvoreAVL":
+        """Constrói uma AVL balanceada a partir de um iterável de chaves.
+
+        Chaves ordenadas são montadas em O(n) sem rotações; as demais são
+        ordenadas e deduplicadas antes. Altura e fator de balanceamento
+        são calculados de baixo para cima.
+
+        Args:
+            chaves: Iterável de chaves (ordenado ou não, com ou sem repetições).
+
+        Returns:
+            ArvoreAVL: Nova árvore contendo as chaves.
+        """
+        arvore = cls()
+        arvore._reconstruir(arvore._preparar_lote(chaves))
+        return arvore
+
+    def _reconstruir(self, chaves: list) -> None:
+        """Substitui o conteúdo da árvore por ``chaves`` (ordenadas, sem repetições).
+
+        Args:
+            chaves (list): Chaves estritamente crescentes.
+        """
+        self._definir_raiz(self._construir_balanceada(chaves, 0, len(chaves)))
+        for no in self._pos_ordem(self.raiz):
+            no.atualizar()
+
+    def _estado_no(self, no: NoAVL) -> int:
+        """A AVL grava a altura de cada nó no instantâneo."""
+        return no.altura
+
+    def _restaurar_estado(self, no: NoAVL, estado: int) -> None:
+        no.altura = estado
 
     def _rotacao_direita(self, no_atual: NoAVL) -> None:
         """Rotação à direita com atualização de altura/FB.
@@ -64,43 +139,246 @@ class ArvoreAVL(ArvoreBST):
         if novo_pai:
             novo_pai.atualizar()
 
-    def _reequilibrar(self, no: NoAVL) -> None:
+    def _reequilibrar(self, no: NoAVL) -> NoAVL | None:
         """Reequilibra subárvores de baixo para cima a partir de ``no``.
 
         Aplica rotações simples ou duplas nos casos LL/LR e RR/RL,
         atualizando altura e fator de balanceamento após cada rotação.
+        Para assim que a subárvore volta a ter a altura que tinha antes
+        da operação, pois os ancestrais não mudam.
+
+        Args:
+            no (NoAVL): Primeiro nó cuja subárvore mudou (pai do nó inserido
+                ou removido).
+
+        Returns:
+            NoAVL | None: Raiz da subárvore em que parou, ou ``None`` se a
+            correção passou da raiz (usado pela instrumentação).
         """
         while no:
+            altura_anterior = no.altura
             no.atualizar()
+            fator_balanceamento = no.fator_balanceamento
 
-            if no.fator_balanceamento > 1:
+            if fator_balanceamento > 1:
                 if no.esquerda and no.esquerda.fator_balanceamento < 0:
                     self._rotacao_esquerda(no.esquerda)
                 self._rotacao_direita(no)
+                no = no.pai
 
-            elif no.fator_balanceamento < -1:
+            elif fator_balanceamento < -1:
                 if no.direita and no.direita.fator_balanceamento > 0:
                     self._rotacao_direita(no.direita)
                 self._rotacao_esquerda(no)
+                no = no.pai
 
+            if no.altura == altura_anterior:
+                return no
             no = no.pai
+        return None
+
+    def ativar_instrumentacao(self, gancho=None) -> None:
+        """Como na BST; ``_reequilibrar`` também passa a ser contado."""
+        super().ativar_instrumentacao(gancho)
+        self._reequilibrar = reequilibrio_instrumentado(
+            self._reequilibrar, self._estatisticas, gancho
+        )
+
+    def _verificar_no(self, no: NoAVL) -> str | None:
+        """Acrescenta a ``altura`` em cache e o fator de balanceamento."""
+        mensagem = super()._verificar_no(no)
+        if mensagem is not None:
+            return mensagem
+        altura_esquerda = no.esquerda.altura if no.esquerda else 0
+        altura_direita = no.direita.altura if no.direita else 0
+        altura = 1 + max(altura_esquerda, altura_direita)
+        if no.altura != altura:
+            return f"altura {no.altura} em cache em {no.chave!r}, real {altura}"
+        if abs(altura_esquerda - altura_direita) > 1:
+            return (
+                f"fator de balanceamento {altura_esquerda - altura_direita} "
+                f"em {no.chave!r}"
+            )
+        return None
 
-    def inserir(self, chave: int) -> None:
+    def _vazia(self) -> "ArvoreAVL":
+        return type(self)(self.mapa, self.key)
+
+    def _juntar_nos(
+        self, esquerda: NoAVL | None, meio: NoAVL, direita: NoAVL | None
+    ) -> NoAVL:
+        """Join AVL: pendura ``meio`` na borda da subárvore mais alta.
+
+        Desce pela borda direita de ``esquerda`` (ou esquerda de ``direita``)
+        até um nó ``c`` com altura no máximo uma acima da outra subárvore,
+        troca ``c`` por ``meio`` (com ``c`` e a outra subárvore como filhos)
+        e reequilibra de baixo para cima como numa inserção.
+        """
+        altura_esquerda = esquerda.altura if esquerda else 0
+        altura_direita = direita.altura if direita else 0
+
+        if altura_esquerda > altura_direita + 1:
+            pai, c = None, esquerda
+            while c is not None and c.altura > altura_direita + 1:
+                pai, c = c, c.direita
+            super()._juntar_nos(c, meio, direita)
+            meio.atualizar()
+            meio.pai = pai
+            pai.direita = meio
+            raiz = esquerda
+        elif altura_direita > altura_esquerda + 1:
+            pai, c = None, direita
+            while c is not None and c.altura > altura_esquerda + 1:
+                pai, c = c, c.esquerda
+            super()._juntar_nos(esquerda, meio, c)
+            meio.atualizar()
+            meio.pai = pai
+            pai.esquerda = meio
+            raiz = direita
+        else:
+            super()._juntar_nos(esquerda, meio, direita)
+            meio.atualizar()
+            return meio
+
+        self._ajustar_tamanhos(pai, meio.tamanho - (c.tamanho if c else 0))
+        self.raiz = raiz
+        self._reequilibrar(pai)
+        return self.raiz
+
+    def _reequilibrar_insercao(self, novo_no: NoAVL) -> None:
+        self._reequilibrar(novo_no.pai)
+
+    def _trocar_com_sucessor(self, no: NoAVL, sucessor: NoAVL) -> None:
+        """Troca posições com o sucessor levando junto a ``altura`` da posição."""
+        super()._trocar_com_sucessor(no, sucessor)
+        no.altura, sucessor.altura = sucessor.altura, no.altura
+
+    def inserir(self, chave: Chave) -> bool:
         """Insere uma ``chave`` e reequilibra a árvore se necessário.
 
         Args:
-            chave (int): Chave a inserir.
+            chave (Chave): Chave a inserir.
+
+        Returns:
+            bool: ``True`` se a chave era nova, ``False`` se já existia.
         """
         novo_no = super()._inserir(chave)
-        if novo_no:
-            self._reequilibrar(novo_no)
+        if novo_no is None:
+            return False
+        self._reequilibrar(novo_no.pai)
+        return True
+
+    def _remover_e_reequilibrar(self, no: NoAVL) -> None:
+        """Remove ``no`` e reequilibra a partir do pai da posição removida."""
+        pai_do_removido = self._remover_no(no)
+        if pai_do_removido:
+            self._reequilibrar(pai_do_removido)
+
+    def _vale_reconstruir(self, tamanho_lote: int) -> bool:
+        """Indica se reconstruir a árvore custa menos que aplicar o lote chave a chave.
+
+        Reconstruir é O(n + k), mas aloca todos os nós de novo; com a parada
+        antecipada de ``_reequilibrar`` cada chave custa pouco, e a
+        reconstrução só compensa quando o lote é ao menos do tamanho da árvore.
+        Em modo mapa a reconstrução perderia os valores e não é usada.
+        """
+        return not self.mapa and tamanho_lote >= len(self)
 
-    def remover(self, chave: int) -> None:
-        """Remove a ``chave`` e reequilibra a árvore se necessário.
+    def inserir_lote(self, chaves) -> int:
+        """Insere um lote de chaves de uma vez.
+
+        O lote é ordenado e deduplicado. Se for grande em relação à
+        árvore, as chaves atuais (já em ordem) são mescladas com ele e a
+        árvore é reconstruída balanceada em O(n + k), sem nenhuma rotação.
+        Caso contrário, as chaves entram em ordem crescente, cada descida
+        partindo da chave anterior (``_subir_ate_conter``) e cada caminho
+        sendo reequilibrado só até onde a altura mudou.
 
         Args:
-            chave (int): Chave a remover.
+            chaves: Iterável de chaves (de itens, se a árvore tiver ``key``).
+
+        Returns:
+            int: Quantidade de chaves efetivamente inseridas (novas).
         """
-        pai_do_removido = super()._remover(chave)
-        if pai_do_removido:
-            self._reequilibrar(pai_do_removido)
+        itens = None
+        if self.key is None:
+            lote = self._preparar_lote(chaves)
+        else:
+            pares = sorted(
+                ((self.key(item), item) for item in chaves), key=itemgetter(0)
+            )
+            lote = [chave for chave, _ in pares]
+            itens = [item for _, item in pares]
+        quantidade_anterior = len(self)
+        if not lote:
+            return 0
+
+        if self._vale_reconstruir(len(lote)):
+            self._reconstruir(self._mesclar_ordenadas(self.iter_em_ordem(), lote))
+            return len(self) - quantidade_anterior
+
+        anterior = None
+        for posicao, chave in enumerate(lote):
+            inicio = None
+            if anterior is not None:
+                inicio = self._subir_ate_conter(anterior, chave)
+            novo_no = self._inserir(chave, inicio)
+            if novo_no is not None:
+                if itens is not None:
+                    novo_no.valor = itens[posicao]
+                self._reequilibrar(novo_no.pai)
+                anterior = novo_no
+        return len(self) - quantidade_anterior
+
+    def remover_lote(self, chaves) -> int:
+        """Remove um lote de chaves de uma vez.
+
+        Lotes grandes em relação à árvore são aplicados filtrando as
+        chaves atuais em ordem e reconstruindo a árvore em O(n + k);
+        lotes pequenos são removidos um a um.
+
+        Args:
+            chaves: Iterável de chaves.
+
+        Returns:
+            int: Quantidade de chaves efetivamente removidas.
+        """
+        lote = self._preparar_lote(chaves)
+        quantidade_anterior = len(self)
+        if not lote:
+            return 0
+
+        if self._vale_reconstruir(len(lote)):
+            self._reconstruir(self._subtrair_ordenadas(self.iter_em_ordem(), lote))
+        else:
+            for chave in lote:
+                self.remover(chave)
+        return quantidade_anterior - len(self)
+
+    @staticmethod
+    def _mesclar_ordenadas(primeira, segunda: list) -> list:
+        """Mescla duas sequências crescentes sem repetições numa lista sem repetições."""
+        resultado = []
+        indice = 0
+        for chave in primeira:
+            while indice < len(segunda) and segunda[indice] < chave:
+                resultado.append(segunda[indice])
+                indice += 1
+            if indice < len(segunda) and not chave < segunda[indice]:
+                indice += 1
+            resultado.append(chave)
+        resultado.extend(segunda[indice:])
+        return resultado
+
+    @staticmethod
+    def _subtrair_ordenadas(primeira, segunda: list) -> list:
+        """Retorna as chaves de ``primeira`` que não estão em ``segunda`` (ambas crescentes)."""
+        resultado = []
+        indice = 0
+        for chave in primeira:
+            while indice < len(segunda) and segunda[indice] < chave:
+                indice += 1
+            if indice < len(segunda) and not chave < segunda[indice]:
+                continue
+            resultado.append(chave)
+        return resultado
@@ -0,0 +1,467 @@
+"""Árvore B+ com fan-out configurável, para índices grandes e de leitura.
+
+Cada nó guarda uma lista ordenada de chaves consultada com ``bisect``, então
+uma descida visita ``log_B n`` objetos em vez de ``log_2 n``. Só as folhas
+guardam as chaves da árvore; os nós internos guardam separadores. As folhas
+são encadeadas nas duas direções, o que torna a iteração em ordem e as
+varreduras de intervalo sequenciais, sem voltar aos nós internos.
+
+A interface segue a de ``ArvoreAVL`` e ``ArvoreRubroNegro`` (``inserir``,
+``remover``, ``buscar``, ``mostrar``, ``intervalo``, ``construir_em_lote``).
+"""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+
+from binaria_de_busca import ArvoreBST, Chave
+
+
+class FolhaBMais:
+    """Folha da Árvore B+: chaves ordenadas e vizinhas no encadeamento."""
+
+    __slots__ = ("chaves", "anterior", "proxima")
+
+    def __init__(self, chaves: list | None = None):
+        self.chaves: list = chaves if chaves is not None else []
+        self.anterior: FolhaBMais | None = None
+        self.proxima: FolhaBMais | None = None
+
+    def __str__(self) -> str:
+        return f"[{', '.join(map(str, self.chaves))}]"
+
+
+class NoInternoBMais:
+    """Nó interno da Árvore B+.
+
+    O filho ``filhos[i]`` contém as chaves ``c`` com
+    ``chaves[i - 1] <= c < chaves[i]``.
+    """
+
+    __slots__ = ("chaves", "filhos")
+
+    def __init__(self, chaves: list, filhos: list):
+        self.chaves: list = chaves
+        self.filhos: list = filhos
+
+    def __str__(self) -> str:
+        return f"<{', '.join(map(str, self.chaves))}>"
+
+
+class EntradaBMais:
+    """Visão de uma chave dentro de uma folha, retornada por ``buscar``.
+
+    Só é válida até a próxima alteração da árvore.
+    """
+
+    __slots__ = ("folha", "indice")
+
+    def __init__(self, folha: FolhaBMais, indice: int):
+        self.folha = folha
+        self.indice = indice
+
+    @property
+    def chave(self) -> Chave:
+        return self.folha.chaves[self.indice]
+
+    def __str__(self) -> str:
+        return f"{self.chave}"
+
+
+class ArvoreBMais:
+    """Árvore B+ com chaves únicas.
+
+    Args:
+        ordem (int, optional): Fan-out: máximo de filhos por nó interno e de
+            chaves por folha (padrão 64, mínimo 3). Nós, exceto a raiz,
+            ficam ao menos meio cheios.
+    """
+
+    def __init__(self, ordem: int = 64):
+        if ordem < 3:
+            raise ValueError("A ordem da Árvore B+ deve ser pelo menos 3.")
+        self.ordem = ordem
+        self._minimo_folha = ordem // 2
+        self._minimo_filhos = (ordem + 1) // 2
+        self.raiz: FolhaBMais | NoInternoBMais = FolhaBMais()
+        self._quantidade = 0
+
+    @classmethod
+    def construir_em_lote(cls, chaves, ordem: int = 64) -> "ArvoreBMais":
+        """Constrói a árvore de baixo para cima a partir de um iterável, em O(n).
+
+        As chaves (ordenadas e deduplicadas antes, se preciso) enchem as
+        folhas em sequência; cada nível interno é montado sobre o anterior.
+        As últimas duas folhas (ou nós) de cada nível dividem o resto para
+        que nenhuma fique abaixo da ocupação mínima.
+
+        Args:
+            chaves: Iterável de chaves (ordenado ou não, com ou sem repetições).
+            ordem (int, optional): Fan-out da árvore.
+
+        Returns:
+            ArvoreBMais: Nova árvore contendo as chaves.
+        """
+        arvore = cls(ordem)
+        chaves = ArvoreBST._preparar_lote(chaves)
+        if not chaves:
+            return arvore
+        arvore._quantidade = len(chaves)
+
+        folhas = [
+            FolhaBMais(fatia)
+            for fatia in arvore._repartir(chaves, ordem, arvore._minimo_folha)
+        ]
+        for anterior, proxima in zip(folhas, folhas[1:]):
+            anterior.proxima = proxima
+            proxima.anterior = anterior
+
+        nivel = folhas
+        menores = [folha.chaves[0] for folha in folhas]
+        while len(nivel) > 1:
+            proximo_nivel = []
+            proximos_menores = []
+            inicio = 0
+            for grupo in arvore._repartir(nivel, ordem, arvore._minimo_filhos):
+                fim = inicio + len(grupo)
+                proximo_nivel.append(NoInternoBMais(menores[inicio + 1 : fim], grupo))
+                proximos_menores.append(menores[inicio])
+                inicio = fim
+            nivel = proximo_nivel
+            menores = proximos_menores
+        arvore.raiz = nivel[0]
+        return arvore
+
+    @staticmethod
+    def _repartir(itens: list, maximo: int, minimo: int) -> list:
+        """Corta ``itens`` em fatias de ``maximo`` com todas (se >1) >= ``minimo``."""
+        fatias = [itens[i : i + maximo] for i in range(0, len(itens), maximo)]
+        if len(fatias) > 1 and len(fatias[-1]) < minimo:
+            juntas = fatias[-2] + fatias[-1]
+            meio = len(juntas) // 2
+            fatias[-2:] = [juntas[:meio], juntas[meio:]]
+        return fatias
+
+    def __len__(self) -> int:
+        return self._quantidade
+
+    def altura(self) -> int:
+        """Retorna o número de níveis (1 para uma árvore só com a folha raiz)."""
+        niveis = 1
+        no = self.raiz
+        while type(no) is NoInternoBMais:
+            no = no.filhos[0]
+            niveis += 1
+        return niveis
+
+    def _folha(self, chave: Chave) -> FolhaBMais:
+        """Desce da raiz até a folha onde a ``chave`` está ou entraria."""
+        no = self.raiz
+        while type(no) is NoInternoBMais:
+            no = no.filhos[bisect_right(no.chaves, chave)]
+        return no
+
+    def _caminho(self, chave: Chave) -> tuple[list, FolhaBMais]:
+        """Como ``_folha``, anotando os pares ``(no_interno, indice_do_filho)``."""
+        caminho = []
+        no = self.raiz
+        while type(no) is NoInternoBMais:
+            indice = bisect_right(no.chaves, chave)
+            caminho.append((no, indice))
+            no = no.filhos[indice]
+        return caminho, no
+
+    def buscar(self, chave: Chave) -> EntradaBMais | None:
+        """Busca uma ``chave`` na árvore.
+
+        Args:
+            chave (Chave): Chave desejada.
+
+        Returns:
+            EntradaBMais | None: Visão da chave na sua folha, ou ``None`` se
+            não existir.
+        """
+        folha = self._folha(chave)
+        indice = bisect_left(folha.chaves, chave)
+        if indice < len(folha.chaves) and not chave < folha.chaves[indice]:
+            return EntradaBMais(folha, indice)
+        return None
+
+    def __contains__(self, chave: Chave) -> bool:
+        folha = self._folha(chave)
+        indice = bisect_left(folha.chaves, chave)
+        return indice < len(folha.chaves) and not chave < folha.chaves[indice]
+
+    def inserir(self, chave: Chave) -> bool:
+        """Insere uma ``chave``, dividindo folhas e nós cheios na subida.
+
+        Args:
+            chave (Chave): Chave a inserir.
+
+        Returns:
+            bool: ``True`` se a chave era nova, ``False`` se já existia.
+        """
+        caminho, folha = self._caminho(chave)
+        chaves = folha.chaves
+        indice = bisect_left(chaves, chave)
+        if indice < len(chaves) and not chave < chaves[indice]:
+            return False
+        chaves.insert(indice, chave)
+        self._quantidade += 1
+        if len(chaves) <= self.ordem:
+            return True
+
+        meio = len(chaves) // 2
+        nova = FolhaBMais(chaves[meio:])
+        del chaves[meio:]
+        nova.anterior, nova.proxima = folha, folha.proxima
+        if folha.proxima is not None:
+            folha.proxima.anterior = nova
+        folha.proxima = nova
+        separador, direita = nova.chaves[0], nova
+
+        while caminho:
+            pai, indice = caminho.pop()
+            pai.chaves.insert(indice, separador)
+            pai.filhos.insert(indice + 1, direita)
+            if len(pai.filhos) <= self.ordem:
+                return True
+            meio = len(pai.chaves) // 2
+            separador = pai.chaves[meio]
+            direita = NoInternoBMais(pai.chaves[meio + 1 :], pai.filhos[meio + 1 :])
+            del pai.chaves[meio:]
+            del pai.filhos[meio + 1 :]
+
+        self.raiz = NoInternoBMais([separador], [self.raiz, direita])
+        return True
+
+    def remover(self, chave: Chave) -> bool:
+        """Remove a ``chave``, emprestando de vizinhos ou fundindo nós na subida.
+
+        Args:
+            chave (Chave): Chave a remover.
+
+        Returns:
+            bool: ``True`` se a chave existia.
+        """
+        caminho, folha = self._caminho(chave)
+        indice = bisect_left(folha.chaves, chave)
+        if indice == len(folha.chaves) or chave < folha.chaves[indice]:
+            return False
+        del folha.chaves[indice]
+        self._quantidade -= 1
+
+        if caminho and len(folha.chaves) < self._minimo_folha:
+            pai, indice = caminho.pop()
+            self._corrigir_folha(pai, indice)
+            no = pai
+            while caminho and len(no.filhos) < self._minimo_filhos:
+                pai, indice = caminho.pop()
+                self._corrigir_interno(pai, indice)
+                no = pai
+
+        if type(self.raiz) is NoInternoBMais and len(self.raiz.filhos) == 1:
+            self.raiz = self.raiz.filhos[0]
+        return True
+
+    def _corrigir_folha(self, pai: NoInternoBMais, indice: int) -> None:
+        """Restaura a ocupação mínima de ``pai.filhos[indice]`` (uma folha)."""
+        folha = pai.filhos[indice]
+        esquerda = pai.filhos[indice - 1] if indice > 0 else None
+        direita = pai.filhos[indice + 1] if indice + 1 < len(pai.filhos) else None
+
+        if esquerda is not None and len(esquerda.chaves) > self._minimo_folha:
+            folha.chaves.insert(0, esquerda.chaves.pop())
+            pai.chaves[indice - 1] = folha.chaves[0]
+        elif direita is not None and len(direita.chaves) > self._minimo_folha:
+            folha.chaves.append(direita.chaves.pop(0))
+            pai.chaves[indice] = direita.chaves[0]
+        else:
+            if esquerda is None:
+                esquerda, folha, indice = folha, direita, indice + 1
+            esquerda.chaves.extend(folha.chaves)
+            esquerda.proxima = folha.proxima
+            if folha.proxima is not None:
+                folha.proxima.anterior = esquerda
+            del pai.chaves[indice - 1]
+            del pai.filhos[indice]
+
+    def _corrigir_interno(self, pai: NoInternoBMais, indice: int) -> None:
+        """Restaura a ocupação mínima de ``pai.filhos[indice]`` (nó interno)."""
+        no = pai.filhos[indice]
+        esquerda = pai.filhos[indice - 1] if indice > 0 else None
+        direita = pai.filhos[indice + 1] if indice + 1 < len(pai.filhos) else None
+
+        if esquerda is not None and len(esquerda.filhos) > self._minimo_filhos:
+            no.chaves.insert(0, pai.chaves[indice - 1])
+            no.filhos.insert(0, esquerda.filhos.pop())
+            pai.chaves[indice - 1] = esquerda.chaves.pop()
+        elif direita is not None and len(direita.filhos) > self._minimo_filhos:
+            no.chaves.append(pai.chaves[indice])
+            no.filhos.append(direita.filhos.pop(0))
+            pai.chaves[indice] = direita.chaves.pop(0)
+        else:
+            if esquerda is None:
+                esquerda, no, indice = no, direita, indice + 1
+            esquerda.chaves.append(pai.chaves[indice - 1])
+            esquerda.chaves.extend(no.chaves)
+            esquerda.filhos.extend(no.filhos)
+            del pai.chaves[indice - 1]
+            del pai.filhos[indice]
+
+    def _primeira_folha(self) -> FolhaBMais:
+        no = self.raiz
+        while type(no) is NoInternoBMais:
+            no = no.filhos[0]
+        return no
+
+    def _ultima_folha(self) -> FolhaBMais:
+        no = self.raiz
+        while type(no) is NoInternoBMais:
+            no = no.filhos[-1]
+        return no
+
+    def __iter__(self) -> Iterator[Chave]:
+        folha = self._primeira_folha()
+        while folha is not None:
+            yield from folha.chaves
+            folha = folha.proxima
+
+    def __reversed__(self) -> Iterator[Chave]:
+        folha = self._ultima_folha()
+        while folha is not None:
+            yield from reversed(folha.chaves)
+            folha = folha.anterior
+
+    def intervalo(self, a: Chave, b: Chave, reverso: bool = False) -> Iterator[Chave]:
+        """Itera as chaves no intervalo semiaberto ``[a, b)``.
+
+        Uma descida localiza a folha inicial e o resto segue o encadeamento
+        das folhas, fatia por fatia: O(log_B n + k).
+
+        Args:
+            a (Chave): Limite inferior (inclusivo).
+            b (Chave): Limite superior (exclusivo).
+            reverso (bool, optional): Se ``True``, produz em ordem decrescente.
+
+        Yields:
+            Chave: Chaves dentro do intervalo.
+        """
+        if not a < b:
+            return
+        if reverso:
+            folha = self._folha(b)
+            fim = bisect_left(folha.chaves, b)
+            while folha is not None:
+                inicio = bisect_left(folha.chaves, a, 0, fim)
+                yield from reversed(folha.chaves[inicio:fim])
+                if inicio > 0:
+                    return
+                folha = folha.anterior
+                fim = len(folha.chaves) if folha is not None else 0
+        else:
+            folha = self._folha(a)
+            inicio = bisect_left(folha.chaves, a)
+            while folha is not None:
+                fim = bisect_left(folha.chaves, b, inicio)
+                yield from folha.chaves[inicio:fim]
+                if fim < len(folha.chaves):
+                    return
+                folha = folha.proxima
+                inicio = 0
+
+    def _pre_ordem(self) -> Iterator[FolhaBMais | NoInternoBMais]:
+        pilha = [self.raiz]
+        while pilha:
+            no = pilha.pop()
+            yield no
+            if type(no) is NoInternoBMais:
+                pilha.extend(reversed(no.filhos))
+
+    def _pos_ordem(self) -> Iterator[FolhaBMais | NoInternoBMais]:
+        pilha = [(self.raiz, False)]
+        while pilha:
+            no, visitado = pilha.pop()
+            if visitado or type(no) is FolhaBMais:
+                yield no
+            else:
+                pilha.append((no, True))
+                pilha.extend((filho, False) for filho in reversed(no.filhos))
+
+    def mostrar(self, ordem: str = "em_ordem") -> list:
+        """Retorna o conteúdo conforme a ordem solicitada.
+
+        Em ordem retorna as chaves; em pré e pós-ordem, os nós (internos
+        com seus separadores e folhas com suas chaves).
+
+        Args:
+            ordem (str, optional): Uma entre ``"pre_ordem"``, ``"em_ordem"`` (padrão)
+                ou ``"pos_ordem"``.
+
+        Returns:
+            list: Chaves ou nós na ordem escolhida.
+
+        Raises:
+            ValueError: Se ``ordem`` não for uma das opções válidas.
+        """
+        if ordem == "pre_ordem":
+            return list(self._pre_ordem())
+        elif ordem == "em_ordem":
+            return list(self)
+        elif ordem == "pos_ordem":
+            return list(self._pos_ordem())
+        else:
+            raise ValueError(
+                "Ordem inválida. Use 'pre_ordem', 'em_ordem' ou 'pos_ordem'."
+            )
+
+    def validar_propriedades(self) -> bool:
+        """Valida a árvore em uma passada iterativa, em O(n).
+
+        Verifica:
+        - Chaves ordenadas em cada nó e dentro dos limites dos separadores.
+        - Ocupação mínima e máxima de folhas e nós internos (exceto a raiz).
+        - Todas as folhas na mesma profundidade.
+        - Encadeamento das folhas na ordem da árvore e contagem total.
+
+        Returns:
+            bool: ``True`` se todas as propriedades são satisfeitas.
+        """
+        profundidade_folhas = None
+        folhas = []
+        pilha = [(self.raiz, None, None, 1)]
+        while pilha:
+            no, minimo, maximo, profundidade = pilha.pop()
+            chaves = no.chaves
+            if any(not chaves[i] < chaves[i + 1] for i in range(len(chaves) - 1)):
+                return False
+            if chaves and (
+                (minimo is not None and chaves[0] < minimo)
+                or (maximo is not None and not chaves[-1] < maximo)
+            ):
+                return False
+            if type(no) is FolhaBMais:
+                if len(chaves) > self.ordem:
+                    return False
+                if no is not self.raiz and len(chaves) < self._minimo_folha:
+                    return False
+                if profundidade_folhas is None:
+                    profundidade_folhas = profundidade
+                elif profundidade != profundidade_folhas:
+                    return False
+                folhas.append(no)
+                continue
+            filhos = no.filhos
+            if len(filhos) != len(chaves) + 1 or len(filhos) > self.ordem:
+                return False
+            if len(filhos) < (2 if no is self.raiz else self._minimo_filhos):
+                return False
+            limites = [minimo, *chaves, maximo]
+            for i in range(len(filhos) - 1, -1, -1):
+                pilha.append((filhos[i], limites[i], limites[i + 1], profundidade + 1))
+
+        if folhas[0].anterior is not None or folhas[-1].proxima is not None:
+            return False
+        for anterior, proxima in zip(folhas, folhas[1:]):
+            if anterior.proxima is not proxima or proxima.anterior is not anterior:
+                return False
+        return sum(len(folha.chaves) for folha in folhas) == self._quantidade
@@ -0,0 +1,1693 @@
+"""Benchmarks das árvores balanceadas.
+
+Cada medição é um subcomando, por exemplo::
+
+    python benchmark.py memoria --quantidade 1000000
+    python benchmark.py operacoes --quantidade 1000000
+    python benchmark.py busca --quantidade 1000000 --consultas 200000
+    python benchmark.py lote --quantidade 1000000 --consultas 100000
+    python benchmark.py ingestao --quantidade 1000000 --lotes 10000 100000
+    python benchmark.py cargas --cargas aleatoria zipf misto --json resultados.json
+    python benchmark.py instantaneo --quantidade 1000000
+    python benchmark.py conjuntos --quantidade 1000000 --menores 1000 100000
+    python benchmark.py paralelo --quantidade 1000000 --trabalhadores 1 2 4 8
+    python benchmark.py concorrencia --leitores 1 4 16 --duracao 2
+    python benchmark.py persistente --quantidade 100000 --versoes 500
+    python benchmark.py validacao --quantidade 1000000 --operacoes 50000
+    python benchmark.py bmais --quantidade 10000000 --ordens 16 64 256
+    python benchmark.py dedo --quantidade 1000000 --operacoes 200000
+    python benchmark.py zipf --quantidade 1000000 --expoentes 0 0.8 1.0 1.2
+    python benchmark.py servico --quantidade 100000 --clientes 16 256
+"""
+
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from assincrono import ArvoreAssincrona
+from avl import ArvoreAVL
+from b_mais import ArvoreBMais
+from binaria_de_busca import ArvoreBST
+from concorrente import ArvoreConcorrente, Instantaneo
+from paralelo import construir_paralelo, intersecao_paralela, uniao_paralela
+from persistente import ArvoreAVLPersistente, ArvoreRubroNegroPersistente
+from rubro_negro import ArvoreRubroNegro
+from splay import ArvoreSplay
+from treap import Treap
+from vetorial import NULO, ArvoreAVLVetorial, ArvoreRubroNegroVetorial, ArvoreVetorial
+
+
+ARVORES = {
+    "bst": ArvoreBST,
+    "avl": ArvoreAVL,
+    "rubro-negra": ArvoreRubroNegro,
+    "avl-vetorial": ArvoreAVLVetorial,
+    "rubro-negra-vetorial": ArvoreRubroNegroVetorial,
+    "splay": ArvoreSplay,
+    "treap": Treap,
+}
+
+
+class _NoAVLComDict:
+    """Nó AVL no layout anterior aos ``__slots__`` (atributos em ``__dict__``)."""
+
+    def __init__(self, chave: int):
+        self.chave = chave
+        self.esquerda = None
+        self.direita = None
+        self.pai = None
+        self.tamanho = 1
+        self.altura = 1
+        self.fator_balanceamento = 0
+
+    def atualizar(self) -> None:
+        altura_esquerda = self.esquerda.altura if self.esquerda else 0
+        altura_direita = self.direita.altura if self.direita else 0
+        self.altura = 1 + max(altura_esquerda, altura_direita)
+        self.fator_balanceamento = altura_esquerda - altura_direita
+
+
+class _NoRNComDict:
+    """Nó Rubro-Negro no layout anterior aos ``__slots__``."""
+
+    def __init__(self, chave: int, cor: bool = True):
+        self.chave = chave
+        self.esquerda = None
+        self.direita = None
+        self.pai = None
+        self.tamanho = 1
+        self.cor = cor
+        self.altura_negra = 1
+
+    def atualizar(self) -> None:
+        esquerda = self.esquerda.altura_negra if self.esquerda else 1
+        direita = self.direita.altura_negra if self.direita else 1
+        self.altura_negra = esquerda + (0 if self.cor else 1)
+
+
+class _ArvoreAVLComDict(ArvoreAVL):
+    def __init__(self):
+        ArvoreBST.__init__(self, _NoAVLComDict)
+
+
+class _ArvoreRubroNegroComDict(ArvoreRubroNegro):
+    def __init__(self):
+        ArvoreBST.__init__(self, _NoRNComDict)
+
+
+def _bytes_alocados(construir) -> tuple[object, int]:
+    """Executa ``construir()`` e retorna o resultado e os bytes que ele mantém vivos.
+
+    Args:
+        construir: Função sem argumentos que cria a estrutura medida.
+
+    Returns:
+        tuple[object, int]: Estrutura criada e bytes alocados por ela.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        resultado = construir()
+        gc.collect()
+        alocados, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return resultado, alocados
+
+
+def _construir_vetorial(classe, chaves: list):
+    arvore = classe()
+    for chave in chaves:
+        arvore.inserir(chave)
+    return arvore
+
+
+def benchmark_memoria(quantidade: int) -> None:
+    """Compara bytes por chave dos nós com ``__dict__`` e com ``__slots__``.
+
+    Também mede o motor vetorial, que não tem objetos por nó. As chaves
+    ficam numa lista criada fora da medição, de modo que só os nós (e não
+    os inteiros) entram na conta.
+
+    Args:
+        quantidade (int): Número de chaves de cada árvore.
+    """
+    chaves = list(range(quantidade))
+    casos = [
+        ("AVL", _ArvoreAVLComDict, ArvoreAVL),
+        ("Rubro-Negra", _ArvoreRubroNegroComDict, ArvoreRubroNegro),
+    ]
+    print(
+        f"{'árvore':<12} {'antes (B/chave)':>16} {'depois (B/chave)':>17} "
+        f"{'redução':>8}"
+    )
+    for nome, antes, depois in casos:
+        arvore, bytes_antes = _bytes_alocados(lambda: antes.construir_em_lote(chaves))
+        del arvore
+        arvore, bytes_depois = _bytes_alocados(lambda: depois.construir_em_lote(chaves))
+        del arvore
+        por_chave_antes = bytes_antes / quantidade
+        por_chave_depois = bytes_depois / quantidade
+        print(
+            f"{nome:<12} {por_chave_antes:>16.1f} {por_chave_depois:>17.1f} "
+            f"{1 - por_chave_depois / por_chave_antes:>8.1%}"
+        )
+
+    print(f"\n{'motor vetorial':<26} {'B/chave':>8}")
+    for nome, classe in [
+        ("AVL vetorial", ArvoreAVLVetorial),
+        ("Rubro-Negra vetorial", ArvoreRubroNegroVetorial),
+    ]:
+        arvore, alocados = _bytes_alocados(lambda: _construir_vetorial(classe, chaves))
+        del arvore
+        print(f"{nome:<26} {alocados / quantidade:>8.1f}")
+
+
+def benchmark_operacoes(quantidade: int, semente: int) -> None:
+    """Mede o tempo por operação de ``inserir`` e ``remover`` com chaves aleatórias.
+
+    Insere ``quantidade`` chaves distintas em ordem aleatória e depois
+    remove todas em outra ordem aleatória.
+
+    Args:
+        quantidade (int): Número de chaves.
+        semente (int): Semente do gerador aleatório.
+    """
+    gerador = random.Random(semente)
+    chaves = gerador.sample(range(quantidade * 10), quantidade)
+    ordem_remocao = chaves[:]
+    gerador.shuffle(ordem_remocao)
+
+    print(f"{'árvore':<22} {'inserir (µs/op)':>16} {'remover (µs/op)':>16}")
+    for nome, classe in ARVORES.items():
+        arvore = classe()
+        inserir = arvore.inserir
+        inicio = time.perf_counter()
+        for chave in chaves:
+            inserir(chave)
+        tempo_insercao = time.perf_counter() - inicio
+
+        remover = arvore.remover
+        inicio = time.perf_counter()
+        for chave in ordem_remocao:
+            remover(chave)
+        tempo_remocao = time.perf_counter() - inicio
+
+        print(
+            f"{nome:<22} {tempo_insercao / quantidade * 1e6:>16.2f} "
+            f"{tempo_remocao / quantidade * 1e6:>16.2f}"
+        )
+
+
+def _construir(classe, chaves: list):
+    """Constrói uma árvore de ``classe`` com ``chaves`` (em lote quando possível)."""
+    if hasattr(classe, "construir_em_lote"):
+        return classe.construir_em_lote(chaves)
+    arvore = classe()
+    for chave in chaves:
+        arvore.inserir(chave)
+    return arvore
+
+
+def _buscar_recursivo(no, chave: int):
+    """Busca recursiva equivalente à implementação anterior de ``_buscar``."""
+    if no is None or no.chave == chave:
+        return no
+    elif chave < no.chave:
+        return _buscar_recursivo(no.esquerda, chave)
+    else:
+        return _buscar_recursivo(no.direita, chave)
+
+
+def benchmark_busca(quantidade: int, consultas: int, semente: int) -> None:
+    """Mede a vazão de ``buscar`` (buscas/s), iterativa e recursiva.
+
+    Metade das consultas acerta chaves presentes e metade erra. A coluna
+    recursiva reproduz a versão anterior de ``_buscar`` sobre a mesma árvore.
+
+    Args:
+        quantidade (int): Número de chaves em cada árvore.
+        consultas (int): Número de buscas medidas.
+        semente (int): Semente do gerador aleatório.
+    """
+    gerador = random.Random(semente)
+    chaves = gerador.sample(range(quantidade * 2), quantidade)
+    sondas = [gerador.randrange(quantidade * 2) for _ in range(consultas)]
+
+    print(f"{'árvore':<22} {'iterativa (buscas/s)':>21} {'recursiva (buscas/s)':>21}")
+    for nome in ("bst", "avl", "rubro-negra"):
+        arvore = _construir(ARVORES[nome], chaves)
+
+        buscar = arvore.buscar
+        inicio = time.perf_counter()
+        for chave in sondas:
+            buscar(chave)
+        iterativa = consultas / (time.perf_counter() - inicio)
+
+        raiz = arvore.raiz
+        inicio = time.perf_counter()
+        for chave in sondas:
+            _buscar_recursivo(raiz, chave)
+        recursiva = consultas / (time.perf_counter() - inicio)
+
+        print(f"{nome:<22} {iterativa:>21,.0f} {recursiva:>21,.0f}")
+
+    degenerada = ArvoreBST()
+    limite = min(quantidade, 10_000)
+    for chave in range(limite):
+        degenerada.inserir(chave)
+    inicio = time.perf_counter()
+    for chave in range(0, limite, max(1, limite // 1000)):
+        degenerada.buscar(chave)
+    print(
+        f"\nBST degenerada ({limite} chaves ordenadas): buscas concluídas sem "
+        f"RecursionError em {time.perf_counter() - inicio:.2f}s"
+    )
+
+
+def benchmark_lote(quantidade: int, consultas: int, semente: int) -> None:
+    """Compara ``buscar`` chave a chave com ``buscar_muitos`` em uma chamada.
+
+    Mede consultas aleatórias (não ordenadas) e já ordenadas, incluindo
+    o custo de ordenar dentro de ``buscar_muitos``.
+
+    Args:
+        quantidade (int): Número de chaves em cada árvore.
+        consultas (int): Número de chaves consultadas.
+        semente (int): Semente do gerador aleatório.
+    """
+    gerador = random.Random(semente)
+    chaves = gerador.sample(range(quantidade * 2), quantidade)
+    aleatorias = [gerador.randrange(quantidade * 2) for _ in range(consultas)]
+    casos = [("aleatórias", aleatorias), ("ordenadas", sorted(aleatorias))]
+
+    print(
+        f"{'árvore':<14} {'consultas':<11} {'laço (s)':>9} {'lote (s)':>9} "
+        f"{'ganho':>7}"
+    )
+    for nome in ("avl", "rubro-negra"):
+        arvore = _construir(ARVORES[nome], chaves)
+        for descricao, sondas in casos:
+            buscar = arvore.buscar
+            inicio = time.perf_counter()
+            individuais = [buscar(chave) for chave in sondas]
+            tempo_laco = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            em_lote = arvore.buscar_muitos(sondas)
+            tempo_lote = time.perf_counter() - inicio
+
+            assert individuais == em_lote
+            print(
+                f"{nome:<14} {descricao:<11} {tempo_laco:>9.3f} {tempo_lote:>9.3f} "
+                f"{tempo_laco / tempo_lote:>6.2f}x"
+            )
+
+
+def benchmark_ingestao(quantidade: int, lotes: list, semente: int) -> None:
+    """Compara ``inserir``/``remover`` chave a chave com ``inserir_lote``/``remover_lote``.
+
+    Parte de uma AVL com ``quantidade`` chaves e aplica um lote de cada
+    tamanho em ``lotes``, nas duas formas, sobre cópias equivalentes.
+
+    Args:
+        quantidade (int): Número de chaves iniciais da árvore.
+        lotes (list): Tamanhos de lote a medir.
+        semente (int): Semente do gerador aleatório.
+    """
+    gerador = random.Random(semente)
+    universo = gerador.sample(range(quantidade * 4), quantidade * 2)
+    iniciais, candidatas = universo[:quantidade], universo[quantidade:]
+
+    print(
+        f"{'lote':>8} {'operação':<9} {'laço (µs/chave)':>16} "
+        f"{'lote (µs/chave)':>16} {'ganho':>7}"
+    )
+    for tamanho in lotes:
+        tamanho = min(tamanho, quantidade)
+        novas = candidatas[:tamanho]
+        antigas = gerador.sample(iniciais, tamanho)
+        for operacao, chaves in (("inserir", novas), ("remover", antigas)):
+            arvore = ArvoreAVL.construir_em_lote(iniciais)
+            metodo = getattr(arvore, operacao)
+            inicio = time.perf_counter()
+            for chave in chaves:
+                metodo(chave)
+            tempo_laco = time.perf_counter() - inicio
+
+            arvore = ArvoreAVL.construir_em_lote(iniciais)
+            metodo_lote = getattr(arvore, f"{operacao}_lote")
+            inicio = time.perf_counter()
+            metodo_lote(chaves)
+            tempo_lote = time.perf_counter() - inicio
+
+            print(
+                f"{tamanho:>8} {operacao:<9} {tempo_laco / tamanho * 1e6:>16.2f} "
+                f"{tempo_lote / tamanho * 1e6:>16.2f} {tempo_laco / tempo_lote:>6.2f}x"
+            )
+
+
+def benchmark_instantaneo(quantidade: int, semente: int) -> None:
+    """Compara ``carregar`` de um instantâneo com reinserir as chaves.
+
+    Para AVL e Rubro-Negra, mede a inserção de ``quantidade`` chaves
+    aleatórias, a gravação com ``salvar`` e a leitura com ``carregar``.
+
+    Args:
+        quantidade (int): Número de chaves.
+        semente (int): Semente do gerador aleatório.
+    """
+    chaves = random.Random(semente).sample(range(quantidade * 4), quantidade)
+
+    print(
+        f"{'árvore':<12} {'reinserir (s)':>14} {'salvar (s)':>11} "
+        f"{'carregar (s)':>13} {'ganho':>7} {'arquivo (B/chave)':>18}"
+    )
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "arvore.bin")
+        for nome, classe in (("avl", ArvoreAVL), ("rubro-negra", ArvoreRubroNegro)):
+            arvore = classe()
+            inicio = time.perf_counter()
+            for chave in chaves:
+                arvore.inserir(chave)
+            tempo_insercao = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            arvore.salvar(caminho)
+            tempo_salvar = time.perf_counter() - inicio
+            del arvore
+            gc.collect()
+
+            inicio = time.perf_counter()
+            classe.carregar(caminho)
+            tempo_carregar = time.perf_counter() - inicio
+
+            print(
+                f"{nome:<12} {tempo_insercao:>14.3f} {tempo_salvar:>11.3f} "
+                f"{tempo_carregar:>13.3f} {tempo_insercao / tempo_carregar:>6.2f}x "
+                f"{os.path.getsize(caminho) / quantidade:>18.2f}"
+            )
+
+
+def benchmark_conjuntos(
+    quantidade: int, menores: list, degenerada: int, semente: int
+) -> None:
+    """Compara união, interseção e diferença por join com o laço chave a chave.
+
+    Para cada tamanho ``m`` em ``menores``, combina uma árvore de
+    ``quantidade`` chaves com outra de ``m`` chaves (metade delas em comum).
+    O laço reinsere, busca ou remove as ``m`` chaves na árvore maior, como
+    na mesclagem feita hoje. No fim confere as mesmas operações numa BST
+    degenerada (ver ``_verificar_bst_degenerada``).
+
+    Args:
+        quantidade (int): Chaves da árvore maior.
+        menores (list): Tamanhos da árvore menor.
+        degenerada (int): Chaves de cada BST degenerada.
+        semente (int): Semente do gerador aleatório.
+    """
+    gerador = random.Random(semente)
+    grandes = gerador.sample(range(quantidade * 4), quantidade)
+    conjunto_grande = set(grandes)
+
+    print(
+        f"{'árvore':<12} {'m':>8} {'operação':<11} {'laço (s)':>9} "
+        f"{'join (s)':>9} {'ganho':>7}"
+    )
+    for nome, classe in (("avl", ArvoreAVL), ("rubro-negra", ArvoreRubroNegro)):
+        for tamanho in menores:
+            tamanho = min(tamanho, quantidade)
+            comuns = gerador.sample(grandes, tamanho // 2)
+            novas = []
+            while len(novas) < tamanho - len(comuns):
+                chave = gerador.randrange(quantidade * 4)
+                if chave not in conjunto_grande:
+                    novas.append(chave)
+            pequenas = comuns + novas
+
+            for operacao, laco in (
+                ("uniao", "inserir"),
+                ("intersecao", "buscar"),
+                ("diferenca", "remover"),
+            ):
+                grande = classe.construir_em_lote(grandes)
+                metodo = getattr(grande, laco)
+                inicio = time.perf_counter()
+                encontradas = [chave for chave in pequenas if metodo(chave)]
+                if operacao == "intersecao":
+                    classe.construir_em_lote(encontradas)
+                tempo_laco = time.perf_counter() - inicio
+
+                grande = classe.construir_em_lote(grandes)
+                pequena = classe.construir_em_lote(pequenas)
+                inicio = time.perf_counter()
+                getattr(grande, operacao)(pequena)
+                tempo_join = time.perf_counter() - inicio
+
+                print(
+                    f"{nome:<12} {tamanho:>8} {operacao:<11} {tempo_laco:>9.4f} "
+                    f"{tempo_join:>9.4f} {tempo_laco / tempo_join:>6.2f}x"
+                )
+    _verificar_bst_degenerada(degenerada)
+
+
+def _verificar_bst_degenerada(quantidade: int) -> None:
+    """Confere split, join e operações de conjunto numa BST com altura n.
+
+    Inserções em ordem crescente deixam a BST como uma lista; as operações
+    precisam funcionar sem esgotar a pilha do Python e dar o mesmo
+    resultado que os ``set``. Encerra com erro na primeira divergência.
+
+    Args:
+        quantidade (int): Chaves de cada árvore (e altura delas).
+    """
+
+    def crescente(passo: int) -> ArvoreBST:
+        arvore = ArvoreBST()
+        for chave in range(0, quantidade * passo, passo):
+            arvore.inserir(chave)
+        return arvore
+
+    pares, triplos = set(range(0, quantidade * 2, 2)), set(range(0, quantidade * 3, 3))
+    meio = quantidade // 2
+    inicio = time.perf_counter()
+    menores, encontrado, maiores = crescente(1).dividir(meio)
+    falhas = []
+    if (
+        encontrado is None
+        or encontrado.chave != meio
+        or list(menores) != list(range(meio))
+        or list(maiores) != list(range(meio + 1, quantidade))
+    ):
+        falhas.append("dividir")
+    if list(menores.juntar(meio, maiores)) != list(range(quantidade)):
+        falhas.append("juntar")
+    for operacao, esperado in (
+        ("uniao", pares | triplos),
+        ("intersecao", pares & triplos),
+        ("diferenca", pares - triplos),
+    ):
+        resultado = getattr(crescente(2), operacao)(crescente(3))
+        if list(resultado) != sorted(esperado) or not resultado.validar_propriedades():
+            falhas.append(operacao)
+    if falhas:
+        raise SystemExit(f"BST degenerada ({quantidade} chaves): {', '.join(falhas)}")
+    print(
+        f"BST degenerada ({quantidade} chaves): dividir, juntar e conjuntos ok "
+        f"em {time.perf_counter() - inicio:.2f} s"
+    )
+
+
+def benchmark_paralelo(quantidade: int, trabalhadores: list, semente: int) -> None:
+    """Mede o ganho do modo paralelo sobre a versão serial com N processos.
+
+    Compara ``construir_em_lote`` com ``construir_paralelo`` e ``uniao``/
+    ``intersecao`` (join, serial) com ``uniao_paralela``/
+    ``intersecao_paralela`` entre duas árvores de ``quantidade`` chaves
+    com metade das chaves em comum.
+
+    Args:
+        quantidade (int): Chaves de cada árvore.
+        trabalhadores (list): Números de processos a medir.
+        semente (int): Semente do gerador aleatório.
+    """
+    gerador = random.Random(semente)
+    universo = gerador.sample(range(quantidade * 4), quantidade * 3 // 2)
+    primeiras = universo[:quantidade]
+    segundas = universo[quantidade // 2 :]
+
+    print(f"CPUs disponíveis: {os.cpu_count()}")
+    print(
+        f"{'árvore':<12} {'operação':<11} {'serial (s)':>11} "
+        + " ".join(f"{f'{n} proc. (s)':>12} {'ganho':>6}" for n in trabalhadores)
+    )
+    for nome, classe in (("avl", ArvoreAVL), ("rubro-negra", ArvoreRubroNegro)):
+        for operacao in ("construcao", "uniao", "intersecao"):
+            if operacao == "construcao":
+                inicio = time.perf_counter()
+                classe.construir_em_lote(primeiras)
+                tempo_serial = time.perf_counter() - inicio
+            else:
+                a = classe.construir_em_lote(primeiras)
+                b = classe.construir_em_lote(segundas)
+                inicio = time.perf_counter()
+                getattr(a, operacao)(b)
+                tempo_serial = time.perf_counter() - inicio
+                a = classe.construir_em_lote(primeiras)
+                b = classe.construir_em_lote(segundas)
+
+            colunas = []
+            for numero in trabalhadores:
+                inicio = time.perf_counter()
+                if operacao == "construcao":
+                    construir_paralelo(classe, primeiras, numero)
+                elif operacao == "uniao":
+                    uniao_paralela(a, b, numero)
+                else:
+                    intersecao_paralela(a, b, numero)
+                tempo = time.perf_counter() - inicio
+                colunas.append(f"{tempo:>12.3f} {tempo_serial / tempo:>5.2f}x")
+            print(f"{nome:<12} {operacao:<11} {tempo_serial:>11.3f} " + " ".join(colunas))
+
+
+def benchmark_concorrencia(
+    quantidade: int, leitores: list, duracao: float, semente: int
+) -> None:
+    """Teste de estresse e vazão de ``ArvoreConcorrente`` sob disputa.
+
+    Um escritor alterna inserções e remoções aleatórias enquanto ``n``
+    threads leitoras fazem buscas (e, a cada 64, uma varredura de intervalo)
+    pela trava compartilhada ou pelo instantâneo publicado. Uma thread
+    verificadora valida as invariantes da árvore sob a trava compartilhada
+    ao longo de toda a execução, e o processo termina com erro se alguma
+    verificação falhar. Antes das medições, ``_verificar_consistencia``
+    confere que nenhum leitor vê uma escrita pela metade.
+
+    Args:
+        quantidade (int): Chaves iniciais.
+        leitores (list): Números de threads leitoras a medir.
+        duracao (float): Segundos de cada medição.
+        semente (int): Semente do gerador aleatório.
+    """
+    universo = quantidade * 4
+    iniciais = random.Random(semente).sample(range(universo), quantidade)
+    violacoes = 0
+
+    for nome, classe in (("avl", ArvoreAVL), ("rubro-negra", ArvoreRubroNegro)):
+        try:
+            conferidas = _verificar_consistencia(classe, semente=semente)
+        except AssertionError as erro:
+            raise SystemExit(f"{nome}: {erro}") from erro
+        print(f"{nome}: consistência leitores/escritor ok ({conferidas} leituras)")
+
+    print(
+        f"{'árvore':<12} {'leitores':>8} {'modo':<12} {'leituras/s':>12} "
+        f"{'escritas/s':>11} {'verificações':>12}"
+    )
+    for nome, classe in (("avl", ArvoreAVL), ("rubro-negra", ArvoreRubroNegro)):
+        for numero in leitores:
+            for modo in ("trava", "instantaneo"):
+                arvore = ArvoreConcorrente(classe)
+                with arvore.escrita() as interna:
+                    for chave in iniciais:
+                        interna.inserir(chave)
+
+                parar = threading.Event()
+                leituras = [0] * numero
+                contagem = {"escritas": 0, "verificacoes": 0, "falhas": 0}
+
+                def escrever():
+                    gerador = random.Random(semente + 1)
+                    while not parar.is_set():
+                        arvore.inserir(gerador.randrange(universo))
+                        arvore.remover(gerador.randrange(universo))
+                        contagem["escritas"] += 2
+
+                def ler(indice: int):
+                    gerador = random.Random(semente + 2 + indice)
+                    feitas = 0
+                    while not parar.is_set():
+                        chave = gerador.randrange(universo)
+                        fonte = arvore if modo == "trava" else arvore.instantaneo()
+                        if feitas % 64:
+                            chave in fonte
+                        else:
+                            list(fonte.intervalo(chave, chave + 100))
+                        feitas += 1
+                    leituras[indice] = feitas
+
+                def verificar():
+                    while not parar.wait(0.05):
+                        with arvore.leitura() as interna:
+                            valida = interna.validar_propriedades()
+                        instantaneo = arvore.instantaneo().chaves
+                        valida = valida and all(
+                            a < b for a, b in zip(instantaneo, instantaneo[1:])
+                        )
+                        contagem["verificacoes"] += 1
+                        contagem["falhas"] += not valida
+
+                threads = [threading.Thread(target=escrever)]
+                threads += [
+                    threading.Thread(target=ler, args=(indice,))
+                    for indice in range(numero)
+                ]
+                threads.append(threading.Thread(target=verificar))
+                for thread in threads:
+                    thread.start()
+                time.sleep(duracao)
+                parar.set()
+                for thread in threads:
+                    thread.join()
+
+                with arvore.leitura() as interna:
+                    contagem["falhas"] += not interna.validar_propriedades()
+                violacoes += contagem["falhas"]
+                print(
+                    f"{nome:<12} {numero:>8} {modo:<12} "
+                    f"{sum(leituras) / duracao:>12,.0f} "
+                    f"{contagem['escritas'] / duracao:>11,.0f} "
+                    f"{contagem['verificacoes'] - contagem['falhas']:>5}/"
+                    f"{contagem['verificacoes']:<6}"
+                )
+
+    if violacoes:
+        raise SystemExit(f"{violacoes} verificações de invariantes falharam.")
+
+
+def _verificar_consistencia(
+    classe=ArvoreAVL, leitores: int = 4, lotes: int = 2000, semente: int = 0
+) -> int:
+    """Confere, com threads, que nenhum leitor vê um estado intermediário.
+
+    Um escritor insere ou remove pares de chaves ``(2k, 2k + 1)`` num mesmo
+    bloco ``escrita()``, outra thread chama ``publicar()`` sem parar e
+    ``leitores`` threads conferem, pelos três caminhos de leitura, que:
+
+    - sob ``leitura()`` a árvore é válida (``validar_propriedades``) e só
+      tem pares completos;
+    - ``intervalo(2k, 2k + 2)`` devolve o par inteiro ou nada, e
+      ``buscar`` devolve a própria chave ou ``None``;
+    - cada instantâneo está ordenado, só tem pares completos e tem versão
+      maior ou igual à do anterior visto pelo mesmo leitor.
+
+    No fim, o instantâneo publicado deve ter as mesmas chaves da árvore.
+    Roda no início de ``benchmark_concorrencia``.
+
+    Args:
+        classe (optional): ``ArvoreAVL`` (padrão) ou ``ArvoreRubroNegro``.
+        leitores (int, optional): Threads leitoras.
+        lotes (int, optional): Blocos de escrita feitos pelo escritor.
+        semente (int, optional): Semente dos geradores aleatórios.
+
+    Returns:
+        int: Número de leituras conferidas.
+
+    Raises:
+        AssertionError: Com a primeira inconsistência encontrada.
+    """
+    arvore = ArvoreConcorrente(classe, publicar_a_cada=7)
+    pares = 256
+    terminou = threading.Event()
+    falhas = []
+    conferidas = [0] * leitores
+
+    def sem_pares_partidos(chaves) -> bool:
+        chaves = list(chaves)
+        return len(chaves) % 2 == 0 and all(
+            a % 2 == 0 and b == a + 1 for a, b in zip(chaves[::2], chaves[1::2])
+        )
+
+    def escrever():
+        gerador = random.Random(semente)
+        try:
+            for lote in range(lotes):
+                k = gerador.randrange(pares)
+                with arvore.escrita() as interna:
+                    if interna.buscar(2 * k) is None:
+                        interna.inserir(2 * k)
+                        interna.inserir(2 * k + 1)
+                    else:
+                        interna.remover(2 * k + 1)
+                        interna.remover(2 * k)
+                if lote % 16 == 0:
+                    time.sleep(0)  # a trava prefere o escritor: abre vez aos leitores
+        finally:
+            terminou.set()
+
+    def publicar():
+        while not terminou.wait(0.001):
+            arvore.publicar()
+
+    def ler(indice: int):
+        gerador = random.Random(semente + 1 + indice)
+        versao = -1
+        while not terminou.is_set() and not falhas:
+            k = gerador.randrange(pares)
+            with arvore.leitura() as interna:
+                if not interna.validar_propriedades():
+                    falhas.append("árvore inválida sob a trava de leitura")
+                elif not sem_pares_partidos(interna):
+                    falhas.append("par partido sob a trava de leitura")
+            if len(arvore.intervalo(2 * k, 2 * k + 2)) not in (0, 2):
+                falhas.append(f"intervalo viu o par {2 * k} pela metade")
+            if arvore.buscar(2 * k) not in (None, 2 * k):
+                falhas.append(f"buscar({2 * k}) devolveu outra chave")
+            instantaneo = arvore.instantaneo()
+            if instantaneo.versao < versao:
+                falhas.append(
+                    f"instantâneo voltou da versão {versao} para {instantaneo.versao}"
+                )
+            elif not sem_pares_partidos(instantaneo.chaves):
+                falhas.append(f"par partido no instantâneo {instantaneo.versao}")
+            versao = instantaneo.versao
+            conferidas[indice] += 1
+
+    threads = [threading.Thread(target=escrever), threading.Thread(target=publicar)]
+    threads += [threading.Thread(target=ler, args=(i,)) for i in range(leitores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if not falhas and tuple(arvore._arvore) != arvore.instantaneo().chaves:
+        falhas.append("o último instantâneo não tem as chaves da árvore")
+    if falhas:
+        raise AssertionError(f"{classe.__name__}: {falhas[0]}")
+    return sum(conferidas)
+
+
+def benchmark_persistente(quantidade: int, versoes: int, semente: int) -> None:
+    """Compara versões persistentes com cópias da árvore a cada versão.
+
+    A partir de ``quantidade`` chaves, aplica ``versoes`` alterações
+    (inserções de chaves novas alternadas com remoções) guardando todas as
+    versões. A árvore persistente guarda cada versão por cópia de caminho;
+    a mutável copia seu conteúdo num ``Instantaneo`` (a cópia mais barata
+    disponível, só as chaves em tuplas) depois de cada alteração.
+
+    Args:
+        quantidade (int): Chaves iniciais.
+        versoes (int): Alterações (e versões guardadas).
+        semente (int): Semente do gerador aleatório.
+    """
+    gerador = random.Random(semente)
+    universo = gerador.sample(range(quantidade * 4), quantidade + versoes)
+    iniciais = universo[:quantidade]
+    novas = universo[quantidade:]
+    removidas = gerador.sample(iniciais, versoes)
+    alteracoes = [
+        ("inserir", novas[i]) if i % 2 == 0 else ("remover", removidas[i])
+        for i in range(versoes)
+    ]
+
+    def persistir(base):
+        historico = [base]
+        for operacao, chave in alteracoes:
+            historico.append(getattr(historico[-1], operacao)(chave))
+        return historico
+
+    def copiar(arvore):
+        historico = [Instantaneo.da_arvore(arvore, 0)]
+        for versao, (operacao, chave) in enumerate(alteracoes, 1):
+            getattr(arvore, operacao)(chave)
+            historico.append(Instantaneo.da_arvore(arvore, versao))
+        return historico
+
+    print(
+        f"{'árvore':<12} {'estratégia':<12} {'versões/s':>11} {'B/versão':>11}"
+    )
+    for nome, mutavel, persistente in (
+        ("avl", ArvoreAVL, ArvoreAVLPersistente),
+        ("rubro-negra", ArvoreRubroNegro, ArvoreRubroNegroPersistente),
+    ):
+        base = persistente.construir_em_lote(iniciais)
+        inicio = time.perf_counter()
+        historico = persistir(base)
+        tempo = time.perf_counter() - inicio
+        del historico
+        historico, alocados = _bytes_alocados(lambda: persistir(base))
+        del historico
+        print(
+            f"{nome:<12} {'persistente':<12} {versoes / tempo:>11,.0f} "
+            f"{alocados / versoes:>11,.0f}"
+        )
+
+        arvore = mutavel.construir_em_lote(iniciais)
+        inicio = time.perf_counter()
+        historico = copiar(arvore)
+        tempo = time.perf_counter() - inicio
+        del historico
+        arvore = mutavel.construir_em_lote(iniciais)
+        historico, alocados = _bytes_alocados(lambda: copiar(arvore))
+        del historico
+        print(
+            f"{nome:<12} {'cópia':<12} {versoes / tempo:>11,.0f} "
+            f"{alocados / versoes:>11,.0f}"
+        )
+
+
+def benchmark_validacao(quantidade: int, operacoes: int, semente: int) -> None:
+    """Mede a validação completa e o custo da validação incremental.
+
+    Cronometra ``validar_propriedades`` numa árvore de ``quantidade``
+    chaves e o tempo por operação de ``operacoes`` inserções e remoções
+    aleatórias sem e com ``ativar_depuracao``.
+
+    Args:
+        quantidade (int): Chaves da árvore.
+        operacoes (int): Inserções e remoções medidas.
+        semente (int): Semente do gerador aleatório.
+    """
+    gerador = random.Random(semente)
+    universo = quantidade * 4
+    chaves = gerador.sample(range(universo), quantidade)
+    alteracoes = [gerador.randrange(universo) for _ in range(operacoes)]
+
+    print(
+        f"{'árvore':<12} {'validação completa (s)':>23} {'op. normal (µs)':>16} "
+        f"{'op. depurada (µs)':>18}"
+    )
+    for nome, classe in (("avl", ArvoreAVL), ("rubro-negra", ArvoreRubroNegro)):
+        arvore = classe.construir_em_lote(chaves)
+        inicio = time.perf_counter()
+        if not arvore.validar_propriedades():
+            raise SystemExit(f"{nome}: árvore inválida.")
+        tempo_completo = time.perf_counter() - inicio
+
+        tempos = []
+        for depurar in (False, True):
+            arvore = classe.construir_em_lote(chaves)
+            if depurar:
+                arvore.ativar_depuracao()
+            inicio = time.perf_counter()
+            for indice, chave in enumerate(alteracoes):
+                if indice % 2:
+                    arvore.remover(chave)
+                else:
+                    arvore.inserir(chave)
+            tempos.append((time.perf_counter() - inicio) / operacoes * 1e6)
+        print(
+            f"{nome:<12} {tempo_completo:>23.3f} {tempos[0]:>16.1f} {tempos[1]:>18.1f}"
+        )
+
+
+def benchmark_bmais(quantidade: int, ordens: list, consultas: int, semente: int) -> None:
+    """Compara a Árvore B+ (vários fan-outs) com AVL e Rubro-Negra.
+
+    Para cada árvore mede: bytes por chave (só a estrutura), altura,
+    construção em lote, tempo por busca aleatória, iteração completa em
+    ordem e uma varredura de intervalo com 1% das chaves.
+
+    Args:
+        quantidade (int): Chaves de cada árvore.
+        ordens (list): Fan-outs da Árvore B+ a medir.
+        consultas (int): Buscas aleatórias medidas.
+        semente (int): Semente do gerador aleatório.
+    """
+    gerador = random.Random(semente)
+    chaves = gerador.sample(range(quantidade * 4), quantidade)
+    buscas = [gerador.randrange(quantidade * 4) for _ in range(consultas)]
+    inicio_intervalo = quantidade * 2
+    fim_intervalo = inicio_intervalo + quantidade * 4 // 100
+
+    def altura_binaria(arvore) -> int:
+        if isinstance(arvore, ArvoreAVL):
+            return arvore.raiz.altura
+        niveis = 0
+        for no in arvore._em_ordem(arvore.raiz):
+            if no.esquerda is None and no.direita is None:
+                profundidade = 0
+                while no is not None:
+                    profundidade += 1
+                    no = no.pai
+                niveis = max(niveis, profundidade)
+        return niveis
+
+    casos = [
+        ("avl", lambda: ArvoreAVL.construir_em_lote(chaves), altura_binaria),
+        (
+            "rubro-negra",
+            lambda: ArvoreRubroNegro.construir_em_lote(chaves),
+            altura_binaria,
+        ),
+    ]
+    for ordem in ordens:
+        casos.append(
+            (
+                f"b+ ({ordem})",
+                lambda ordem=ordem: ArvoreBMais.construir_em_lote(chaves, ordem),
+                ArvoreBMais.altura,
+            )
+        )
+
+    print(
+        f"{'árvore':<12} {'B/chave':>8} {'altura':>7} {'construção (s)':>15} "
+        f"{'busca (µs)':>11} {'iteração (s)':>13} {'intervalo (s)':>14}"
+    )
+    for nome, construir, altura in casos:
+        arvore, alocados = _bytes_alocados(construir)
+        del arvore
+        inicio = time.perf_counter()
+        arvore = construir()
+        tempo_construcao = time.perf_counter() - inicio
+
+        buscar = arvore.buscar
+        inicio = time.perf_counter()
+        for chave in buscas:
+            buscar(chave)
+        tempo_busca = (time.perf_counter() - inicio) / consultas * 1e6
+
+        inicio = time.perf_counter()
+        for _ in arvore:
+            pass
+        tempo_iteracao = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for _ in arvore.intervalo(inicio_intervalo, fim_intervalo):
+            pass
+        tempo_intervalo = time.perf_counter() - inicio
+
+        print(
+            f"{nome:<12} {alocados / quantidade:>8.1f} {altura(arvore):>7} "
+            f"{tempo_construcao:>15.3f} {tempo_busca:>11.2f} "
+            f"{tempo_iteracao:>13.3f} {tempo_intervalo:>14.4f}"
+        )
+        del arvore
+
+
+def benchmark_dedo(quantidade: int, operacoes: int, semente: int) -> None:
+    """Compara as operações a partir da raiz com as feitas a partir do dedo.
+
+    Sobre uma árvore com ``quantidade`` chaves pares, mede ``operacoes``
+    operações de cada fluxo:
+
+    - ``sequencial``: inserção de chaves crescentes após a maior (timestamps);
+    - ``quase ordenada``: inserção de chaves ímpares em ordem, cada uma
+      deslocada até 32 posições;
+    - ``busca em ordem``: busca das chaves existentes em ordem crescente;
+    - ``remoção em ordem``: remoção das chaves existentes em ordem crescente.
+
+    Args:
+        quantidade (int): Chaves iniciais.
+        operacoes (int): Operações de cada fluxo.
+        semente (int): Semente do gerador aleatório.
+    """
+    gerador = random.Random(semente)
+    iniciais = range(0, quantidade * 2, 2)
+    inicio_fluxo = quantidade // 2 * 2
+    existentes = list(range(inicio_fluxo, inicio_fluxo + operacoes * 2, 2))
+    impares = [chave + 1 for chave in existentes]
+    quase_ordenadas = [
+        chave
+        for _, chave in sorted(
+            (indice + gerador.uniform(-32, 32), chave)
+            for indice, chave in enumerate(impares)
+        )
+    ]
+    fluxos = [
+        ("sequencial", "inserir", list(range(quantidade * 2, quantidade * 2 + operacoes))),
+        ("quase ordenada", "inserir", quase_ordenadas),
+        ("busca em ordem", "buscar", existentes),
+        ("remoção em ordem", "remover", existentes),
+    ]
+
+    print(
+        f"{'árvore':<12} {'fluxo':<17} {'raiz (µs)':>10} {'dedo (µs)':>10} "
+        f"{'ganho':>7}"
+    )
+    for nome, classe in (("avl", ArvoreAVL), ("rubro-negra", ArvoreRubroNegro)):
+        for fluxo, operacao, chaves in fluxos:
+            tempos = []
+            for metodo in (operacao, f"{operacao}_perto"):
+                arvore = classe.construir_em_lote(iniciais)
+                executar = getattr(arvore, metodo)
+                inicio = time.perf_counter()
+                for chave in chaves:
+                    executar(chave)
+                tempos.append((time.perf_counter() - inicio) / len(chaves) * 1e6)
+            print(
+                f"{nome:<12} {fluxo:<17} {tempos[0]:>10.2f} {tempos[1]:>10.2f} "
+                f"{tempos[0] / tempos[1]:>6.2f}x"
+            )
+
+
+def benchmark_zipf(
+    quantidade: int,
+    consultas: int,
+    expoentes: list,
+    probabilidade: float,
+    semente: int,
+) -> None:
+    """Compara a vazão de buscas sob popularidade Zipf entre as árvores.
+
+    As chaves populares ficam espalhadas (a ordem de popularidade é
+    aleatória) e a chave de posição ``r`` é buscada com peso ``1 / r**s``;
+    ``s = 0`` é o acesso uniforme. Cada árvore parte de uma construção em
+    lote e a medição inclui o tempo que Splay e Treap gastam se ajustando.
+    A Splay aparece também no modo aleatorizado, afunilando só uma fração
+    ``probabilidade`` das buscas. A profundidade média das buscas é medida
+    ao final, sem alterar a árvore.
+
+    Args:
+        quantidade (int): Chaves de cada árvore.
+        consultas (int): Buscas medidas por expoente.
+        expoentes (list): Expoentes ``s`` da distribuição.
+        probabilidade (float): Chance de afunilar da Splay aleatorizada.
+        semente (int): Semente do gerador aleatório.
+    """
+    gerador = random.Random(semente)
+    chaves = gerador.sample(range(quantidade * 4), quantidade)
+    arvores = [
+        ("avl", lambda: ArvoreAVL.construir_em_lote(chaves)),
+        ("rubro-negra", lambda: ArvoreRubroNegro.construir_em_lote(chaves)),
+        ("splay", lambda: ArvoreSplay.construir_em_lote(chaves)),
+        (
+            f"splay ({probabilidade:g})",
+            lambda: ArvoreSplay.construir_em_lote(chaves, probabilidade),
+        ),
+        ("treap", lambda: Treap.construir_em_lote(chaves)),
+    ]
+
+    def profundidade(arvore, chave) -> int:
+        no = arvore.raiz
+        passos = 1
+        while chave < no.chave or no.chave < chave:
+            no = no.esquerda if chave < no.chave else no.direita
+            passos += 1
+        return passos
+
+    print(
+        f"{'s':>4} {'árvore':<14} {'buscas/s':>12} {'vs AVL':>7} "
+        f"{'profundidade média':>19}"
+    )
+    for expoente in expoentes:
+        pesos = list(
+            itertools.accumulate(
+                1 / posicao**expoente for posicao in range(1, quantidade + 1)
+            )
+        )
+        buscas = gerador.choices(chaves, cum_weights=pesos, k=consultas)
+        amostra = buscas[: min(consultas, 20_000)]
+        referencia = None
+        for nome, construir in arvores:
+            arvore = construir()
+            buscar = arvore.buscar
+            inicio = time.perf_counter()
+            for chave in buscas:
+                buscar(chave)
+            vazao = consultas / (time.perf_counter() - inicio)
+            referencia = referencia or vazao
+            media = sum(profundidade(arvore, chave) for chave in amostra) / len(amostra)
+            print(
+                f"{expoente:>4} {nome:<14} {vazao:>12,.0f} "
+                f"{vazao / referencia:>6.2f}x {media:>19.1f}"
+            )
+            del arvore
+
+
+def benchmark_servico(
+    quantidade: int,
+    clientes: list,
+    requisicoes: int,
+    varredura: float,
+    semente: int,
+) -> None:
+    """Gerador de carga local: latência de requisições num serviço asyncio.
+
+    ``n`` clientes concorrentes no mesmo laço fazem, cada um, requisições
+    em sequência: 80% buscas, o resto dividido entre inserções e remoções,
+    e uma fração ``varredura`` de percursos completos (``mostrar``). Cada
+    requisição passa por uma volta do laço (``asyncio.sleep(0)``, como a
+    leitura de um socket) antes de ser atendida, e a latência vai do
+    início dessa volta até a resposta.
+
+    No modo ``direto`` cada cliente chama a árvore sincronamente, e um
+    percurso bloqueia o laço até terminar; no modo ``assincrona`` as
+    requisições passam por ``ArvoreAssincrona``. Os percentis são das
+    requisições pontuais (sem os percursos), em milissegundos.
+
+    Args:
+        quantidade (int): Chaves iniciais.
+        clientes (list): Números de clientes concorrentes a medir.
+        requisicoes (int): Requisições por medição, divididas entre os clientes.
+        varredura (float): Fração das requisições que percorre a árvore toda.
+        semente (int): Semente do gerador aleatório.
+    """
+    universo = quantidade * 4
+    iniciais = random.Random(semente).sample(range(universo), quantidade)
+
+    def percentil(ordenadas: list, fracao: float) -> float:
+        return ordenadas[int(fracao * (len(ordenadas) - 1))] * 1e3
+
+    async def medir(classe, modo: str, numero: int) -> tuple:
+        if modo == "direto":
+            arvore = classe()
+            for chave in iniciais:
+                arvore.inserir(chave)
+        else:
+            servico = ArvoreAssincrona(classe)
+            await asyncio.gather(*(servico.inserir(chave) for chave in iniciais))
+        latencias = []
+        por_cliente = requisicoes // numero
+
+        async def cliente(indice: int) -> None:
+            gerador = random.Random(semente + 1 + indice)
+            for _ in range(por_cliente):
+                sorteio = gerador.random()
+                chave = gerador.randrange(universo)
+                inicio = time.perf_counter()
+                await asyncio.sleep(0)
+                if sorteio < varredura:
+                    if modo == "direto":
+                        arvore.mostrar()
+                    else:
+                        await servico.mostrar()
+                    continue
+                if modo == "direto":
+                    if sorteio < 0.8:
+                        arvore.buscar(chave)
+                    elif sorteio < 0.9:
+                        arvore.inserir(chave)
+                    else:
+                        arvore.remover(chave)
+                elif sorteio < 0.8:
+                    await servico.contem(chave)
+                elif sorteio < 0.9:
+                    await servico.inserir(chave)
+                else:
+                    await servico.remover(chave)
+                latencias.append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(cliente(indice) for indice in range(numero)))
+        duracao = time.perf_counter() - inicio
+        if modo == "assincrona":
+            arvore = servico._arvore
+        if not arvore.validar_propriedades():
+            raise SystemExit(f"{classe.__name__} ({modo}) ficou inválida.")
+        latencias.sort()
+        return por_cliente * numero / duracao, latencias
+
+    print(
+        f"{'árvore':<12} {'clientes':>8} {'modo':<11} {'req/s':>10} "
+        f"{'p50 ms':>8} {'p99 ms':>8} {'p99.9 ms':>9} {'máx ms':>8}"
+    )
+    for nome, classe in (("avl", ArvoreAVL), ("rubro-negra", ArvoreRubroNegro)):
+        for numero in clientes:
+            for modo in ("direto", "assincrona"):
+                vazao, latencias = asyncio.run(medir(classe, modo, numero))
+                print(
+                    f"{nome:<12} {numero:>8} {modo:<11} {vazao:>10,.0f} "
+                    f"{percentil(latencias, 0.5):>8.3f} "
+                    f"{percentil(latencias, 0.99):>8.3f} "
+                    f"{percentil(latencias, 0.999):>9.3f} "
+                    f"{latencias[-1] * 1e3:>8.3f}"
+                )
+
+
+CARGAS = ("aleatoria", "ordenada", "reversa", "zipf", "misto", "remocao")
+
+
+def _gerar_carga(
+    nome: str, quantidade: int, operacoes: int, leitura: float, gerador: random.Random
+) -> list:
+    """Gera a sequência de operações ``(operacao, chave)`` de uma carga.
+
+    Todas as cargas começam carregando ``quantidade`` chaves (na ordem que
+    caracteriza a carga) e seguem com ``operacoes`` operações:
+
+    - ``aleatoria``: chaves em ordem aleatória, buscas uniformes.
+    - ``ordenada`` / ``reversa``: chaves crescentes / decrescentes, buscas uniformes.
+    - ``zipf``: chaves aleatórias, buscas com popularidade Zipf (s = 1.1).
+    - ``misto``: fração ``leitura`` de buscas; o resto divide-se entre
+      inserções de chaves novas e remoções de chaves existentes.
+    - ``remocao``: 70% remoções e 30% inserções.
+
+    Args:
+        nome (str): Uma das cargas em ``CARGAS``.
+        quantidade (int): Chaves da carga inicial.
+        operacoes (int): Operações após a carga inicial.
+        leitura (float): Fração de buscas na carga ``misto``.
+        gerador (random.Random): Gerador aleatório.
+
+    Returns:
+        list: Pares ``(operacao, chave)`` com operação em
+        ``"inserir"``, ``"buscar"`` ou ``"remover"``.
+    """
+    universo = quantidade * 4
+    chaves = gerador.sample(range(universo), quantidade)
+    if nome == "ordenada":
+        chaves.sort()
+    elif nome == "reversa":
+        chaves.sort(reverse=True)
+    sequencia = [("inserir", chave) for chave in chaves]
+
+    if nome == "zipf":
+        pesos = itertools.accumulate(
+            1 / posicao**1.1 for posicao in range(1, quantidade + 1)
+        )
+        populares = gerador.choices(chaves, cum_weights=list(pesos), k=operacoes)
+        sequencia.extend(("buscar", chave) for chave in populares)
+    elif nome in ("misto", "remocao"):
+        fracao_leitura = leitura if nome == "misto" else 0.0
+        fracao_insercao = (1 - fracao_leitura) / 2 if nome == "misto" else 0.3
+        for _ in range(operacoes):
+            sorteio = gerador.random()
+            if sorteio < fracao_leitura:
+                sequencia.append(("buscar", gerador.randrange(universo)))
+            elif sorteio < fracao_leitura + fracao_insercao:
+                sequencia.append(("inserir", gerador.randrange(universo)))
+            else:
+                sequencia.append(("remover", chaves[gerador.randrange(quantidade)]))
+    else:
+        sequencia.extend(
+            ("buscar", gerador.randrange(universo)) for _ in range(operacoes)
+        )
+    return sequencia
+
+
+def _contando_rotacoes(classe):
+    """Cria uma subclasse de ``classe`` que conta as chamadas de rotação."""
+
+    class Contadora(classe):
+        rotacoes = 0
+
+        def _rotacao_esquerda(self, no_atual):
+            self.rotacoes += 1
+            super()._rotacao_esquerda(no_atual)
+
+        def _rotacao_direita(self, no_atual):
+            self.rotacoes += 1
+            super()._rotacao_direita(no_atual)
+
+    Contadora.__name__ = classe.__name__
+    return Contadora
+
+
+def _altura(arvore) -> int:
+    """Altura (em níveis) de uma árvore de objetos ou do motor vetorial."""
+    if isinstance(arvore, ArvoreVetorial):
+        filhos = lambda no: (arvore.esquerda[no], arvore.direita[no])  # noqa: E731
+        nivel = [arvore.raiz] if arvore.raiz != NULO else []
+        nulo = NULO
+    else:
+        filhos = lambda no: (no.esquerda, no.direita)  # noqa: E731
+        nivel = [arvore.raiz] if arvore.raiz is not None else []
+        nulo = None
+    altura = 0
+    while nivel:
+        altura += 1
+        nivel = [filho for no in nivel for filho in filhos(no) if filho != nulo]
+    return altura
+
+
+def _percentil(amostras: list, fracao: float) -> float:
+    """Percentil de ``amostras`` já ordenadas (vizinho mais próximo)."""
+    if not amostras:
+        return 0.0
+    return amostras[min(len(amostras) - 1, int(fracao * len(amostras)))]
+
+
+def _executar_carga(classe, sequencia: list) -> dict:
+    """Executa ``sequencia`` numa árvore nova e coleta as métricas de tempo.
+
+    Returns:
+        dict: Vazão, latências p50/p99 (µs) por operação, rotações e altura final.
+    """
+    arvore = _contando_rotacoes(classe)()
+    metodos = {
+        "inserir": arvore.inserir,
+        "buscar": arvore.buscar,
+        "remover": arvore.remover,
+    }
+    latencias = {operacao: [] for operacao in metodos}
+    relogio = time.perf_counter_ns
+
+    gc.collect()
+    inicio_total = relogio()
+    for operacao, chave in sequencia:
+        inicio = relogio()
+        metodos[operacao](chave)
+        latencias[operacao].append(relogio() - inicio)
+    total = (relogio() - inicio_total) / 1e9
+
+    por_operacao = {}
+    for operacao, amostras in latencias.items():
+        if not amostras:
+            continue
+        amostras.sort()
+        por_operacao[operacao] = {
+            "quantidade": len(amostras),
+            "p50_us": _percentil(amostras, 0.50) / 1e3,
+            "p99_us": _percentil(amostras, 0.99) / 1e3,
+        }
+    return {
+        "operacoes_por_segundo": len(sequencia) / total,
+        "segundos": total,
+        "latencias": por_operacao,
+        "rotacoes": arvore.rotacoes,
+        "altura_final": _altura(arvore),
+        "chaves_finais": len(arvore),
+    }
+
+
+def _pico_memoria(classe, sequencia: list) -> int:
+    """Repete ``sequencia`` sob ``tracemalloc`` e retorna o pico de bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        arvore = classe()
+        metodos = {
+            "inserir": arvore.inserir,
+            "buscar": arvore.buscar,
+            "remover": arvore.remover,
+        }
+        for operacao, chave in sequencia:
+            metodos[operacao](chave)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return pico
+
+
+def _versao_codigo() -> str | None:
+    """Commit atual do repositório, se disponível, para comparar execuções."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_cargas(
+    arvores: list,
+    cargas: list,
+    quantidade: int,
+    operacoes: int,
+    leitura: float,
+    semente: int,
+    memoria: bool,
+    saida_json: str | None,
+) -> None:
+    """Executa cargas de trabalho realistas em cada árvore e relata as métricas.
+
+    Para cada par (árvore, carga) mede vazão, latência p50/p99 por tipo de
+    operação, rotações, altura final e, opcionalmente, o pico de memória
+    (numa segunda execução sob ``tracemalloc``, para não distorcer os tempos).
+
+    Args:
+        arvores (list): Nomes de árvores de ``ARVORES``.
+        cargas (list): Nomes de cargas de ``CARGAS``.
+        quantidade (int): Chaves da carga inicial.
+        operacoes (int): Operações após a carga inicial.
+        leitura (float): Fração de buscas na carga ``misto``.
+        semente (int): Semente do gerador aleatório.
+        memoria (bool): Se ``True``, mede também o pico de memória.
+        saida_json (str | None): Caminho do arquivo JSON de resultados.
+    """
+    resultados = []
+    print(
+        f"{'árvore':<22} {'carga':<10} {'ops/s':>10} {'buscar p50/p99 (µs)':>20} "
+        f"{'inserir p50/p99':>16} {'remover p50/p99':>16} {'rotações':>10} "
+        f"{'altura':>7} {'pico (MiB)':>11}"
+    )
+    for carga in cargas:
+        sequencia = _gerar_carga(
+            carga, quantidade, operacoes, leitura, random.Random(semente)
+        )
+        for nome in arvores:
+            metricas = _executar_carga(ARVORES[nome], sequencia)
+            if memoria:
+                metricas["pico_memoria_bytes"] = _pico_memoria(ARVORES[nome], sequencia)
+            resultados.append({"arvore": nome, "carga": carga, **metricas})
+
+            colunas = []
+            for operacao in ("buscar", "inserir", "remover"):
+                latencia = metricas["latencias"].get(operacao)
+                colunas.append(
+                    f"{latencia['p50_us']:.1f}/{latencia['p99_us']:.1f}"
+                    if latencia
+                    else "-"
+                )
+            pico = metricas.get("pico_memoria_bytes")
+            print(
+                f"{nome:<22} {carga:<10} {metricas['operacoes_por_segundo']:>10,.0f} "
+                f"{colunas[0]:>20} {colunas[1]:>16} {colunas[2]:>16} "
+                f"{metricas['rotacoes']:>10} {metricas['altura_final']:>7} "
+                f"{(pico / 2**20 if pico else 0):>11.1f}"
+            )
+
+    if saida_json:
+        relatorio = {
+            "metadados": {
+                "commit": _versao_codigo(),
+                "data": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "plataforma": platform.platform(),
+                "quantidade": quantidade,
+                "operacoes": operacoes,
+                "leitura": leitura,
+                "semente": semente,
+            },
+            "resultados": resultados,
+        }
+        with open(saida_json, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+        print(f"\nResultados gravados em {saida_json}")
+
+
+def main() -> None:
+    """Interpreta a linha de comando e executa o benchmark escolhido."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subcomandos = parser.add_subparsers(dest="benchmark", required=True)
+
+    memoria = subcomandos.add_parser("memoria", help="bytes por chave dos nós")
+    memoria.add_argument("--quantidade", type=int, default=1_000_000)
+
+    operacoes = subcomandos.add_parser(
+        "operacoes", help="tempo por inserção/remoção aleatória"
+    )
+    operacoes.add_argument("--quantidade", type=int, default=1_000_000)
+    operacoes.add_argument("--semente", type=int, default=42)
+
+    busca = subcomandos.add_parser("busca", help="vazão de buscar")
+    busca.add_argument("--quantidade", type=int, default=1_000_000)
+    busca.add_argument("--consultas", type=int, default=200_000)
+    busca.add_argument("--semente", type=int, default=42)
+
+    lote = subcomandos.add_parser("lote", help="buscar_muitos vs buscar em laço")
+    lote.add_argument("--quantidade", type=int, default=1_000_000)
+    lote.add_argument("--consultas", type=int, default=100_000)
+    lote.add_argument("--semente", type=int, default=42)
+
+    ingestao = subcomandos.add_parser(
+        "ingestao", help="inserir_lote/remover_lote vs laço (AVL)"
+    )
+    ingestao.add_argument("--quantidade", type=int, default=1_000_000)
+    ingestao.add_argument(
+        "--lotes", type=int, nargs="+", default=[10_000, 100_000]
+    )
+    ingestao.add_argument("--semente", type=int, default=42)
+
+    instantaneo = subcomandos.add_parser(
+        "instantaneo", help="carregar instantâneo vs reinserir as chaves"
+    )
+    instantaneo.add_argument("--quantidade", type=int, default=1_000_000)
+    instantaneo.add_argument("--semente", type=int, default=42)
+
+    conjuntos = subcomandos.add_parser(
+        "conjuntos", help="união/interseção/diferença por join vs laço"
+    )
+    conjuntos.add_argument("--quantidade", type=int, default=1_000_000)
+    conjuntos.add_argument(
+        "--menores", type=int, nargs="+", default=[100, 10_000, 1_000_000]
+    )
+    conjuntos.add_argument("--degenerada", type=int, default=2_000)
+    conjuntos.add_argument("--semente", type=int, default=42)
+
+    paralelo = subcomandos.add_parser(
+        "paralelo", help="construção e união/interseção com N processos"
+    )
+    paralelo.add_argument("--quantidade", type=int, default=1_000_000)
+    paralelo.add_argument(
+        "--trabalhadores", type=int, nargs="+", default=[1, 2, 4, 8]
+    )
+    paralelo.add_argument("--semente", type=int, default=42)
+
+    concorrencia = subcomandos.add_parser(
+        "concorrencia", help="estresse e vazão com leitores e um escritor"
+    )
+    concorrencia.add_argument("--quantidade", type=int, default=100_000)
+    concorrencia.add_argument(
+        "--leitores", type=int, nargs="+", default=[1, 4, 16]
+    )
+    concorrencia.add_argument("--duracao", type=float, default=2.0)
+    concorrencia.add_argument("--semente", type=int, default=42)
+
+    persistente = subcomandos.add_parser(
+        "persistente", help="versões por cópia de caminho vs cópia da árvore"
+    )
+    persistente.add_argument("--quantidade", type=int, default=100_000)
+    persistente.add_argument("--versoes", type=int, default=500)
+    persistente.add_argument("--semente", type=int, default=42)
+
+    validacao = subcomandos.add_parser(
+        "validacao", help="validação completa vs incremental por operação"
+    )
+    validacao.add_argument("--quantidade", type=int, default=1_000_000)
+    validacao.add_argument("--operacoes", type=int, default=50_000)
+    validacao.add_argument("--semente", type=int, default=42)
+
+    bmais = subcomandos.add_parser(
+        "bmais", help="Árvore B+ (fan-outs) vs AVL e Rubro-Negra"
+    )
+    bmais.add_argument("--quantidade", type=int, default=1_000_000)
+    bmais.add_argument("--ordens", type=int, nargs="+", default=[16, 64, 256])
+    bmais.add_argument("--consultas", type=int, default=200_000)
+    bmais.add_argument("--semente", type=int, default=42)
+
+    dedo = subcomandos.add_parser(
+        "dedo", help="operações a partir do dedo vs da raiz em fluxos ordenados"
+    )
+    dedo.add_argument("--quantidade", type=int, default=1_000_000)
+    dedo.add_argument("--operacoes", type=int, default=200_000)
+    dedo.add_argument("--semente", type=int, default=42)
+
+    zipf = subcomandos.add_parser(
+        "zipf", help="buscas com popularidade Zipf: Splay e Treap vs AVL e RB"
+    )
+    zipf.add_argument("--quantidade", type=int, default=1_000_000)
+    zipf.add_argument("--consultas", type=int, default=500_000)
+    zipf.add_argument(
+        "--expoentes", type=float, nargs="+", default=[0.0, 0.8, 1.0, 1.2]
+    )
+    zipf.add_argument(
+        "--probabilidade",
+        type=float,
+        default=0.05,
+        help="chance de afunilar da Splay aleatorizada",
+    )
+    zipf.add_argument("--semente", type=int, default=42)
+
+    servico = subcomandos.add_parser(
+        "servico", help="latência de clientes asyncio: direto vs ArvoreAssincrona"
+    )
+    servico.add_argument("--quantidade", type=int, default=100_000)
+    servico.add_argument("--clientes", type=int, nargs="+", default=[16, 256])
+    servico.add_argument("--requisicoes", type=int, default=100_000)
+    servico.add_argument(
+        "--varredura",
+        type=float,
+        default=0.0005,
+        help="fração de requisições que percorrem a árvore toda",
+    )
+    servico.add_argument("--semente", type=int, default=42)
+
+    cargas = subcomandos.add_parser(
+        "cargas", help="cargas realistas com saída JSON para comparar commits"
+    )
+    cargas.add_argument(
+        "--arvores",
+        nargs="+",
+        choices=list(ARVORES),
+        default=["avl", "rubro-negra", "avl-vetorial", "rubro-negra-vetorial"],
+    )
+    cargas.add_argument("--cargas", nargs="+", choices=CARGAS, default=list(CARGAS))
+    cargas.add_argument("--quantidade", type=int, default=100_000)
+    cargas.add_argument("--operacoes", type=int, default=100_000)
+    cargas.add_argument(
+        "--leitura", type=float, default=0.9, help="fração de buscas em 'misto'"
+    )
+    cargas.add_argument("--semente", type=int, default=42)
+    cargas.add_argument(
+        "--sem-memoria",
+        dest="memoria",
+        action="store_false",
+        help="não mede o pico de memória",
+    )
+    cargas.add_argument("--json", dest="saida_json", help="arquivo JSON de saída")
+
+    argumentos = parser.parse_args()
+    match argumentos.benchmark:
+        case "memoria":
+            benchmark_memoria(argumentos.quantidade)
+        case "operacoes":
+            benchmark_operacoes(argumentos.quantidade, argumentos.semente)
+        case "busca":
+            benchmark_busca(
+                argumentos.quantidade, argumentos.consultas, argumentos.semente
+            )
+        case "lote":
+            benchmark_lote(
+                argumentos.quantidade, argumentos.consultas, argumentos.semente
+            )
+        case "ingestao":
+            benchmark_ingestao(
+                argumentos.quantidade, argumentos.lotes, argumentos.semente
+            )
+        case "instantaneo":
+            benchmark_instantaneo(argumentos.quantidade, argumentos.semente)
+        case "conjuntos":
+            benchmark_conjuntos(
+                argumentos.quantidade,
+                argumentos.menores,
+                argumentos.degenerada,
+                argumentos.semente,
+            )
+        case "paralelo":
+            benchmark_paralelo(
+                argumentos.quantidade, argumentos.trabalhadores, argumentos.semente
+            )
+        case "concorrencia":
+            benchmark_concorrencia(
+                argumentos.quantidade,
+                argumentos.leitores,
+                argumentos.duracao,
+                argumentos.semente,
+            )
+        case "persistente":
+            benchmark_persistente(
+                argumentos.quantidade, argumentos.versoes, argumentos.semente
+            )
+        case "validacao":
+            benchmark_validacao(
+                argumentos.quantidade, argumentos.operacoes, argumentos.semente
+            )
+        case "bmais":
+            benchmark_bmais(
+                argumentos.quantidade,
+                argumentos.ordens,
+                argumentos.consultas,
+                argumentos.semente,
+            )
+        case "dedo":
+            benchmark_dedo(
+                argumentos.quantidade, argumentos.operacoes, argumentos.semente
+            )
+        case "zipf":
+            benchmark_zipf(
+                argumentos.quantidade,
+                argumentos.consultas,
+                argumentos.expoentes,
+                argumentos.probabilidade,
+                argumentos.semente,
+            )
+        case "servico":
+            benchmark_servico(
+                argumentos.quantidade,
+                argumentos.clientes,
+                argumentos.requisicoes,
+                argumentos.varredura,
+                argumentos.semente,
+            )
+        case "cargas":
+            benchmark_cargas(
+                argumentos.arvores,
+                argumentos.cargas,
+                argumentos.quantidade,
+                argumentos.operacoes,
+                argumentos.leitura,
+                argumentos.semente,
+                argumentos.memoria,
+                argumentos.saida_json,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,19 +4,53 @@ Inclui o nó (`NoBST`) e a árvore (`ArvoreBST`) com operações
 de rotação, busca, inserção, remoção e percursos (pré, em e pós-ordem).
 """
 
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from instrumentacao import (
+    Estatisticas,
+    Gancho,
+    buscar_instrumentado,
+    rotacao_instrumentada,
+)
+from serializacao import (
+    DESLOCAMENTO_ESTADO,
+    TEM_DIREITA,
+    TEM_ESQUERDA,
+    codificar_chaves,
+    escrever_cabecalho,
+    escrever_chaves,
+    escrever_vetor,
+    ler_cabecalho,
+    ler_chaves,
+    ler_vetor,
+)
+
+Chave = Any
+"""Tipo das chaves: qualquer valor totalmente ordenado por ``<``.
+
+Inteiros, strings, ``bytes`` e tuplas deles servem. As árvores só usam
+``<`` entre chaves (a igualdade é ``not a < b and not b < a``).
+"""
+
 
 class NoBST:
     """Nó de uma Árvore Binária de Busca.
 
-    Armazena a `chave` e referências para os filhos (`esquerda`, `direita`)
-    e para o `pai`.
+    Armazena a `chave`, referências para os filhos (`esquerda`, `direita`)
+    e para o `pai`, e o `tamanho` da subárvore (estatística de ordem).
+    Usa ``__slots__`` para dispensar o ``__dict__`` por instância; subclasses
+    devem declarar apenas os atributos que acrescentam.
     """
 
-    def __init__(self, chave: int):
-        self.chave: int = chave
+    __slots__ = ("chave", "esquerda", "direita", "pai", "tamanho")
+
+    def __init__(self, chave: Chave):
+        self.chave: Chave = chave
         self.esquerda: NoBST | None = None
         self.direita: NoBST | None = None
         self.pai: NoBST | None = None
+        self.tamanho: int = 1
 
     def __str__(self) -> str:
         return f"{self.chave}"
@@ -30,12 +64,95 @@ class ArvoreBST:
 
     Args:
         no: classe ou fábrica de nós a ser utilizada (padrão: ``NoBST``).
+
+    Em modo mapa (``mapa = True``, com nós que têm o atributo ``valor``)
+    a árvore também funciona como dicionário ordenado: ``arvore[chave]``,
+    ``get``, ``setdefault``, ``items`` e ``del arvore[chave]``.
+
+    Com uma função ``key`` (como em ``sorted``), ``inserir(item)`` guarda o
+    ``item`` como valor da chave ``key(item)``, calculada uma única vez; as
+    buscas, remoções e consultas recebem a chave já extraída, como em
+    ``bisect`` com ``key``.
     """
 
+    mapa = False
+    key: Callable | None = None
+    _estatisticas: Estatisticas | None = None
+    _dedo: NoBST | None = None
+    _gancho: Gancho | None = None
+    _METODOS_INSTRUMENTADOS = ("buscar", "_rotacao_esquerda", "_rotacao_direita")
+    _TIPO_ARQUIVO = 0
+    _LIMITE_SEQUENCIAL = 64
+    _AJUSTA_NA_BUSCA = False
+
     def __init__(self, no=NoBST):
         self.raiz = None
         self.no = no
 
+    def _usar_funcao_chave(self, key: Callable | None) -> None:
+        """Liga o modo ``key``: ``inserir`` passa a receber itens.
+
+        A troca é feita só nesta instância, então árvores sem ``key`` não
+        pagam nenhum teste extra na inserção.
+        """
+        self.key = key
+        if key is not None:
+            self.inserir = self._inserir_item
+
+    def _inserir_item(self, item) -> bool:
+        """``inserir`` do modo ``key``: guarda ``item`` sob ``key(item)``.
+
+        Args:
+            item: Item a inserir.
+
+        Returns:
+            bool: ``True`` se a chave do item era nova.
+        """
+        no, inserido = self._localizar_ou_inserir(self.key(item))
+        if inserido:
+            no.valor = item
+        return inserido
+
+    def ativar_instrumentacao(self, gancho: Gancho | None = None) -> None:
+        """Liga os contadores de operações desta árvore (zerando-os).
+
+        Conta comparações por busca, rotações, recolorações (Rubro-Negra) e
+        passos de reequilíbrio (AVL). ``buscar``, as rotações e (nas
+        subclasses) o rebalanceamento são substituídos por versões que contam
+        apenas nesta instância; a classe e as demais árvores não são afetadas.
+
+        Args:
+            gancho (Gancho | None, optional): Função chamada a cada evento
+                com ``(evento, quantidade)``, por exemplo ``("busca", 7)``.
+        """
+        self.desativar_instrumentacao()
+        self._estatisticas = Estatisticas()
+        self._gancho = gancho
+        self.buscar = buscar_instrumentado(self, gancho)
+        self._rotacao_esquerda = rotacao_instrumentada(
+            self._rotacao_esquerda, self._estatisticas, gancho, "rotacao_esquerda"
+        )
+        self._rotacao_direita = rotacao_instrumentada(
+            self._rotacao_direita, self._estatisticas, gancho, "rotacao_direita"
+        )
+
+    def desativar_instrumentacao(self) -> None:
+        """Desliga a instrumentação e restaura os métodos originais."""
+        for nome in self._METODOS_INSTRUMENTADOS:
+            vars(self).pop(nome, None)
+        vars(self).pop("_estatisticas", None)
+        vars(self).pop("_gancho", None)
+
+    def estatisticas(self) -> dict:
+        """Retorna um instantâneo dos contadores de instrumentação.
+
+        Returns:
+            dict: Contadores e médias (vazio se a instrumentação estiver desligada).
+        """
+        if self._estatisticas is None:
+            return {}
+        return self._estatisticas.instantaneo()
+
     def _rotacao_direita(self, no_atual: NoBST) -> None:
         """Realiza uma rotação à direita tendo ``no_atual`` como pivô.
 
@@ -48,10 +165,10 @@ class ArvoreBST:
 
         if no_avo is None:
             self.raiz = novo_pai
-        elif no_avo.chave < no_atual.chave:
-            no_avo.direita = novo_pai
-        else:
+        elif no_avo.esquerda is no_atual:
             no_avo.esquerda = novo_pai
+        else:
+            no_avo.direita = novo_pai
 
         novo_pai.pai = no_avo
         novo_pai.direita = no_atual
@@ -62,6 +179,13 @@ class ArvoreBST:
         if novo_filho is not None:
             novo_filho.pai = no_atual
 
+        novo_pai.tamanho = no_atual.tamanho
+        no_atual.tamanho = (
+            1
+            + (novo_filho.tamanho if novo_filho else 0)
+            + (no_atual.direita.tamanho if no_atual.direita else 0)
+        )
+
     def _rotacao_esquerda(self, no_atual: NoBST) -> None:
         """Realiza uma rotação à esquerda tendo ``no_atual`` como pivô.
 
@@ -74,10 +198,10 @@ class ArvoreBST:
 
         if no_avo is None:
             self.raiz = novo_pai
-        elif no_avo.chave < no_atual.chave:
-            no_avo.direita = novo_pai
-        else:
+        elif no_avo.esquerda is no_atual:
             no_avo.esquerda = novo_pai
+        else:
+            no_avo.direita = novo_pai
 
         novo_pai.pai = no_avo
         novo_pai.esquerda = no_atual
@@ -88,40 +212,153 @@ class ArvoreBST:
         if novo_filho is not None:
             novo_filho.pai = no_atual
 
-    def _inserir(self, chave: int) -> NoBST | None:
-        """Insere um novo nó com a ``chave`` na BST.
+        novo_pai.tamanho = no_atual.tamanho
+        no_atual.tamanho = (
+            1
+            + (no_atual.esquerda.tamanho if no_atual.esquerda else 0)
+            + (novo_filho.tamanho if novo_filho else 0)
+        )
+
+    def _inserir(self, chave: Chave, inicio: NoBST | None = None) -> NoBST | None:
+        """Insere um novo nó com a ``chave`` na BST em uma única descida.
+
+        A mesma descida que procura o ponto de inserção detecta chaves
+        repetidas, sem uma busca prévia.
 
         Args:
-            chave (int): Chave a ser inserida.
+            chave (Chave): Chave a ser inserida.
+            inicio (NoBST | None, optional): Nó cuja subárvore certamente
+                contém a posição da ``chave`` (por exemplo, obtido com
+                ``_subir_ate_conter``); padrão é a raiz.
 
         Returns:
             NoBST | None: O nó inserido, ou ``None`` se a chave já existir.
         """
-        if self.buscar(chave) is not None:
-            return None
-
-        novo_no = self.no(chave)
-
-        if self.raiz is None:
-            self.raiz = novo_no
-            return novo_no
-
-        no_atual = self.raiz
+        pai = None
+        no_atual = self.raiz if inicio is None else inicio
         while no_atual is not None:
             pai = no_atual
-            if novo_no.chave < no_atual.chave:
+            if chave < no_atual.chave:
                 no_atual = no_atual.esquerda
-            else:
+            elif no_atual.chave < chave:
                 no_atual = no_atual.direita
+            else:
+                return None
 
+        novo_no = self.no(chave)
         novo_no.pai = pai
-        if novo_no.chave < pai.chave:
+        if pai is None:
+            self.raiz = novo_no
+            return novo_no
+
+        if chave < pai.chave:
             pai.esquerda = novo_no
         else:
             pai.direita = novo_no
 
+        self._ajustar_tamanhos(pai, 1)
         return novo_no
 
+    def _subir_ate_conter(self, no: NoBST, chave: Chave) -> NoBST:
+        """Sobe de ``no`` até o ancestral cuja subárvore contém a posição de ``chave``.
+
+        Válido quando ``no.chave <= chave``, ou quando ``no`` está no caminho
+        de busca de uma chave menor ou igual a ``chave``: basta subir enquanto
+        a chave do pai não for maior que ``chave``.
+
+        Args:
+            no (NoBST): Nó de partida.
+            chave (Chave): Chave procurada.
+
+        Returns:
+            NoBST: Nó a partir do qual descer.
+        """
+        pai = no.pai
+        while pai is not None and not chave < pai.chave:
+            no = pai
+            pai = no.pai
+        return no
+
+    def _subir_ate_conter_abaixo(self, no: NoBST, chave: Chave) -> NoBST:
+        """Espelho de ``_subir_ate_conter`` para ``chave < no.chave``.
+
+        Sobe enquanto a chave do pai não for menor que ``chave``.
+
+        Args:
+            no (NoBST): Nó de partida.
+            chave (Chave): Chave procurada.
+
+        Returns:
+            NoBST: Nó a partir do qual descer.
+        """
+        pai = no.pai
+        while pai is not None and not pai.chave < chave:
+            no = pai
+            pai = no.pai
+        return no
+
+    def _ajustar_tamanhos(self, no: NoBST | None, delta: int) -> None:
+        """Soma ``delta`` ao ``tamanho`` de ``no`` e de todos os seus ancestrais.
+
+        Args:
+            no (NoBST | None): Primeiro nó do caminho até a raiz.
+            delta (int): Variação a aplicar (``1`` na inserção, ``-1`` na remoção).
+        """
+        while no is not None:
+            no.tamanho += delta
+            no = no.pai
+
+    def _construir_balanceada(
+        self, chaves: list, inicio: int, fim: int
+    ) -> NoBST | None:
+        """Constrói uma subárvore perfeitamente balanceada a partir de ``chaves``.
+
+        Usa o elemento central de ``chaves[inicio:fim]`` como raiz e repete o
+        processo nas metades, ligando ``pai``/filhos. Não faz comparações.
+
+        Args:
+            chaves (list): Chaves em ordem estritamente crescente.
+            inicio (int): Índice inicial (inclusivo).
+            fim (int): Índice final (exclusivo).
+
+        Returns:
+            NoBST | None: Raiz da subárvore construída.
+        """
+        if inicio >= fim:
+            return None
+        meio = (inicio + fim) // 2
+        no = self.no(chaves[meio])
+        no.tamanho = fim - inicio
+        no.esquerda = self._construir_balanceada(chaves, inicio, meio)
+        no.direita = self._construir_balanceada(chaves, meio + 1, fim)
+        if no.esquerda is not None:
+            no.esquerda.pai = no
+        if no.direita is not None:
+            no.direita.pai = no
+        return no
+
+    @staticmethod
+    def _preparar_lote(chaves) -> list:
+        """Retorna as chaves em ordem crescente e sem repetições.
+
+        Entradas já ordenadas são verificadas em O(n) e apenas deduplicadas;
+        as demais são ordenadas antes.
+
+        Args:
+            chaves: Iterável de chaves.
+
+        Returns:
+            list: Chaves estritamente crescentes.
+        """
+        chaves = list(chaves)
+        if any(chaves[i + 1] < chaves[i] for i in range(len(chaves) - 1)):
+            chaves.sort()
+        unicas = []
+        for chave in chaves:
+            if not unicas or unicas[-1] < chave:
+                unicas.append(chave)
+        return unicas
+
     def _sucessor(self, no: NoBST) -> NoBST:
         """Retorna o sucessor in-order de ``no`` (menor nó da subárvore direita)."""
         atual = no.direita
@@ -136,11 +373,123 @@ class ArvoreBST:
             atual = atual.direita
         return atual
 
-    def _remover(self, chave: int) -> NoBST | None:
+    def _proximo(self, no: NoBST) -> NoBST | None:
+        """Retorna o nó seguinte a ``no`` na ordem da árvore inteira.
+
+        Desce para o menor nó da subárvore direita ou, se não houver,
+        sobe pelos ponteiros ``pai`` até sair de uma subárvore esquerda.
+
+        Args:
+            no (NoBST): Nó de referência.
+
+        Returns:
+            NoBST | None: Próximo nó, ou ``None`` se ``no`` for o maior.
+        """
+        if no.direita is not None:
+            return self._sucessor(no)
+        pai = no.pai
+        while pai is not None and no is pai.direita:
+            no = pai
+            pai = pai.pai
+        return pai
+
+    def _anterior(self, no: NoBST) -> NoBST | None:
+        """Retorna o nó anterior a ``no`` na ordem da árvore inteira.
+
+        Args:
+            no (NoBST): Nó de referência.
+
+        Returns:
+            NoBST | None: Nó anterior, ou ``None`` se ``no`` for o menor.
+        """
+        if no.esquerda is not None:
+            return self._antecessor(no)
+        pai = no.pai
+        while pai is not None and no is pai.esquerda:
+            no = pai
+            pai = pai.pai
+        return pai
+
+    def _trocar_com_sucessor(self, no: NoBST, sucessor: NoBST) -> None:
+        """Troca as posições de ``no`` e de seu ``sucessor`` in-order na árvore.
+
+        Os nós são religados (em vez de copiar chaves), de modo que cada
+        nó continua representando a mesma chave. Atributos que pertencem
+        à posição, como ``tamanho``, também são trocados; subclasses
+        estendem a troca para os seus (altura, cor).
+
+        Args:
+            no (NoBST): Nó com dois filhos.
+            sucessor (NoBST): Menor nó da subárvore direita de ``no``.
+        """
+        pai = no.pai
+        if pai is None:
+            self.raiz = sucessor
+        elif pai.esquerda is no:
+            pai.esquerda = sucessor
+        else:
+            pai.direita = sucessor
+
+        filho_direito_sucessor = sucessor.direita
+        sucessor.esquerda = no.esquerda
+        sucessor.esquerda.pai = sucessor
+        no.esquerda = None
+
+        if sucessor is no.direita:
+            sucessor.direita = no
+            no.pai = sucessor
+        else:
+            pai_sucessor = sucessor.pai
+            pai_sucessor.esquerda = no
+            no.pai = pai_sucessor
+            sucessor.direita = no.direita
+            sucessor.direita.pai = sucessor
+
+        sucessor.pai = pai
+        no.direita = filho_direito_sucessor
+        if filho_direito_sucessor is not None:
+            filho_direito_sucessor.pai = no
+
+        no.tamanho, sucessor.tamanho = sucessor.tamanho, no.tamanho
+
+    def _remover_no(self, no: NoBST) -> NoBST | None:
+        """Desliga ``no`` da árvore e retorna o nó a partir do qual reequilibrar.
+
+        Se ``no`` tem dois filhos, ele primeiro troca de posição com o
+        sucessor (achado dentro da própria subárvore); depois sai como
+        um nó de no máximo um filho.
+
+        Args:
+            no (NoBST): Nó a remover.
+
+        Returns:
+            NoBST | None: Pai da posição removida, que pode precisar de reequilíbrio.
+        """
+        if no.esquerda is not None and no.direita is not None:
+            self._trocar_com_sucessor(no, self._sucessor(no))
+
+        pai_do_removido = no.pai
+        novo_filho = no.esquerda if no.esquerda is not None else no.direita
+
+        if pai_do_removido is None:
+            self.raiz = novo_filho
+        elif no is pai_do_removido.esquerda:
+            pai_do_removido.esquerda = novo_filho
+        else:
+            pai_do_removido.direita = novo_filho
+
+        if novo_filho is not None:
+            novo_filho.pai = pai_do_removido
+
+        no.pai = no.esquerda = no.direita = None
+        self._ajustar_tamanhos(pai_do_removido, -1)
+        return pai_do_removido
+
+    def _remover(self, chave: Chave) -> NoBST | None:
         """Remove o nó com a ``chave`` e retorna o nó potencialmente afetado.
 
         Args:
-            chave (int): Chave a remover.
+            chave (Chave): Chave a remover.
 
         Returns:
             NoBST | None: Pai do nó removido, que pode precisar de reequilíbrio.
@@ -148,111 +497,584 @@ class ArvoreBST:
         no_a_remover = self.buscar(chave)
         if no_a_remover is None:
             return None
+        return self._remover_no(no_a_remover)
+
+    def inserir(self, chave: Chave) -> bool:
+        """Insere uma ``chave`` sem reequilíbrio.
+
+        Args:
+            chave (Chave): Chave a inserir.
+
+        Returns:
+            bool: ``True`` se a chave era nova, ``False`` se já existia.
+        """
+        return self._inserir(chave) is not None
+
+    def remover(self, chave: Chave) -> bool:
+        """Remove uma ``chave`` e reequilibra a árvore (na BST, sem reequilíbrio).
 
-        # Caso 1 e 2: Nó com 0 ou 1 filho
-        if no_a_remover.esquerda is None or no_a_remover.direita is None:
-            pai_do_removido = no_a_remover.pai
+        Args:
+            chave (Chave): Chave a remover.
+
+        Returns:
+            bool: ``True`` se a chave existia.
+        """
+        no_a_remover = self.buscar(chave)
+        if no_a_remover is None:
+            return False
+        self._remover_e_reequilibrar(no_a_remover)
+        return True
+
+    def _remover_e_reequilibrar(self, no: NoBST) -> None:
+        """Tira ``no`` da árvore e restaura o balanceamento.
+
+        A BST apenas desliga o nó; AVL e Rubro-Negra reequilibram a partir
+        da posição removida.
+        """
+        self._remover_no(no)
+
+    def _buscar(self, no_atual: NoBST | None, chave: Chave) -> NoBST | None:
+        """Busca iterativa por um nó com a ``chave`` dada.
+
+        Não usa recursão, então funciona mesmo em árvores degeneradas
+        (por exemplo, BST construída com chaves ordenadas).
+
+        Args:
+            no_atual (NoBST | None): Raiz da subárvore atual.
+            chave (Chave): Chave desejada.
 
-            if no_a_remover.esquerda:
-                novo_filho = no_a_remover.esquerda
+        Returns:
+            NoBST | None: Nó encontrado, ou ``None`` se não existir.
+        """
+        while no_atual is not None:
+            if chave < no_atual.chave:
+                no_atual = no_atual.esquerda
+            elif no_atual.chave < chave:
+                no_atual = no_atual.direita
             else:
-                novo_filho = no_a_remover.direita
+                return no_atual
+        return None
+
+    def _pre_ordem(self, no: NoBST | None) -> Iterator[NoBST]:
+        """Percorre a subárvore de ``no`` em pré-ordem, sob demanda.
+
+        Usa uma pilha explícita com no máximo O(h) nós.
 
-            if pai_do_removido is None:
-                self.raiz = novo_filho
+        Args:
+            no (NoBST | None): Raiz da subárvore.
+
+        Yields:
+            NoBST: Nós em pré-ordem.
+        """
+        pilha = [no] if no is not None else []
+        while pilha:
+            no = pilha.pop()
+            yield no
+            if no.direita is not None:
+                pilha.append(no.direita)
+            if no.esquerda is not None:
+                pilha.append(no.esquerda)
+
+    def _em_ordem(self, no: NoBST | None) -> Iterator[NoBST]:
+        """Percorre a subárvore de ``no`` em ordem (in-order), sob demanda.
+
+        Usa uma pilha explícita com no máximo O(h) nós.
+
+        Args:
+            no (NoBST | None): Raiz da subárvore.
+
+        Yields:
+            NoBST: Nós em ordem crescente de chave.
+        """
+        pilha = []
+        while pilha or no is not None:
+            while no is not None:
+                pilha.append(no)
+                no = no.esquerda
+            no = pilha.pop()
+            yield no
+            no = no.direita
+
+    def _em_ordem_reversa(self, no: NoBST | None) -> Iterator[NoBST]:
+        """Percorre a subárvore de ``no`` em ordem decrescente, sob demanda.
+
+        Args:
+            no (NoBST | None): Raiz da subárvore.
+
+        Yields:
+            NoBST: Nós em ordem decrescente de chave.
+        """
+        pilha = []
+        while pilha or no is not None:
+            while no is not None:
+                pilha.append(no)
+                no = no.direita
+            no = pilha.pop()
+            yield no
+            no = no.esquerda
+
+    def _pos_ordem(self, no: NoBST | None) -> Iterator[NoBST]:
+        """Percorre a subárvore de ``no`` em pós-ordem, sob demanda.
+
+        Usa uma pilha explícita com no máximo O(h) nós.
+
+        Args:
+            no (NoBST | None): Raiz da subárvore.
+
+        Yields:
+            NoBST: Nós em pós-ordem.
+        """
+        pilha = []
+        ultimo = None
+        while pilha or no is not None:
+            while no is not None:
+                pilha.append(no)
+                no = no.esquerda
+            topo = pilha[-1]
+            if topo.direita is not None and topo.direita is not ultimo:
+                no = topo.direita
             else:
-                if no_a_remover == pai_do_removido.esquerda:
-                    pai_do_removido.esquerda = novo_filho
+                ultimo = pilha.pop()
+                yield ultimo
+
+    def iter_pre_ordem(self) -> Iterator[Chave]:
+        """Itera as chaves em pré-ordem sem materializar listas."""
+        for no in self._pre_ordem(self.raiz):
+            yield no.chave
+
+    def iter_em_ordem(self) -> Iterator[Chave]:
+        """Itera as chaves em ordem crescente sem materializar listas."""
+        for no in self._em_ordem(self.raiz):
+            yield no.chave
+
+    def iter_pos_ordem(self) -> Iterator[Chave]:
+        """Itera as chaves em pós-ordem sem materializar listas."""
+        for no in self._pos_ordem(self.raiz):
+            yield no.chave
+
+    def __iter__(self) -> Iterator[Chave]:
+        return self.iter_em_ordem()
+
+    def __reversed__(self) -> Iterator[Chave]:
+        for no in self._em_ordem_reversa(self.raiz):
+            yield no.chave
+
+    def buscar(self, chave: Chave) -> NoBST | None:
+        """Busca uma ``chave`` na árvore e retorna o nó correspondente.
+
+        Args:
+            chave (Chave): Chave desejada.
+
+        Returns:
+            NoBST | None: Nó encontrado, ou ``None`` se não existir.
+        """
+        return self._buscar(self.raiz, chave)
+
+    def buscar_muitos(self, chaves) -> list:
+        """Busca várias chaves percorrendo a árvore uma única vez em ordem.
+
+        As consultas são ordenadas e cada descida recomeça do último nó
+        visitado: sobe pelos ponteiros ``pai`` apenas até o ancestral cuja
+        subárvore ainda contém a próxima chave, reaproveitando o prefixo
+        de caminho comum entre chaves consecutivas.
+
+        Args:
+            chaves: Sequência de chaves a buscar.
+
+        Returns:
+            list: Para cada chave, na ordem de entrada, o nó encontrado ou ``None``.
+        """
+        chaves = list(chaves)
+        resultados = [None] * len(chaves)
+        no_atual = self.raiz
+        if no_atual is None:
+            return resultados
+
+        for indice in sorted(range(len(chaves)), key=chaves.__getitem__):
+            chave = chaves[indice]
+            no_atual = self._subir_ate_conter(no_atual, chave)
+            while True:
+                if chave < no_atual.chave:
+                    proximo = no_atual.esquerda
+                elif no_atual.chave < chave:
+                    proximo = no_atual.direita
                 else:
-                    pai_do_removido.direita = novo_filho
+                    resultados[indice] = no_atual
+                    break
+                if proximo is None:
+                    break
+                no_atual = proximo
+        return resultados
 
-            if novo_filho is not None:
-                novo_filho.pai = pai_do_removido
+    def contem_muitos(self, chaves) -> list:
+        """Indica, para cada chave na ordem de entrada, se ela está na árvore.
 
-        # Caso 3: Nó com dois filhos
-        else:
-            sucessor = self._sucessor(no_a_remover)
-            chave_sucessor = sucessor.chave
-            pai_do_removido = self._remover(sucessor.chave)
-            no_a_remover.chave = chave_sucessor
+        Args:
+            chaves: Sequência de chaves a verificar.
 
-        return pai_do_removido
+        Returns:
+            list: ``bool`` por chave.
+        """
+        return [no is not None for no in self.buscar_muitos(chaves)]
+
+    @property
+    def dedo(self) -> NoBST | None:
+        """Último nó acessado por ``buscar_perto``/``inserir_perto``/``remover_perto``."""
+        dedo = self._dedo
+        if dedo is not None and dedo.pai is None and dedo is not self.raiz:
+            return None
+        return dedo
 
-    def _buscar(self, no_atual: NoBST | None, chave: int) -> NoBST | None:
-        """Busca recursiva por um nó com a ``chave`` dada.
+    def _partida(self, chave: Chave) -> NoBST | None:
+        """Nó do qual descer até ``chave``: o ancestral do dedo que a contém.
+
+        Sobe do dedo (ou parte da raiz, se não houver dedo válido) só até a
+        primeira subárvore cujo intervalo de chaves inclui ``chave``.
+        """
+        dedo = self.dedo
+        if dedo is None:
+            return self.raiz
+        if dedo.chave < chave:
+            return self._subir_ate_conter(dedo, chave)
+        if chave < dedo.chave:
+            return self._subir_ate_conter_abaixo(dedo, chave)
+        return dedo
+
+    def buscar_perto(self, chave: Chave) -> NoBST | None:
+        """Busca ``chave`` a partir do dedo, que passa a ficar no nó alcançado.
+
+        Em vez de descer da raiz, sobe do último nó acessado até o ancestral
+        que contém ``chave`` e desce dali: para acessos próximos ao anterior
+        (a uma distância de ``d`` chaves) o custo é O(log d) amortizado em
+        percursos em ordem, e nunca passa de O(log n). Rotações de AVL e
+        Rubro-Negra não invalidam o dedo, pois os nós mantêm suas chaves.
 
         Args:
-            no_atual (NoBST | None): Raiz da subárvore atual.
-            chave (int): Chave desejada.
+            chave (Chave): Chave desejada.
+
+        Returns:
+            NoBST | None: Nó encontrado, ou ``None`` (o dedo fica no último
+            nó visitado).
+        """
+        no_atual = self._partida(chave)
+        while no_atual is not None:
+            if chave < no_atual.chave:
+                proximo = no_atual.esquerda
+            elif no_atual.chave < chave:
+                proximo = no_atual.direita
+            else:
+                self._dedo = no_atual
+                return no_atual
+            if proximo is None:
+                self._dedo = no_atual
+                return None
+            no_atual = proximo
+        return None
+
+    def inserir_perto(self, item) -> bool:
+        """Insere a partir do dedo, como ``buscar_perto``; o dedo vai para o nó.
+
+        A descida é a do dedo; o reequilíbrio e a atualização de
+        ``tamanho`` seguem iguais aos de ``inserir``.
+
+        Args:
+            item: Chave a inserir (ou item, no modo ``key``).
+
+        Returns:
+            bool: ``True`` se a chave era nova.
+        """
+        chave = item if self.key is None else self.key(item)
+        no, inserido = self._localizar_ou_inserir(chave, self._partida(chave))
+        if inserido and self.key is not None:
+            no.valor = item
+        self._dedo = no
+        return inserido
+
+    def remover_perto(self, chave: Chave) -> bool:
+        """Remove a partir do dedo; o dedo passa ao sucessor (ou antecessor).
+
+        Args:
+            chave (Chave): Chave a remover.
+
+        Returns:
+            bool: ``True`` se a chave existia.
+        """
+        no = self._partida(chave)
+        while no is not None and (chave < no.chave or no.chave < chave):
+            no = no.esquerda if chave < no.chave else no.direita
+        if no is None:
+            return False
+        vizinho = self._proximo(no)
+        if vizinho is None:
+            vizinho = self._anterior(no)
+        self._remover_e_reequilibrar(no)
+        self._dedo = vizinho
+        return True
+
+    def piso(self, chave: Chave) -> NoBST | None:
+        """Retorna o nó com a maior chave menor ou igual a ``chave``.
+
+        Args:
+            chave (Chave): Chave de referência.
 
         Returns:
             NoBST | None: Nó encontrado, ou ``None`` se não existir.
         """
-        if no_atual is None or no_atual.chave == chave:
-            return no_atual
-        elif chave < no_atual.chave:
-            return self._buscar(no_atual.esquerda, chave)
+        no_atual = self.raiz
+        melhor = None
+        while no_atual is not None:
+            if chave < no_atual.chave:
+                no_atual = no_atual.esquerda
+            elif no_atual.chave < chave:
+                melhor = no_atual
+                no_atual = no_atual.direita
+            else:
+                return no_atual
+        return melhor
+
+    def teto(self, chave: Chave) -> NoBST | None:
+        """Retorna o nó com a menor chave maior ou igual a ``chave``.
+
+        Args:
+            chave (Chave): Chave de referência.
+
+        Returns:
+            NoBST | None: Nó encontrado, ou ``None`` se não existir.
+        """
+        no_atual = self.raiz
+        melhor = None
+        while no_atual is not None:
+            if chave < no_atual.chave:
+                melhor = no_atual
+                no_atual = no_atual.esquerda
+            elif no_atual.chave < chave:
+                no_atual = no_atual.direita
+            else:
+                return no_atual
+        return melhor
+
+    def sucessor(self, chave: Chave) -> NoBST | None:
+        """Retorna o nó com a menor chave estritamente maior que ``chave``.
+
+        A ``chave`` não precisa estar na árvore.
+
+        Args:
+            chave (Chave): Chave de referência.
+
+        Returns:
+            NoBST | None: Nó encontrado, ou ``None`` se não existir.
+        """
+        no_atual = self.raiz
+        melhor = None
+        while no_atual is not None:
+            if chave < no_atual.chave:
+                melhor = no_atual
+                no_atual = no_atual.esquerda
+            else:
+                no_atual = no_atual.direita
+        return melhor
+
+    def antecessor(self, chave: Chave) -> NoBST | None:
+        """Retorna o nó com a maior chave estritamente menor que ``chave``.
+
+        A ``chave`` não precisa estar na árvore.
+
+        Args:
+            chave (Chave): Chave de referência.
+
+        Returns:
+            NoBST | None: Nó encontrado, ou ``None`` se não existir.
+        """
+        no_atual = self.raiz
+        melhor = None
+        while no_atual is not None:
+            if no_atual.chave < chave:
+                melhor = no_atual
+                no_atual = no_atual.direita
+            else:
+                no_atual = no_atual.esquerda
+        return melhor
+
+    def intervalo(self, a: Chave, b: Chave, reverso: bool = False) -> Iterator[Chave]:
+        """Itera as chaves no intervalo semiaberto ``[a, b)``.
+
+        Localiza a primeira chave em O(log n) e avança pelos ponteiros
+        ``pai``, totalizando O(log n + k) para ``k`` chaves produzidas.
+
+        Args:
+            a (Chave): Limite inferior (inclusivo).
+            b (Chave): Limite superior (exclusivo).
+            reverso (bool, optional): Se ``True``, produz em ordem decrescente.
+
+        Yields:
+            Chave: Chaves dentro do intervalo.
+        """
+        if reverso:
+            no = self.antecessor(b)
+            while no is not None and not no.chave < a:
+                yield no.chave
+                no = self._anterior(no)
         else:
-            return self._buscar(no_atual.direita, chave)
+            no = self.teto(a)
+            while no is not None and no.chave < b:
+                yield no.chave
+                no = self._proximo(no)
+
+    def __len__(self) -> int:
+        return self.raiz.tamanho if self.raiz else 0
+
+    def __contains__(self, chave: Chave) -> bool:
+        return self.buscar(chave) is not None
+
+    def _exigir_mapa(self) -> None:
+        if not self.mapa:
+            raise TypeError("A árvore não guarda valores; crie-a com mapa=True.")
+
+    def _reequilibrar_insercao(self, novo_no: NoBST) -> None:
+        """Restaura o balanceamento após ``_inserir`` criar ``novo_no``.
 
-    def _pre_ordem(self, no: NoBST) -> list:
-        """Gera a lista de chaves da árvore em pré-ordem.
+        A BST não faz nada; AVL e Rubro-Negra aplicam seu reequilíbrio.
+        """
+
+    def _localizar_ou_inserir(
+        self, chave: Chave, inicio: NoBST | None = None
+    ) -> tuple[NoBST, bool]:
+        """Retorna o nó da ``chave``, criando-o se necessário, em uma descida.
 
         Args:
-            no (NoBST): Nó atual na recursão.
+            chave (Chave): Chave desejada.
+            inicio (NoBST | None, optional): Nó cuja subárvore contém a
+                posição da ``chave``; padrão é a raiz.
 
         Returns:
-            list: Chaves em pré-ordem.
+            tuple[NoBST, bool]: O nó e ``True`` se ele acabou de ser inserido.
         """
+        pai = None
+        no_atual = self.raiz if inicio is None else inicio
+        while no_atual is not None:
+            if chave < no_atual.chave:
+                pai, no_atual = no_atual, no_atual.esquerda
+            elif no_atual.chave < chave:
+                pai, no_atual = no_atual, no_atual.direita
+            else:
+                return no_atual, False
+        novo_no = self._inserir(chave, pai)
+        self._reequilibrar_insercao(novo_no)
+        return novo_no, True
+
+    def __getitem__(self, chave: Chave):
+        self._exigir_mapa()
+        no = self.buscar(chave)
         if no is None:
-            return []
-        resultado = [no]
-        resultado.extend(self._pre_ordem(no.esquerda))
-        resultado.extend(self._pre_ordem(no.direita))
-        return resultado
+            raise KeyError(chave)
+        return no.valor
+
+    def __setitem__(self, chave: Chave, valor) -> None:
+        """Associa ``valor`` à ``chave`` (upsert).
+
+        Se a chave já existe, o valor é trocado no próprio nó, sem mexer
+        na estrutura; caso contrário, a chave é inserida e reequilibrada.
+        """
+        self._exigir_mapa()
+        no, _ = self._localizar_ou_inserir(chave)
+        no.valor = valor
+
+    def __delitem__(self, chave: Chave) -> None:
+        self._exigir_mapa()
+        if not self.remover(chave):
+            raise KeyError(chave)
 
-    def _em_ordem(self, no: NoBST) -> list:
-        """Gera a lista de chaves da árvore em ordem (in-order).
+    def get(self, chave: Chave, padrao=None):
+        """Retorna o valor da ``chave``, ou ``padrao`` se ela não existir."""
+        self._exigir_mapa()
+        no = self.buscar(chave)
+        return padrao if no is None else no.valor
+
+    def setdefault(self, chave: Chave, padrao=None):
+        """Retorna o valor da ``chave``, inserindo-a com ``padrao`` se faltar.
 
         Args:
-            no (NoBST): Nó atual na recursão.
+            chave (Chave): Chave desejada.
+            padrao (optional): Valor associado se a chave for nova.
 
         Returns:
-            list: Chaves em ordem.
+            O valor atual da chave.
         """
-        if no is None:
-            return []
-        resultado = self._em_ordem(no.esquerda)
-        resultado.append(no)
-        resultado.extend(self._em_ordem(no.direita))
-        return resultado
+        self._exigir_mapa()
+        no, inserido = self._localizar_ou_inserir(chave)
+        if inserido:
+            no.valor = padrao
+        return no.valor
 
-    def _pos_ordem(self, no: NoBST) -> list:
-        """Gera a lista de chaves da árvore em pós-ordem.
+    def items(self) -> Iterator[tuple]:
+        """Itera os pares ``(chave, valor)`` em ordem crescente de chave."""
+        self._exigir_mapa()
+        return ((no.chave, no.valor) for no in self._em_ordem(self.raiz))
+
+    def valores(self) -> Iterator:
+        """Itera os valores em ordem crescente de chave."""
+        self._exigir_mapa()
+        return (no.valor for no in self._em_ordem(self.raiz))
+
+    def rank(self, chave: Chave) -> int:
+        """Retorna quantas chaves da árvore são estritamente menores que ``chave``.
+
+        Usa o ``tamanho`` das subárvores, em O(h).
 
         Args:
-            no (NoBST): Nó atual na recursão.
+            chave (Chave): Chave de referência (não precisa estar na árvore).
 
         Returns:
-            list: Chaves em pós-ordem.
+            int: Posição (0-based) que ``chave`` ocupa ou ocuparia em ordem.
         """
-        if no is None:
-            return []
-        resultado = self._pos_ordem(no.esquerda)
-        resultado.extend(self._pos_ordem(no.direita))
-        resultado.append(no)
-        return resultado
+        posicao = 0
+        no_atual = self.raiz
+        while no_atual is not None:
+            if no_atual.chave < chave:
+                posicao += 1 + (no_atual.esquerda.tamanho if no_atual.esquerda else 0)
+                no_atual = no_atual.direita
+            else:
+                no_atual = no_atual.esquerda
+        return posicao
 
-    def buscar(self, chave: int) -> NoBST | None:
-        """Busca uma ``chave`` na árvore e retorna o nó correspondente.
+    def selecionar(self, k: int) -> NoBST:
+        """Retorna o nó com a ``k``-ésima menor chave (0-based), em O(h).
 
         Args:
-            chave (int): Chave desejada.
+            k (int): Posição desejada; negativos contam a partir do fim.
 
         Returns:
-            NoBST | None: Nó encontrado, ou ``None`` se não existir.
+            NoBST: Nó na posição ``k``.
+
+        Raises:
+            IndexError: Se ``k`` estiver fora do intervalo.
         """
-        return self._buscar(self.raiz, chave)
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("Posição fora do intervalo da árvore.")
+        no_atual = self.raiz
+        while True:
+            tamanho_esquerda = no_atual.esquerda.tamanho if no_atual.esquerda else 0
+            if k < tamanho_esquerda:
+                no_atual = no_atual.esquerda
+            elif k > tamanho_esquerda:
+                k -= tamanho_esquerda + 1
+                no_atual = no_atual.direita
+            else:
+                return no_atual
+
+    def contar_intervalo(self, a: Chave, b: Chave) -> int:
+        """Conta as chaves no intervalo semiaberto ``[a, b)`` em O(h).
+
+        Args:
+            a (Chave): Limite inferior (inclusivo).
+            b (Chave): Limite superior (exclusivo).
+
+        Returns:
+            int: Quantidade de chaves no intervalo.
+        """
+        return max(0, self.rank(b) - self.rank(a))
 
     def mostrar(self, ordem: str = "em_ordem") -> list:
         """Retorna as chaves conforme a ordem solicitada.
@@ -268,12 +1090,659 @@ class ArvoreBST:
             ValueError: Se ``ordem`` não for uma das opções válidas.
         """
         if ordem == "pre_ordem":
-            return self._pre_ordem(self.raiz)
+            return list(self._pre_ordem(self.raiz))
         elif ordem == "em_ordem":
-            return self._em_ordem(self.raiz)
+            return list(self._em_ordem(self.raiz))
         elif ordem == "pos_ordem":
-            return self._pos_ordem(self.raiz)
+            return list(self._pos_ordem(self.raiz))
         else:
             raise ValueError(
                 "Ordem inválida. Use 'pre_ordem', 'em_ordem' ou 'pos_ordem'."
             )
+
+    def validar_propriedades(self) -> bool:
+        """Valida a árvore inteira em uma única passada iterativa, em O(n).
+
+        Percorre os nós em ordem com pilha explícita e confere em cada um as
+        invariantes locais de ``_verificar_no`` (ponteiros ``pai``,
+        ``tamanho`` e, nas subclasses, altura ou cor e altura-negra em
+        cache); a ordem entre chaves consecutivas garante a propriedade
+        de busca.
+
+        Returns:
+            bool: ``True`` se todas as invariantes são satisfeitas.
+        """
+        if self._verificar_raiz() is not None:
+            return False
+        anterior = None
+        for no in self._em_ordem(self.raiz):
+            if anterior is not None and not anterior.chave < no.chave:
+                return False
+            if self._verificar_no(no) is not None:
+                return False
+            anterior = no
+        return True
+
+    def _verificar_raiz(self) -> str | None:
+        """Retorna a violação das invariantes da raiz, ou ``None``."""
+        if self.raiz is not None and self.raiz.pai is not None:
+            return f"raiz {self.raiz.chave!r} com pai"
+        return None
+
+    def _verificar_no(self, no: NoBST) -> str | None:
+        """Confere as invariantes de ``no`` que dependem só dele e dos filhos.
+
+        Args:
+            no (NoBST): Nó a verificar.
+
+        Returns:
+            str | None: Descrição da violação encontrada, ou ``None``.
+        """
+        esquerda, direita = no.esquerda, no.direita
+        tamanho = 1
+        if esquerda is not None:
+            if esquerda.pai is not no:
+                return f"filho esquerdo de {no.chave!r} com pai inconsistente"
+            if not esquerda.chave < no.chave:
+                return f"filho esquerdo de {no.chave!r} fora de ordem"
+            tamanho += esquerda.tamanho
+        if direita is not None:
+            if direita.pai is not no:
+                return f"filho direito de {no.chave!r} com pai inconsistente"
+            if not no.chave < direita.chave:
+                return f"filho direito de {no.chave!r} fora de ordem"
+            tamanho += direita.tamanho
+        if no.tamanho != tamanho:
+            return f"tamanho {no.tamanho} em cache em {no.chave!r}, real {tamanho}"
+        return None
+
+    def ativar_depuracao(self) -> None:
+        """Valida incrementalmente a árvore após cada inserção ou remoção.
+
+        Em vez da passada O(n) de ``validar_propriedades``, confere só os
+        nós que a operação pode ter alterado: o caminho até a raiz a partir
+        das chaves vizinhas da chave afetada (onde o reequilíbrio acontece)
+        e os filhos desses nós, em O(log n). A ordem é conferida entre pais
+        e filhos; operações em lote e de conjunto não são acompanhadas.
+        Como a instrumentação, vale só para esta instância.
+
+        Raises:
+            AssertionError: Na operação que deixar uma invariante violada.
+        """
+        self.desativar_depuracao()
+        nomes = ["remover", "remover_perto", "_localizar_ou_inserir"]
+        if self.key is None:
+            nomes.append("inserir")
+        originais = {nome: vars(self).get(nome) for nome in nomes}
+        for nome in nomes:
+            setattr(self, nome, self._depurado(getattr(self, nome), nome))
+        self._originais_depuracao = originais
+
+    def desativar_depuracao(self) -> None:
+        """Desliga a validação incremental e restaura os métodos originais."""
+        originais = vars(self).pop("_originais_depuracao", None)
+        if originais is None:
+            return
+        for nome, original in originais.items():
+            if original is None:
+                vars(self).pop(nome, None)
+            else:
+                setattr(self, nome, original)
+
+    def _depurado(self, metodo: Callable, nome: str) -> Callable:
+        """Envolve ``metodo`` (que recebe a chave) com a validação incremental."""
+
+        def verificado(chave, *argumentos):
+            resultado = metodo(chave, *argumentos)
+            mensagem = self._verificar_vizinhanca(chave)
+            if mensagem is not None:
+                raise AssertionError(f"{nome}({chave!r}): {mensagem}")
+            return resultado
+
+        return verificado
+
+    def _verificar_vizinhanca(self, chave: Chave) -> str | None:
+        """Confere os nós que uma alteração na ``chave`` pode ter tocado.
+
+        As rotações e recolorações de inserção e remoção ficam no caminho
+        entre a posição alterada e a raiz ou nos filhos desse caminho; essa
+        posição é ancestral de um dos nós de ``_vizinhos_afetados``.
+
+        Returns:
+            str | None: Descrição da primeira violação, ou ``None``.
+        """
+        mensagem = self._verificar_raiz()
+        if mensagem is not None:
+            return mensagem
+        vistos = set()
+        for no in self._vizinhos_afetados(chave):
+            while no is not None and no not in vistos:
+                vistos.add(no)
+                for verificado in (no, no.esquerda, no.direita):
+                    if verificado is not None:
+                        mensagem = self._verificar_no(verificado)
+                        if mensagem is not None:
+                            return mensagem
+                if no.pai is None and no is not self.raiz:
+                    return f"{no.chave!r} não alcança a raiz pelos pais"
+                no = no.pai
+        return None
+
+    def _vizinhos_afetados(self, chave: Chave) -> tuple:
+        """Nós de onde subir para conferir uma alteração na ``chave``.
+
+        Na AVL e na Rubro-Negra o reequilíbrio sobe da posição alterada,
+        que é ancestral do piso ou do teto da ``chave``.
+        """
+        return self.piso(chave), self.teto(chave)
+
+    def _vazia(self) -> "ArvoreBST":
+        """Cria uma árvore vazia do mesmo tipo e configuração desta."""
+        return type(self)(self.no)
+
+    def _exigir_compativel(self, outra: "ArvoreBST") -> None:
+        if outra.no is not self.no:
+            raise TypeError("As árvores precisam usar o mesmo tipo de nó.")
+
+    @staticmethod
+    def _separar(no: NoBST) -> tuple[NoBST | None, NoBST | None]:
+        """Desliga ``no`` dos filhos e do pai e retorna as duas subárvores soltas."""
+        esquerda, direita = no.esquerda, no.direita
+        if esquerda is not None:
+            esquerda.pai = None
+        if direita is not None:
+            direita.pai = None
+        no.esquerda = no.direita = no.pai = None
+        no.tamanho = 1
+        return esquerda, direita
+
+    def _definir_raiz(self, raiz: NoBST | None) -> None:
+        """Instala ``raiz`` (solta) como raiz da árvore e esquece o dedo.
+
+        Os nós podem ter vindo de (ou ido para) outra árvore, então o dedo
+        de ``buscar_perto`` não é mais confiável.
+        """
+        if raiz is not None:
+            raiz.pai = None
+        self.raiz = raiz
+        self._dedo = None
+
+    def _juntar_nos(
+        self, esquerda: NoBST | None, meio: NoBST, direita: NoBST | None
+    ) -> NoBST:
+        """Une duas subárvores soltas e um nó intermediário numa só.
+
+        Todas as chaves de ``esquerda`` são menores que ``meio.chave`` e as
+        de ``direita``, maiores. A BST apenas põe ``meio`` como raiz; AVL e
+        Rubro-Negra descem pela borda da subárvore mais alta até a altura da
+        outra e reequilibram só esse trecho, em O(diferença de alturas).
+        Pode usar ``self.raiz`` como área de trabalho.
+
+        Args:
+            esquerda (NoBST | None): Subárvore das chaves menores.
+            meio (NoBST): Nó solto com a chave intermediária.
+            direita (NoBST | None): Subárvore das chaves maiores.
+
+        Returns:
+            NoBST: Raiz da subárvore resultante.
+        """
+        meio.esquerda = esquerda
+        meio.direita = direita
+        meio.pai = None
+        if esquerda is not None:
+            esquerda.pai = meio
+        if direita is not None:
+            direita.pai = meio
+        meio.tamanho = (
+            1
+            + (esquerda.tamanho if esquerda else 0)
+            + (direita.tamanho if direita else 0)
+        )
+        return meio
+
+    def _juntar_dois(
+        self, esquerda: NoBST | None, direita: NoBST | None
+    ) -> NoBST | None:
+        """Une duas subárvores soltas (chaves de ``esquerda`` < de ``direita``)."""
+        if esquerda is None:
+            return direita
+        resto, ultimo = self._dividir_ultimo(esquerda)
+        return self._juntar_nos(resto, ultimo, direita)
+
+    def _dividir_ultimo(self, no: NoBST) -> tuple[NoBST | None, NoBST]:
+        """Separa o maior nó da subárvore solta de ``no``.
+
+        Iterativo: desce pela borda direita e junta cada nó com o que sobrou
+        abaixo dele na volta, então não depende da altura da árvore.
+
+        Returns:
+            tuple[NoBST | None, NoBST]: O restante da subárvore e o maior nó, solto.
+        """
+        borda = []
+        esquerda, direita = self._separar(no)
+        while direita is not None:
+            borda.append((esquerda, no))
+            no = direita
+            esquerda, direita = self._separar(no)
+        resto = esquerda
+        for esquerda, pai in reversed(borda):
+            resto = self._juntar_nos(esquerda, pai, resto)
+        return resto, no
+
+    def _dividir_nos(
+        self, no: NoBST | None, chave: Chave
+    ) -> tuple[NoBST | None, NoBST | None, NoBST | None]:
+        """Divide a subárvore solta de ``no`` em torno de ``chave``.
+
+        Desce até a ``chave`` guardando o caminho e, na volta, junta cada
+        lado com as partes que ficaram do mesmo lado; como as juntas
+        telescopam, o custo é O(h). Iterativo, para que uma BST degenerada
+        (h = n) não esgote a pilha do Python.
+
+        Returns:
+            tuple: Subárvore das chaves menores, o nó com ``chave`` (solto)
+            ou ``None``, e subárvore das chaves maiores.
+        """
+        caminho = []
+        encontrado = None
+        while no is not None:
+            esquerda, direita = self._separar(no)
+            if chave < no.chave:
+                caminho.append((False, no, direita))
+                no = esquerda
+            elif no.chave < chave:
+                caminho.append((True, no, esquerda))
+                no = direita
+            else:
+                encontrado = no
+                break
+        if encontrado is None:
+            menores = maiores = None
+        else:
+            menores, maiores = esquerda, direita
+        for menor, pai, outro in reversed(caminho):
+            if menor:
+                menores = self._juntar_nos(outro, pai, menores)
+            else:
+                maiores = self._juntar_nos(maiores, pai, outro)
+        return menores, encontrado, maiores
+
+    def _inserir_nos(
+        self, raiz: NoBST | None, nos: list, sobrescrever: bool
+    ) -> NoBST | None:
+        """Insere as chaves de ``nos`` na subárvore solta de ``raiz``, uma a uma.
+
+        Caso base das operações de conjunto quando um dos lados é pequeno.
+        Em modo mapa, chaves já existentes só recebem o valor do nó
+        correspondente se ``sobrescrever`` for verdadeiro.
+        """
+        self._definir_raiz(raiz)
+        for no in nos:
+            destino, inserido = self._localizar_ou_inserir(no.chave)
+            if self.mapa and (inserido or sobrescrever):
+                destino.valor = no.valor
+        return self.raiz
+
+    def _montar_sequencia(self, nos: list) -> NoBST | None:
+        """Monta uma subárvore com cópias de ``nos`` (em ordem) juntando uma a uma."""
+        raiz = None
+        for no in nos:
+            novo = self.no(no.chave)
+            if self.mapa:
+                novo.valor = no.valor
+            raiz = self._juntar_nos(raiz, novo, None)
+        return raiz
+
+    def _dividir_e_conquistar(
+        self, a: NoBST | None, b: NoBST | None, passo: Callable
+    ) -> NoBST | None:
+        """Resolve uma operação de conjunto com uma pilha explícita.
+
+        ``passo(a, b)`` devolve ``(None, raiz)`` num caso base, ou
+        ``(juntar, partes)`` com ``partes = ((a1, b1), (a2, b2))`` os dois
+        subproblemas e ``juntar(raiz1, raiz2)`` a combinação dos resultados.
+        Os subproblemas são resolvidos na mesma ordem da recursão direta,
+        mas a profundidade não fica limitada pela pilha do Python, o que
+        importa numa BST degenerada.
+        """
+        resultados = []
+        pendentes = [(a, b)]
+        while pendentes:
+            tarefa = pendentes.pop()
+            if callable(tarefa):
+                direita = resultados.pop()
+                resultados.append(tarefa(resultados.pop(), direita))
+                continue
+            juntar, partes = passo(*tarefa)
+            if juntar is None:
+                resultados.append(partes)
+            else:
+                pendentes += (juntar, partes[1], partes[0])
+        return resultados[0]
+
+    def _uniao_nos(self, a: NoBST | None, b: NoBST | None) -> NoBST | None:
+        return self._dividir_e_conquistar(a, b, self._passo_uniao)
+
+    def _intersecao_nos(self, a: NoBST | None, b: NoBST | None) -> NoBST | None:
+        return self._dividir_e_conquistar(a, b, self._passo_intersecao)
+
+    def _diferenca_nos(self, a: NoBST | None, b: NoBST | None) -> NoBST | None:
+        return self._dividir_e_conquistar(a, b, self._passo_diferenca)
+
+    def _passo_uniao(self, a: NoBST | None, b: NoBST | None) -> tuple:
+        if a is None:
+            return None, b
+        if b is None:
+            return None, a
+        if b.tamanho <= self._LIMITE_SEQUENCIAL:
+            return None, self._inserir_nos(a, list(self._em_ordem(b)), True)
+        if a.tamanho <= self._LIMITE_SEQUENCIAL:
+            return None, self._inserir_nos(b, list(self._em_ordem(a)), False)
+        esquerda, direita = self._separar(a)
+        menores, encontrado, maiores = self._dividir_nos(b, a.chave)
+        if encontrado is not None and self.mapa:
+            a.valor = encontrado.valor
+        return (
+            lambda raiz_esquerda, raiz_direita: self._juntar_nos(
+                raiz_esquerda, a, raiz_direita
+            ),
+            ((esquerda, menores), (direita, maiores)),
+        )
+
+    def _passo_intersecao(self, a: NoBST | None, b: NoBST | None) -> tuple:
+        if a is None or b is None:
+            return None, None
+        if a.tamanho <= self._LIMITE_SEQUENCIAL:
+            comuns = [no for no in self._em_ordem(a) if self._buscar(b, no.chave)]
+            return None, self._montar_sequencia(comuns)
+        if b.tamanho <= self._LIMITE_SEQUENCIAL:
+            comuns = [self._buscar(a, no.chave) for no in self._em_ordem(b)]
+            return None, self._montar_sequencia([no for no in comuns if no is not None])
+        esquerda, direita = self._separar(a)
+        menores, encontrado, maiores = self._dividir_nos(b, a.chave)
+        partes = ((esquerda, menores), (direita, maiores))
+        if encontrado is None:
+            return self._juntar_dois, partes
+        return (
+            lambda raiz_esquerda, raiz_direita: self._juntar_nos(
+                raiz_esquerda, a, raiz_direita
+            ),
+            partes,
+        )
+
+    def _passo_diferenca(self, a: NoBST | None, b: NoBST | None) -> tuple:
+        if a is None or b is None:
+            return None, a
+        if min(a.tamanho, b.tamanho) <= self._LIMITE_SEQUENCIAL:
+            if a.tamanho <= b.tamanho:
+                chaves = [
+                    no.chave for no in self._em_ordem(a) if self._buscar(b, no.chave)
+                ]
+            else:
+                chaves = [no.chave for no in self._em_ordem(b)]
+            self._definir_raiz(a)
+            for chave in chaves:
+                self.remover(chave)
+            return None, self.raiz
+        esquerda, direita = self._separar(b)
+        menores, _, maiores = self._dividir_nos(a, b.chave)
+        return self._juntar_dois, ((menores, esquerda), (maiores, direita))
+
+    def juntar(self, chave: Chave, outra: "ArvoreBST") -> "ArvoreBST":
+        """Junta esta árvore, ``chave`` e ``outra`` numa só (join).
+
+        Todas as chaves desta árvore devem ser menores que ``chave`` e as de
+        ``outra``, maiores. Os nós são reaproveitados: esta árvore recebe o
+        resultado e ``outra`` fica vazia. Também pode ser chamado como
+        ``Classe.juntar(t1, chave, t2)``.
+
+        Args:
+            chave (Chave): Chave intermediária, inserida no resultado.
+            outra (ArvoreBST): Árvore com as chaves maiores.
+
+        Returns:
+            ArvoreBST: Esta árvore, já com o resultado.
+
+        Raises:
+            TypeError: Se as árvores usarem tipos de nó diferentes.
+            ValueError: Se as chaves não estiverem separadas por ``chave``.
+        """
+        self._exigir_compativel(outra)
+        maior = self.raiz
+        while maior is not None and maior.direita is not None:
+            maior = maior.direita
+        menor = outra.raiz
+        while menor is not None and menor.esquerda is not None:
+            menor = menor.esquerda
+        if (maior is not None and not maior.chave < chave) or (
+            menor is not None and not chave < menor.chave
+        ):
+            raise ValueError("A chave deve separar as chaves das duas árvores.")
+        raiz = self._juntar_nos(self.raiz, self.no(chave), outra.raiz)
+        outra._definir_raiz(None)
+        self._definir_raiz(raiz)
+        return self
+
+    def dividir(self, chave: Chave) -> tuple["ArvoreBST", NoBST | None, "ArvoreBST"]:
+        """Divide a árvore em torno de ``chave`` (split) em O(log n).
+
+        Os nós são reaproveitados nas duas árvores resultantes e esta árvore
+        fica vazia.
+
+        Args:
+            chave (Chave): Chave de corte (não precisa estar na árvore).
+
+        Returns:
+            tuple: Árvore das chaves menores, o nó com ``chave`` (solto, com
+            ``chave`` e ``valor``) ou ``None``, e árvore das chaves maiores.
+        """
+        menores, encontrado, maiores = self._dividir_nos(self.raiz, chave)
+        self._definir_raiz(None)
+        arvore_menores, arvore_maiores = self._vazia(), self._vazia()
+        arvore_menores._definir_raiz(menores)
+        arvore_maiores._definir_raiz(maiores)
+        return arvore_menores, encontrado, arvore_maiores
+
+    def uniao(self, outra: "ArvoreBST") -> "ArvoreBST":
+        """Faz desta árvore a união com ``outra``, que fica vazia.
+
+        Usa apenas ``dividir``/``juntar`` sobre os nós existentes, em
+        O(m log(n/m + 1)) para tamanhos m <= n, em vez de reinserir chaves.
+        Subárvores com até ``_LIMITE_SEQUENCIAL`` nós são tratadas chave a
+        chave, o que em Python custa menos que continuar dividindo.
+        Em modo mapa, chaves presentes nas duas ficam com o valor de ``outra``.
+
+        Args:
+            outra (ArvoreBST): Árvore do mesmo tipo.
+
+        Returns:
+            ArvoreBST: Esta árvore, já com o resultado.
+        """
+        self._exigir_compativel(outra)
+        raiz = self._uniao_nos(self.raiz, outra.raiz)
+        outra._definir_raiz(None)
+        self._definir_raiz(raiz)
+        return self
+
+    def intersecao(self, outra: "ArvoreBST") -> "ArvoreBST":
+        """Mantém nesta árvore só as chaves também presentes em ``outra``.
+
+        Mesmo custo de ``uniao``; ``outra`` fica vazia e os valores (modo
+        mapa) são os desta árvore.
+
+        Args:
+            outra (ArvoreBST): Árvore do mesmo tipo.
+
+        Returns:
+            ArvoreBST: Esta árvore, já com o resultado.
+        """
+        self._exigir_compativel(outra)
+        raiz = self._intersecao_nos(self.raiz, outra.raiz)
+        outra._definir_raiz(None)
+        self._definir_raiz(raiz)
+        return self
+
+    def diferenca(self, outra: "ArvoreBST") -> "ArvoreBST":
+        """Remove desta árvore as chaves presentes em ``outra``, que fica vazia.
+
+        Mesmo custo de ``uniao``.
+
+        Args:
+            outra (ArvoreBST): Árvore do mesmo tipo.
+
+        Returns:
+            ArvoreBST: Esta árvore, já com o resultado.
+        """
+        self._exigir_compativel(outra)
+        raiz = self._diferenca_nos(self.raiz, outra.raiz)
+        outra._definir_raiz(None)
+        self._definir_raiz(raiz)
+        return self
+
+    def _estado_no(self, no: NoBST) -> int:
+        """Estado de balanceamento gravado por nó no instantâneo (0 a 63)."""
+        return 0
+
+    def _restaurar_estado(self, no: NoBST, estado: int) -> None:
+        """Aplica a ``no`` o estado lido de um instantâneo."""
+
+    def _restaurar_metadados(self, raiz: NoBST | None) -> None:
+        """Recalcula de baixo para cima os campos não gravados no instantâneo.
+
+        Args:
+            raiz (NoBST | None): Raiz da árvore recém-carregada.
+        """
+        for no in self._pos_ordem(raiz):
+            no.tamanho = (
+                1
+                + (no.esquerda.tamanho if no.esquerda else 0)
+                + (no.direita.tamanho if no.direita else 0)
+            )
+
+    def salvar(self, caminho: str) -> None:
+        """Grava um instantâneo binário da árvore em ``caminho``.
+
+        O arquivo guarda a forma e o estado de cada nó em pré-ordem e as
+        chaves em ordem (ver ``serializacao``), de modo que ``carregar``
+        restaura exatamente a mesma árvore. Chaves inteiras de 64 bits
+        ocupam 8 bytes cada; as demais são gravadas com ``pickle``, e o
+        arquivo só pode ser lido de volta com ``permitir_pickle=True``.
+
+        Args:
+            caminho (str): Arquivo de destino (sobrescrito se existir).
+
+        Raises:
+            TypeError: Se a árvore estiver em modo mapa (valores não são gravados).
+        """
+        with open(caminho, "wb") as arquivo:
+            self._gravar(arquivo)
+
+    def _gravar(self, arquivo) -> None:
+        """Grava o instantâneo num arquivo binário já aberto (ver ``salvar``)."""
+        if self.mapa:
+            raise TypeError("Instantâneos guardam apenas chaves; a árvore é um mapa.")
+        estado = self._estado_no
+        formatos = (
+            (estado(no) << DESLOCAMENTO_ESTADO)
+            | (no.esquerda is not None)
+            | ((no.direita is not None) << 1)
+            for no in self._pre_ordem(self.raiz)
+        )
+        formato_chaves, chaves = codificar_chaves(self.iter_em_ordem())
+        escrever_cabecalho(arquivo, self._TIPO_ARQUIVO, len(chaves), formato_chaves)
+        escrever_vetor(arquivo, "B", formatos)
+        escrever_chaves(arquivo, formato_chaves, chaves)
+
+    @classmethod
+    def carregar(cls, caminho: str, permitir_pickle: bool = False) -> "ArvoreBST":
+        """Carrega uma árvore gravada por ``salvar``.
+
+        Os dados são lidos em bloco para vetores e a árvore é montada em
+        O(n), sem comparações de chave nem rebalanceamento.
+
+        Args:
+            caminho (str): Arquivo do instantâneo.
+            permitir_pickle (bool, optional): Aceita chaves gravadas em
+                ``pickle`` (as que não são inteiros de 64 bits). Ler
+                ``pickle`` pode executar código arbitrário contido no
+                arquivo: só ligue para instantâneos de origem confiável.
+
+        Returns:
+            ArvoreBST: Árvore com a mesma forma, chaves e estado da gravada.
+
+        Raises:
+            ValueError: Se o arquivo for inválido, truncado ou de outro tipo,
+                ou se tiver chaves em ``pickle`` sem ``permitir_pickle``.
+        """
+        with open(caminho, "rb") as arquivo:
+            return cls._ler(arquivo, permitir_pickle)
+
+    @classmethod
+    def _ler(cls, arquivo, permitir_pickle: bool = False) -> "ArvoreBST":
+        """Lê um instantâneo de um arquivo binário já aberto (ver ``carregar``)."""
+        quantidade, formato_chaves = ler_cabecalho(arquivo, cls._TIPO_ARQUIVO)
+        formatos = ler_vetor(arquivo, "B", quantidade)
+        chaves = ler_chaves(arquivo, formato_chaves, quantidade, permitir_pickle)
+        arvore = cls()
+        arvore.raiz = arvore._montar(formatos, chaves)
+        arvore._restaurar_metadados(arvore.raiz)
+        return arvore
+
+    def _montar(self, formatos, chaves) -> NoBST | None:
+        """Monta a árvore a partir dos formatos em pré-ordem e chaves em ordem.
+
+        Faz um percurso em ordem com pilha explícita: os nós são criados
+        ao descer (pré-ordem) e recebem a chave ao serem visitados.
+
+        Args:
+            formatos: Byte de formato/estado de cada nó, em pré-ordem.
+            chaves: Chaves em ordem crescente.
+
+        Returns:
+            NoBST | None: Raiz da árvore montada.
+
+        Raises:
+            ValueError: Se os formatos não descreverem exatamente ``len(chaves)`` nós.
+        """
+        if not formatos:
+            return None
+        criar = self.no
+        restaurar = self._restaurar_estado
+        restantes = iter(formatos)
+        proximo_formato = restantes.__next__
+        proxima_chave = iter(chaves).__next__
+        erro = ValueError("Instantâneo corrompido: formato dos nós inconsistente.")
+
+        try:
+            formato = proximo_formato()
+            raiz = no = criar(0)
+            restaurar(no, formato >> DESLOCAMENTO_ESTADO)
+            pilha = []
+            while no is not None:
+                while formato & TEM_ESQUERDA:
+                    pilha.append((no, formato))
+                    formato = proximo_formato()
+                    filho = criar(0)
+                    restaurar(filho, formato >> DESLOCAMENTO_ESTADO)
+                    filho.pai = no
+                    no.esquerda = filho
+                    no = filho
+                while True:
+                    no.chave = proxima_chave()
+                    if formato & TEM_DIREITA:
+                        formato = proximo_formato()
+                        filho = criar(0)
+                        restaurar(filho, formato >> DESLOCAMENTO_ESTADO)
+                        filho.pai = no
+                        no.direita = filho
+                        no = filho
+                        break
+                    if not pilha:
+                        no = None
+                        break
+                    no, formato = pilha.pop()
+        except StopIteration:
+            raise erro from None
+        if next(restantes, None) is not None:
+            raise erro
+        return raiz
@@ -0,0 +1,329 @@
+"""Fachada para uso concorrente das árvores: vários leitores e um escritor.
+
+``ArvoreConcorrente`` envolve uma ``ArvoreAVL`` ou ``ArvoreRubroNegro`` e
+oferece dois caminhos de leitura:
+
+- com trava compartilhada (``buscar``, ``in``, ``get``, ``intervalo``...):
+  vê sempre o estado mais recente, mas espera enquanto o escritor altera
+  a árvore;
+- sem trava, pelo ``instantaneo()`` publicado: um ``Instantaneo`` imutável
+  (chaves ordenadas em tuplas, consultadas com ``bisect``) que nunca
+  bloqueia nem é bloqueado, ao custo de poder estar até ``publicar_a_cada``
+  escritas atrasado.
+
+As escritas (``inserir``, ``remover``, ``arvore[chave] = valor``...) tomam a
+trava exclusiva. A publicação troca uma única referência, que é atômica em
+CPython, então leitores pegam o instantâneo antigo ou o novo, nunca um
+estado intermediário.
+
+Cada publicação copia a árvore inteira, em O(n), sob a trava exclusiva:
+enquanto ela dura, nem os leitores com trava avançam. ``publicar_a_cada``
+controla essa frequência nas escritas avulsas, mas ``escrita()`` publica
+ao fim de todo bloco, então blocos pequenos e frequentes numa árvore
+grande param os leitores com trava a cada bloco.
+"""
+
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from avl import ArvoreAVL
+from binaria_de_busca import ArvoreBST, Chave
+
+
+class TravaLeituraEscrita:
+    """Trava de leitores e escritor com preferência para o escritor.
+
+    Vários leitores podem segurá-la ao mesmo tempo; o escritor é exclusivo.
+    Assim que um escritor pede a trava, novos leitores esperam, para que um
+    fluxo contínuo de leituras não o deixe sem vez. Não é reentrante.
+    """
+
+    def __init__(self):
+        self._condicao = threading.Condition(threading.Lock())
+        self._leitores = 0
+        self._escrevendo = False
+        self._escritores_esperando = 0
+
+    def adquirir_leitura(self) -> None:
+        with self._condicao:
+            while self._escrevendo or self._escritores_esperando:
+                self._condicao.wait()
+            self._leitores += 1
+
+    def liberar_leitura(self) -> None:
+        with self._condicao:
+            self._leitores -= 1
+            if not self._leitores:
+                self._condicao.notify_all()
+
+    def adquirir_escrita(self) -> None:
+        with self._condicao:
+            self._escritores_esperando += 1
+            while self._escrevendo or self._leitores:
+                self._condicao.wait()
+            self._escritores_esperando -= 1
+            self._escrevendo = True
+
+    def liberar_escrita(self) -> None:
+        with self._condicao:
+            self._escrevendo = False
+            self._condicao.notify_all()
+
+    @contextmanager
+    def leitura(self):
+        """Segura a trava compartilhada durante o bloco ``with``."""
+        self.adquirir_leitura()
+        try:
+            yield
+        finally:
+            self.liberar_leitura()
+
+    @contextmanager
+    def escrita(self):
+        """Segura a trava exclusiva durante o bloco ``with``."""
+        self.adquirir_escrita()
+        try:
+            yield
+        finally:
+            self.liberar_escrita()
+
+
+class Instantaneo:
+    """Cópia imutável e ordenada das chaves (e valores) de uma árvore.
+
+    Publicada por ``ArvoreConcorrente`` e lida sem trava: as consultas usam
+    ``bisect`` sobre tuplas, em O(log n), e os percursos em O(log n + k).
+
+    Attributes:
+        versao (int): Número de escritas aplicadas até a publicação.
+        chaves (tuple): Chaves em ordem crescente.
+        valores (tuple | None): Valores alinhados às chaves (modo mapa).
+    """
+
+    __slots__ = ("versao", "chaves", "valores")
+
+    def __init__(self, versao: int, chaves: tuple, valores: tuple | None = None):
+        self.versao = versao
+        self.chaves = chaves
+        self.valores = valores
+
+    @classmethod
+    def da_arvore(cls, arvore: ArvoreBST, versao: int) -> "Instantaneo":
+        """Copia o conteúdo atual de ``arvore`` (o chamador segura a trava)."""
+        nos = arvore._em_ordem(arvore.raiz)
+        if not arvore.mapa:
+            return cls(versao, tuple(no.chave for no in nos))
+        pares = [(no.chave, no.valor) for no in nos]
+        return cls(
+            versao,
+            tuple(chave for chave, _ in pares),
+            tuple(valor for _, valor in pares),
+        )
+
+    def _posicao(self, chave: Chave) -> int:
+        """Índice da ``chave`` em ``chaves``, ou ``-1`` se ela não estiver lá."""
+        i = bisect_left(self.chaves, chave)
+        if i < len(self.chaves) and not chave < self.chaves[i]:
+            return i
+        return -1
+
+    def __len__(self) -> int:
+        return len(self.chaves)
+
+    def __iter__(self) -> Iterator[Chave]:
+        return iter(self.chaves)
+
+    def __contains__(self, chave: Chave) -> bool:
+        return self._posicao(chave) >= 0
+
+    def get(self, chave: Chave, padrao=None):
+        """Retorna o valor da ``chave`` (modo mapa), ou ``padrao``."""
+        if self.valores is None:
+            raise TypeError("O instantâneo não guarda valores; use mapa=True.")
+        i = self._posicao(chave)
+        return padrao if i < 0 else self.valores[i]
+
+    def intervalo(self, a: Chave, b: Chave, reverso: bool = False) -> Iterator[Chave]:
+        """Itera as chaves em ``[a, b)``, como ``ArvoreBST.intervalo``."""
+        inicio = bisect_left(self.chaves, a)
+        fim = max(inicio, bisect_left(self.chaves, b))
+        if reverso:
+            return (self.chaves[i] for i in range(fim - 1, inicio - 1, -1))
+        return (self.chaves[i] for i in range(inicio, fim))
+
+    def items(self) -> Iterator[tuple]:
+        """Itera os pares ``(chave, valor)`` em ordem (modo mapa)."""
+        if self.valores is None:
+            raise TypeError("O instantâneo não guarda valores; use mapa=True.")
+        return zip(self.chaves, self.valores)
+
+
+class ArvoreConcorrente:
+    """Árvore balanceada segura para vários leitores e um escritor.
+
+    Args:
+        classe (optional): ``ArvoreAVL`` (padrão) ou ``ArvoreRubroNegro``.
+        mapa (bool, optional): Guarda valores (ver ``ArvoreBST``).
+        key (Callable | None, optional): Função de chave (ver ``ArvoreBST``).
+        publicar_a_cada (int, optional): Escritas entre duas publicações
+            automáticas do instantâneo. Cada publicação copia a árvore em
+            O(n) segurando a trava exclusiva, o que bloqueia também os
+            leitores com trava; valores maiores trocam atraso dos leitores
+            sem trava por vazão do escritor e dos leitores com trava.
+            ``publicar()`` força uma publicação, e ``escrita()`` publica ao
+            fim de cada bloco: agrupe as alterações em poucos blocos.
+    """
+
+    def __init__(
+        self,
+        classe=ArvoreAVL,
+        mapa: bool = False,
+        key: Callable | None = None,
+        publicar_a_cada: int = 1024,
+    ):
+        if publicar_a_cada < 1:
+            raise ValueError("publicar_a_cada deve ser pelo menos 1.")
+        self._arvore: ArvoreBST = classe(mapa, key)
+        self._trava = TravaLeituraEscrita()
+        self._publicar_a_cada = publicar_a_cada
+        self._versao = 0
+        self._pendentes = 0
+        self._instantaneo = Instantaneo.da_arvore(self._arvore, 0)
+
+    # Leituras sem trava
+
+    def instantaneo(self) -> Instantaneo:
+        """Retorna o último instantâneo publicado, sem esperar por trava.
+
+        Returns:
+            Instantaneo: Conteúdo imutável da árvore na última publicação.
+        """
+        return self._instantaneo
+
+    # Leituras com trava compartilhada
+
+    @contextmanager
+    def leitura(self):
+        """Dá acesso à árvore interna sob a trava compartilhada.
+
+        Útil para várias consultas consistentes entre si. A árvore não deve
+        ser alterada dentro do bloco, nem seus nós guardados depois dele.
+
+        Yields:
+            ArvoreBST: A árvore envolvida.
+        """
+        with self._trava.leitura():
+            yield self._arvore
+
+    def __len__(self) -> int:
+        with self._trava.leitura():
+            return len(self._arvore)
+
+    def buscar(self, chave: Chave) -> Chave | None:
+        """Busca ``chave`` sob a trava compartilhada.
+
+        Retorna a chave guardada, e não o nó: o nó pertence à árvore e pode
+        ser alterado pelo escritor assim que a trava é solta.
+
+        Returns:
+            Chave | None: A chave igual a ``chave`` guardada na árvore, ou
+            ``None`` se ela não existir.
+        """
+        with self._trava.leitura():
+            no = self._arvore.buscar(chave)
+            return None if no is None else no.chave
+
+    def __contains__(self, chave: Chave) -> bool:
+        with self._trava.leitura():
+            return self._arvore.buscar(chave) is not None
+
+    def get(self, chave: Chave, padrao=None):
+        """Retorna o valor da ``chave`` (modo mapa), ou ``padrao``."""
+        with self._trava.leitura():
+            return self._arvore.get(chave, padrao)
+
+    def __getitem__(self, chave: Chave):
+        with self._trava.leitura():
+            return self._arvore[chave]
+
+    def intervalo(self, a: Chave, b: Chave, reverso: bool = False) -> list:
+        """Retorna as chaves em ``[a, b)``, lidas sob a trava compartilhada.
+
+        A lista é materializada antes de soltar a trava: um gerador aberto
+        seguraria o escritor enquanto o chamador não o esgotasse.
+
+        Returns:
+            list: Chaves no intervalo, em ordem (decrescente se ``reverso``).
+        """
+        with self._trava.leitura():
+            return list(self._arvore.intervalo(a, b, reverso))
+
+    # Escritas com trava exclusiva
+
+    @contextmanager
+    def escrita(self):
+        """Dá acesso exclusivo à árvore interna para um lote de alterações.
+
+        Ao final do bloco o instantâneo é publicado de novo, numa cópia
+        O(n) ainda sob a trava exclusiva.
+
+        Yields:
+            ArvoreBST: A árvore envolvida.
+        """
+        with self._trava.escrita():
+            try:
+                yield self._arvore
+            finally:
+                self._versao += 1
+                self._publicar()
+
+    def inserir(self, item) -> bool:
+        """Insere uma chave (ou item, no modo ``key``) com trava exclusiva."""
+        with self._trava.escrita():
+            return self._registrar(self._arvore.inserir(item))
+
+    def remover(self, chave: Chave) -> bool:
+        """Remove a ``chave`` com trava exclusiva."""
+        with self._trava.escrita():
+            return self._registrar(self._arvore.remover(chave))
+
+    def __setitem__(self, chave: Chave, valor) -> None:
+        with self._trava.escrita():
+            self._arvore[chave] = valor
+            self._registrar(True)
+
+    def __delitem__(self, chave: Chave) -> None:
+        with self._trava.escrita():
+            del self._arvore[chave]
+            self._registrar(True)
+
+    def publicar(self) -> Instantaneo:
+        """Publica imediatamente o estado atual para os leitores sem trava.
+
+        Toma a trava exclusiva: a publicação zera o contador de escritas
+        pendentes e troca o instantâneo, estado compartilhado com o escritor.
+        A cópia custa O(n), e durante ela nenhum leitor com trava avança.
+
+        Returns:
+            Instantaneo: O instantâneo publicado.
+        """
+        with self._trava.escrita():
+            return self._publicar()
+
+    def _registrar(self, alterou: bool) -> bool:
+        """Conta uma escrita e publica a cada ``publicar_a_cada`` (com a trava)."""
+        if alterou:
+            self._versao += 1
+            self._pendentes += 1
+            if self._pendentes >= self._publicar_a_cada:
+                self._publicar()
+        return alterou
+
+    def _publicar(self) -> Instantaneo:
+        instantaneo = Instantaneo.da_arvore(self._arvore, self._versao)
+        self._pendentes = 0
+        self._instantaneo = instantaneo
+        return instantaneo
+
@@ -0,0 +1,201 @@
+"""Instrumentação opcional das árvores: contadores e gancho de perfil.
+
+A instrumentação é ligada por instância com ``ativar_instrumentacao()``.
+Enquanto desligada, nenhum método é envolvido e os métodos originais
+não fazem nenhuma contagem: todo o custo fica nas versões instaladas aqui.
+"""
+
+from collections.abc import Callable
+
+Gancho = Callable[[str, int], None]
+
+
+class Estatisticas:
+    """Contadores acumulados de uma árvore instrumentada.
+
+    - `buscas`: chamadas de ``buscar`` (inclusive as feitas por ``remover``).
+    - `comparacoes`: comparações de chave feitas por essas buscas.
+    - `rotacoes`: rotações (esquerda ou direita) executadas.
+    - `recoloracoes`: trocas de cor feitas pelo balanceamento rubro-negro.
+    - `reequilibrios`: chamadas de ``_reequilibrar`` (AVL).
+    - `passos_reequilibrio`: nós visitados por essas chamadas.
+    """
+
+    __slots__ = (
+        "buscas",
+        "comparacoes",
+        "rotacoes",
+        "recoloracoes",
+        "reequilibrios",
+        "passos_reequilibrio",
+    )
+
+    def __init__(self):
+        for nome in self.__slots__:
+            setattr(self, nome, 0)
+
+    def instantaneo(self) -> dict:
+        """Retorna uma cópia dos contadores e das médias derivadas.
+
+        Returns:
+            dict: Contadores, ``comparacoes_por_busca`` e ``passos_por_reequilibrio``.
+        """
+        dados = {nome: getattr(self, nome) for nome in self.__slots__}
+        dados["comparacoes_por_busca"] = (
+            self.comparacoes / self.buscas if self.buscas else 0.0
+        )
+        dados["passos_por_reequilibrio"] = (
+            self.passos_reequilibrio / self.reequilibrios if self.reequilibrios else 0.0
+        )
+        return dados
+
+
+def buscar_instrumentado(
+    arvore, gancho: Gancho | None, ao_terminar: Callable | None = None
+) -> Callable:
+    """Cria um ``buscar`` que conta as comparações de chave de cada busca.
+
+    Args:
+        arvore: Árvore (``ArvoreBST`` ou subclasse) com instrumentação ativa.
+        gancho (Gancho | None): Chamado com ``("busca", comparacoes)``.
+        ao_terminar (Callable | None, optional): Chamado após a descida com
+            ``(encontrado, ultimo_visitado)``; permite às árvores que se
+            ajustam no acesso (Splay, Treap) reaproveitar a mesma descida.
+
+    Returns:
+        Callable: Função com a mesma assinatura de ``buscar``.
+    """
+    estatisticas = arvore._estatisticas
+
+    def buscar(chave):
+        comparacoes = 0
+        no_atual = arvore.raiz
+        ultimo = None
+        while no_atual is not None:
+            comparacoes += 1
+            if chave < no_atual.chave:
+                ultimo, no_atual = no_atual, no_atual.esquerda
+                continue
+            comparacoes += 1
+            if no_atual.chave < chave:
+                ultimo, no_atual = no_atual, no_atual.direita
+            else:
+                break
+        estatisticas.buscas += 1
+        estatisticas.comparacoes += comparacoes
+        if gancho is not None:
+            gancho("busca", comparacoes)
+        if ao_terminar is not None:
+            ao_terminar(no_atual, ultimo)
+        return no_atual
+
+    return buscar
+
+
+def rotacao_instrumentada(
+    rotacao: Callable, estatisticas: Estatisticas, gancho: Gancho | None, evento: str
+) -> Callable:
+    """Envolve um método de rotação já ligado à árvore para contá-lo.
+
+    Args:
+        rotacao (Callable): ``arvore._rotacao_esquerda`` ou ``_rotacao_direita``.
+        estatisticas (Estatisticas): Contadores da árvore.
+        gancho (Gancho | None): Chamado com ``(evento, 1)``.
+        evento (str): ``"rotacao_esquerda"`` ou ``"rotacao_direita"``.
+
+    Returns:
+        Callable: Rotação que atualiza os contadores antes de executar.
+    """
+
+    def rotacionar(no_atual):
+        estatisticas.rotacoes += 1
+        if gancho is not None:
+            gancho(evento, 1)
+        rotacao(no_atual)
+
+    return rotacionar
+
+
+def reequilibrio_instrumentado(
+    reequilibrar: Callable, estatisticas: Estatisticas, gancho: Gancho | None
+) -> Callable:
+    """Envolve o ``_reequilibrar`` da AVL para contar chamadas e passos.
+
+    ``_reequilibrar`` devolve o nó em que parou (ou ``None`` se subiu até
+    acima da raiz). Como as rotações só acontecem nessa posição ou abaixo
+    dela, a profundidade da posição de parada não muda e os passos são a
+    diferença de profundidade entre o ponto de partida e ela.
+
+    Args:
+        reequilibrar (Callable): ``arvore._reequilibrar`` já ligado à árvore.
+        estatisticas (Estatisticas): Contadores da árvore.
+        gancho (Gancho | None): Chamado com ``("passos_reequilibrio", passos)``.
+
+    Returns:
+        Callable: ``_reequilibrar`` que atualiza os contadores.
+    """
+
+    def reequilibrar_contando(no):
+        passos = 0 if no is None else _profundidade(no) + 1
+        parada = reequilibrar(no)
+        if parada is not None:
+            passos -= _profundidade(parada)
+        estatisticas.reequilibrios += 1
+        estatisticas.passos_reequilibrio += passos
+        if gancho is not None:
+            gancho("passos_reequilibrio", passos)
+        return parada
+
+    return reequilibrar_contando
+
+
+def balanceamento_instrumentado(
+    balancear: Callable, estatisticas: Estatisticas, gancho: Gancho | None
+) -> Callable:
+    """Envolve ``_balancear``/``_balancear_remocao`` (Rubro-Negra) para contar recolorações.
+
+    Antes da chamada guarda a cor dos nós que o balanceamento pode tocar
+    (os ancestrais do ponto de partida e até três níveis abaixo de cada
+    um); depois conta quantos deles terminaram com outra cor.
+
+    Args:
+        balancear (Callable): Método de balanceamento já ligado à árvore; o
+            último argumento não nulo é o nó de onde a correção sobe.
+        estatisticas (Estatisticas): Contadores da árvore.
+        gancho (Gancho | None): Chamado com ``("recoloracoes", quantidade)``.
+
+    Returns:
+        Callable: Balanceamento que atualiza os contadores.
+    """
+
+    def balancear_contando(*args):
+        inicio = next((no for no in reversed(args) if no is not None), None)
+        cores = {}
+        while inicio is not None:
+            nivel = [inicio]
+            for _ in range(4):
+                abaixo = []
+                for no in nivel:
+                    if id(no) not in cores:
+                        cores[id(no)] = (no, no.cor)
+                    if no.esquerda is not None:
+                        abaixo.append(no.esquerda)
+                    if no.direita is not None:
+                        abaixo.append(no.direita)
+                nivel = abaixo
+            inicio = inicio.pai
+        balancear(*args)
+        recoloracoes = sum(no.cor != cor for no, cor in cores.values())
+        estatisticas.recoloracoes += recoloracoes
+        if gancho is not None:
+            gancho("recoloracoes", recoloracoes)
+
+    return balancear_contando
+
+
+def _profundidade(no) -> int:
+    profundidade = 0
+    while no.pai is not None:
+        no = no.pai
+        profundidade += 1
+    return profundidade
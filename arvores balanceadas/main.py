@@ -1,7 +1,24 @@
-"""Módulo principal para manipulação de árvores balanceadas."""
+"""Módulo principal para manipulação de árvores balanceadas.
 
+Sem argumentos abre o menu interativo. Com um arquivo de rastro (ou ``-``
+para a entrada padrão) executa as operações dele sem interação (ver
+``rastro``)::
+
+    python main.py --arvore rubro-negra operacoes.txt > respostas.txt
+    gerador | python main.py --arvore b+ --ordem 64 --silencioso -
+    python main.py --para-binario operacoes.bin operacoes.txt
+"""
+
+import argparse
+import sys
+
+import rastro
 from avl import ArvoreAVL
+from b_mais import ArvoreBMais
 from rubro_negro import ArvoreRubroNegro
+from splay import ArvoreSplay
+from treap import Treap
+from vetorial import ArvoreAVLVetorial, ArvoreRubroNegroVetorial
 
 
 def escolher_opcao(opcoes: list) -> int:
@@ -30,14 +47,24 @@ def escolher_opcao(opcoes: list) -> int:
             print("Entrada inválida. Por favor, insira um número válido.")
 
 
-def acao_arvore(arvore: ArvoreAVL | ArvoreRubroNegro) -> None:
+def acao_arvore(
+    arvore: ArvoreAVL
+    | ArvoreRubroNegro
+    | ArvoreAVLVetorial
+    | ArvoreRubroNegroVetorial
+    | ArvoreBMais
+    | ArvoreSplay
+    | Treap,
+) -> None:
     """Executa ação selecionada na árvore (inserir, buscar, remover, mostrar).
 
     Mantém loop até usuário escolher sair ou mudar de árvore. Valida entradas
     e exibe resultados (busca, percursos).
 
     Args:
-        arvore (ArvoreAVL | ArvoreRubroNegro): Árvore para operar.
+        arvore (ArvoreAVL | ArvoreRubroNegro | ArvoreAVLVetorial |
+            ArvoreRubroNegroVetorial | ArvoreBMais | ArvoreSplay | Treap):
+            Árvore para operar.
     """
     while True:
         acao = [
@@ -63,7 +90,7 @@ def acao_arvore(arvore: ArvoreAVL | ArvoreRubroNegro) -> None:
                 try:
                     chave = int(input("Digite a chave a buscar: "))
                     resultado = arvore.buscar(chave)
-                    if resultado:
+                    if resultado is not None:
                         print(f"Chave {chave} encontrada: {resultado}")
                     else:
                         print(f"Chave {chave} não encontrada na árvore.")
@@ -88,14 +115,24 @@ def acao_arvore(arvore: ArvoreAVL | ArvoreRubroNegro) -> None:
                     print("Erro ao mostrar percursos: entrada inválida.")
 
 
-def main() -> None:
+def menu_interativo() -> None:
     """Inicializa loop principal para seleção e manipulação de árvores.
 
-    Permite escolher entre AVL ou Rubro-Negra, realizar ações, e sair.
+    Permite escolher entre AVL ou Rubro-Negra (com nós objeto ou no motor
+    vetorial), Árvore B+, Splay e Treap, realizar ações, e sair.
     Continua até usuário escolher "Parar".
     """
     while True:
-        arvores = ["Parar", "AVL", "Rubro-Negro"]
+        arvores = [
+            "Parar",
+            "AVL",
+            "Rubro-Negro",
+            "AVL (vetorial)",
+            "Rubro-Negro (vetorial)",
+            "B+",
+            "Splay",
+            "Treap",
+        ]
         escolha = escolher_opcao(arvores)
 
         match escolha:
@@ -110,6 +147,102 @@ def main() -> None:
                 print("Árvore Rubro-Negra selecionada.\n")
                 arvore = ArvoreRubroNegro()
                 acao_arvore(arvore)
+            case 3:
+                print("Árvore AVL (motor vetorial) selecionada.\n")
+                arvore = ArvoreAVLVetorial()
+                acao_arvore(arvore)
+            case 4:
+                print("Árvore Rubro-Negra (motor vetorial) selecionada.\n")
+                arvore = ArvoreRubroNegroVetorial()
+                acao_arvore(arvore)
+            case 5:
+                ordens = [4, 16, 64, 256]
+                print("Fan-out (ordem) da Árvore B+:")
+                ordem = ordens[escolher_opcao([str(ordem) for ordem in ordens])]
+                print(f"Árvore B+ de ordem {ordem} selecionada.\n")
+                arvore = ArvoreBMais(ordem)
+                acao_arvore(arvore)
+            case 6:
+                print("Árvore Splay selecionada.\n")
+                arvore = ArvoreSplay()
+                acao_arvore(arvore)
+            case 7:
+                print("Treap selecionada.\n")
+                arvore = Treap()
+                acao_arvore(arvore)
+
+
+ARVORES = {
+    "avl": ArvoreAVL,
+    "rubro-negra": ArvoreRubroNegro,
+    "avl-vetorial": ArvoreAVLVetorial,
+    "rubro-negra-vetorial": ArvoreRubroNegroVetorial,
+    "b+": ArvoreBMais,
+    "splay": ArvoreSplay,
+    "treap": Treap,
+}
+
+
+def executar_rastro(args: argparse.Namespace) -> None:
+    """Executa (ou converte para binário) o rastro indicado em ``args``.
+
+    As respostas vão para a saída padrão, com escrita em buffer por lote, e
+    o resumo de tempo e vazão para a saída de erro.
+
+    Args:
+        args (argparse.Namespace): Opções da linha de comando.
+    """
+    if args.rastro == "-":
+        entrada = sys.stdin.buffer
+    else:
+        entrada = open(args.rastro, "rb")
+    with entrada:
+        operacoes = rastro.ler_rastro(entrada)
+        if args.para_binario is not None:
+            with open(args.para_binario, "wb") as destino:
+                quantidade = rastro.gravar_binario(operacoes, destino)
+            print(
+                f"{quantidade:,} operações gravadas em {args.para_binario}.",
+                file=sys.stderr,
+            )
+            return
+        if args.arvore == "b+":
+            arvore = ArvoreBMais(args.ordem)
+        else:
+            arvore = ARVORES[args.arvore]()
+        saida = None if args.silencioso else sys.stdout
+        resumo = rastro.executar(arvore, operacoes, saida, args.lote)
+    if saida is not None:
+        saida.flush()
+    print(f"árvore: {args.arvore}\n{resumo}", file=sys.stderr)
+
+
+def main() -> None:
+    """Abre o menu interativo ou, se houver um rastro nos argumentos, o executa."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "rastro", nargs="?", help="arquivo de rastro (texto ou binário) ou - (stdin)"
+    )
+    parser.add_argument("--arvore", choices=ARVORES, default="avl")
+    parser.add_argument("--ordem", type=int, default=64, help="ordem da B+")
+    parser.add_argument("--lote", type=int, default=rastro.TAMANHO_LOTE)
+    parser.add_argument(
+        "--silencioso", action="store_true", help="descarta as respostas"
+    )
+    parser.add_argument(
+        "--para-binario",
+        metavar="SAIDA",
+        help="só converte o rastro para o formato binário",
+    )
+    args = parser.parse_args()
+
+    if args.rastro is None:
+        menu_interativo()
+        return
+    try:
+        executar_rastro(args)
+    except (OSError, ValueError) as erro:
+        sys.exit(f"erro: {erro}")
 
 
 if __name__ == "__main__":
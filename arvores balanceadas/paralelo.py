@@ -0,0 +1,175 @@
+"""Construção em lote e operações de conjunto em paralelo, com processos.
+
+A faixa de chaves é dividida em partes; cada processo de um
+``ProcessPoolExecutor`` ordena ou combina a sua parte, monta a subárvore
+com ``construir_em_lote`` e a devolve no formato compacto de
+``serializacao``. O processo principal carrega as subárvores na ordem das
+faixas e as costura com joins (``_juntar_dois``), em O(log n) cada.
+
+Em CPython os nós precisam ser criados no processo principal, então a
+carga das subárvores continua serial e limita o ganho possível.
+"""
+
+import io
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+from binaria_de_busca import ArvoreBST
+from serializacao import codificar_chaves
+
+
+def _serializar(arvore: ArvoreBST) -> bytes:
+    """Retorna o instantâneo de ``arvore`` em memória."""
+    buffer = io.BytesIO()
+    arvore._gravar(buffer)
+    return buffer.getvalue()
+
+
+def _construir_faixa(classe, chaves) -> bytes:
+    """Monta a subárvore de uma faixa já ordenada (executa num processo filho)."""
+    return _serializar(classe.construir_em_lote(chaves))
+
+
+def _unir_faixa(classe, primeiras, segundas) -> bytes:
+    """Monta a subárvore com a união de duas faixas ordenadas."""
+    chaves = classe._preparar_lote([*primeiras, *segundas])
+    return _serializar(classe.construir_em_lote(chaves))
+
+
+def _intersectar_faixa(classe, primeiras, segundas) -> bytes:
+    """Monta a subárvore com a interseção de duas faixas ordenadas."""
+    comuns = []
+    i = j = 0
+    while i < len(primeiras) and j < len(segundas):
+        if primeiras[i] < segundas[j]:
+            i += 1
+        elif segundas[j] < primeiras[i]:
+            j += 1
+        else:
+            comuns.append(primeiras[i])
+            i += 1
+            j += 1
+    return _serializar(classe.construir_em_lote(comuns))
+
+
+def _costurar(classe, instantaneos) -> ArvoreBST:
+    """Carrega as subárvores (em ordem de faixa) e as junta numa árvore."""
+    arvore = classe()
+    raiz = None
+    for dados in instantaneos:
+        # Gravados agora pelos próprios processos filhos: origem confiável.
+        parte = classe._ler(io.BytesIO(dados), permitir_pickle=True)
+        raiz = arvore._juntar_dois(raiz, parte.raiz)
+    arvore._definir_raiz(raiz)
+    return arvore
+
+
+def construir_paralelo(
+    classe, chaves, trabalhadores: int | None = None
+) -> ArvoreBST:
+    """Constrói uma árvore de ``classe`` com as ``chaves`` usando processos.
+
+    As chaves são ordenadas e cortadas em ``trabalhadores`` faixas
+    contíguas (sem repetir uma chave em duas faixas); cada processo monta a
+    subárvore da sua faixa e as subárvores são unidas por join.
+
+    Args:
+        classe: ``ArvoreAVL`` ou ``ArvoreRubroNegro``.
+        chaves: Iterável de chaves (com ou sem repetições).
+        trabalhadores (int | None, optional): Número de processos (padrão:
+            número de CPUs).
+
+    Returns:
+        ArvoreBST: Nova árvore de ``classe`` contendo as chaves.
+    """
+    trabalhadores = trabalhadores or os.cpu_count() or 1
+    _, ordenadas = codificar_chaves(sorted(chaves))
+    quantidade = len(ordenadas)
+
+    faixas = []
+    inicio = 0
+    for parte in range(1, trabalhadores + 1):
+        fim = max(inicio, quantidade * parte // trabalhadores)
+        while 0 < fim < quantidade and not ordenadas[fim - 1] < ordenadas[fim]:
+            fim += 1
+        if fim > inicio:
+            faixas.append(ordenadas[inicio:fim])
+        inicio = fim
+
+    with ProcessPoolExecutor(max_workers=trabalhadores) as executor:
+        instantaneos = executor.map(
+            _construir_faixa, [classe] * len(faixas), faixas
+        )
+        return _costurar(classe, instantaneos)
+
+
+def _fatiar(chaves, divisores: list) -> list:
+    """Corta ``chaves`` (ordenadas) nas faixas ``[d[i-1], d[i])`` dos divisores."""
+    cortes = [0, *(bisect_left(chaves, divisor) for divisor in divisores), len(chaves)]
+    return [chaves[cortes[i] : cortes[i + 1]] for i in range(len(cortes) - 1)]
+
+
+def _combinar_paralelo(
+    tarefa, a: ArvoreBST, b: ArvoreBST, trabalhadores: int | None
+) -> ArvoreBST:
+    """Divide as chaves de ``a`` e ``b`` nas mesmas faixas e aplica ``tarefa``."""
+    a._exigir_compativel(b)
+    if a.mapa:
+        raise TypeError("O modo paralelo não transporta valores (modo mapa).")
+    trabalhadores = trabalhadores or os.cpu_count() or 1
+    _, chaves_a = codificar_chaves(a)
+    _, chaves_b = codificar_chaves(b)
+
+    maior = chaves_a if len(chaves_a) >= len(chaves_b) else chaves_b
+    if not maior:
+        return a._vazia()
+    divisores = [
+        maior[len(maior) * parte // trabalhadores]
+        for parte in range(1, trabalhadores)
+    ]
+    faixas_a = _fatiar(chaves_a, divisores)
+    faixas_b = _fatiar(chaves_b, divisores)
+
+    classe = type(a)
+    with ProcessPoolExecutor(max_workers=trabalhadores) as executor:
+        instantaneos = executor.map(
+            tarefa, [classe] * len(faixas_a), faixas_a, faixas_b
+        )
+        return _costurar(classe, instantaneos)
+
+
+def uniao_paralela(
+    a: ArvoreBST, b: ArvoreBST, trabalhadores: int | None = None
+) -> ArvoreBST:
+    """Retorna uma nova árvore com a união de ``a`` e ``b``, usando processos.
+
+    Diferente de ``ArvoreBST.uniao``, não consome as árvores de entrada:
+    suas chaves são copiadas em ordem, repartidas pelas mesmas faixas e
+    combinadas em paralelo.
+
+    Args:
+        a (ArvoreBST): Primeira árvore (AVL ou Rubro-Negra, sem modo mapa).
+        b (ArvoreBST): Segunda árvore, do mesmo tipo.
+        trabalhadores (int | None, optional): Número de processos.
+
+    Returns:
+        ArvoreBST: Nova árvore do tipo de ``a``.
+    """
+    return _combinar_paralelo(_unir_faixa, a, b, trabalhadores)
+
+
+def intersecao_paralela(
+    a: ArvoreBST, b: ArvoreBST, trabalhadores: int | None = None
+) -> ArvoreBST:
+    """Retorna uma nova árvore com a interseção de ``a`` e ``b``, usando processos.
+
+    Args:
+        a (ArvoreBST): Primeira árvore (AVL ou Rubro-Negra, sem modo mapa).
+        b (ArvoreBST): Segunda árvore, do mesmo tipo.
+        trabalhadores (int | None, optional): Número de processos.
+
+    Returns:
+        ArvoreBST: Nova árvore do tipo de ``a``.
+    """
+    return _combinar_paralelo(_intersectar_faixa, a, b, trabalhadores)
@@ -0,0 +1,571 @@
+"""Árvores persistentes (imutáveis) AVL e Rubro-Negra, por cópia de caminho.
+
+Cada ``inserir``/``remover`` retorna uma nova versão da árvore e deixa a
+anterior intacta: só os O(log n) nós do caminho alterado são recriados, e
+todo o resto é compartilhado entre as versões. Por isso os nós não têm
+ponteiro ``pai`` (um nó compartilhado teria vários pais) e nunca são
+alterados depois de criados.
+
+As consultas (busca, percursos, ``piso``/``teto``, ``rank``/``selecionar``)
+são as mesmas da ``ArvoreBST``, que não dependem de ``pai``.
+
+A Rubro-Negra persistente é a variante inclinada à esquerda (LLRB, de
+Sedgewick): as mesmas propriedades de cor, com vermelhos só à esquerda, o
+que deixa inserção e remoção curtas o bastante para a forma funcional.
+Suas funções são recursivas, com profundidade limitada pela altura
+O(log n).
+"""
+
+from collections.abc import Iterator
+
+from binaria_de_busca import ArvoreBST, Chave
+
+
+class NoAVLPersistente:
+    """Nó imutável da AVL persistente.
+
+    A `altura` e o `tamanho` da subárvore são calculados na criação a partir
+    dos filhos, que já precisam existir.
+    """
+
+    __slots__ = ("chave", "esquerda", "direita", "tamanho", "altura")
+
+    def __init__(
+        self,
+        chave: Chave,
+        esquerda: "NoAVLPersistente | None" = None,
+        direita: "NoAVLPersistente | None" = None,
+    ):
+        self.chave = chave
+        self.esquerda = esquerda
+        self.direita = direita
+        altura_esquerda = tamanho_esquerda = altura_direita = tamanho_direita = 0
+        if esquerda is not None:
+            altura_esquerda, tamanho_esquerda = esquerda.altura, esquerda.tamanho
+        if direita is not None:
+            altura_direita, tamanho_direita = direita.altura, direita.tamanho
+        self.altura = 1 + max(altura_esquerda, altura_direita)
+        self.tamanho = 1 + tamanho_esquerda + tamanho_direita
+
+    def __str__(self) -> str:
+        return f"{self.chave}"
+
+
+class NoRNPersistente:
+    """Nó imutável da Rubro-Negra persistente.
+
+    `cor` segue a ``NoRN``: ``True`` (vermelho) ou ``False`` (preto).
+    """
+
+    __slots__ = ("chave", "esquerda", "direita", "tamanho", "cor")
+
+    def __init__(
+        self,
+        chave: Chave,
+        esquerda: "NoRNPersistente | None" = None,
+        direita: "NoRNPersistente | None" = None,
+        cor: bool = True,
+    ):
+        self.chave = chave
+        self.esquerda = esquerda
+        self.direita = direita
+        self.cor = cor
+        self.tamanho = (
+            1
+            + (esquerda.tamanho if esquerda is not None else 0)
+            + (direita.tamanho if direita is not None else 0)
+        )
+
+    def __str__(self) -> str:
+        return f"{self.chave} ({'V' if self.cor else 'P'})"
+
+
+class ArvorePersistente:
+    """Base das árvores persistentes: uma versão é imutável.
+
+    Args:
+        raiz (optional): Raiz da versão (padrão: árvore vazia). Normalmente
+            só as próprias operações a informam.
+    """
+
+    __slots__ = ("raiz",)
+
+    def __init__(self, raiz=None):
+        self.raiz = raiz
+
+    # Consultas que não usam ``pai``: reaproveitadas da BST.
+    _buscar = ArvoreBST._buscar
+    _pre_ordem = ArvoreBST._pre_ordem
+    _em_ordem = ArvoreBST._em_ordem
+    _em_ordem_reversa = ArvoreBST._em_ordem_reversa
+    _pos_ordem = ArvoreBST._pos_ordem
+    buscar = ArvoreBST.buscar
+    iter_em_ordem = ArvoreBST.iter_em_ordem
+    __iter__ = ArvoreBST.__iter__
+    __reversed__ = ArvoreBST.__reversed__
+    __len__ = ArvoreBST.__len__
+    __contains__ = ArvoreBST.__contains__
+    piso = ArvoreBST.piso
+    teto = ArvoreBST.teto
+    rank = ArvoreBST.rank
+    selecionar = ArvoreBST.selecionar
+    contar_intervalo = ArvoreBST.contar_intervalo
+
+    def intervalo(self, a: Chave, b: Chave, reverso: bool = False) -> Iterator[Chave]:
+        """Itera as chaves no intervalo semiaberto ``[a, b)``.
+
+        Sem ponteiros ``pai``, usa uma pilha com os ancestrais ainda por
+        visitar, descartando já na descida as subárvores fora do intervalo;
+        O(log n + k) para ``k`` chaves produzidas.
+
+        Args:
+            a (Chave): Limite inferior (inclusivo).
+            b (Chave): Limite superior (exclusivo).
+            reverso (bool, optional): Se ``True``, produz em ordem decrescente.
+
+        Yields:
+            Chave: Chaves dentro do intervalo.
+        """
+        pilha = []
+        no = self.raiz
+        if reverso:
+            while True:
+                while no is not None:
+                    if no.chave < b:
+                        pilha.append(no)
+                        no = no.direita
+                    else:
+                        no = no.esquerda
+                if not pilha:
+                    return
+                no = pilha.pop()
+                if no.chave < a:
+                    return
+                yield no.chave
+                no = no.esquerda
+        else:
+            while True:
+                while no is not None:
+                    if no.chave < a:
+                        no = no.direita
+                    else:
+                        pilha.append(no)
+                        no = no.esquerda
+                if not pilha:
+                    return
+                no = pilha.pop()
+                if not no.chave < b:
+                    return
+                yield no.chave
+                no = no.direita
+
+    def mostrar(self) -> list:
+        """Retorna as chaves em ordem."""
+        return list(self.iter_em_ordem())
+
+    def _caminho(self, chave: Chave) -> tuple[list, object]:
+        """Desce até a ``chave`` anotando o caminho.
+
+        Returns:
+            tuple[list, object]: Pares ``(no, foi_para_esquerda)`` da raiz
+            até o pai do ponto de parada, e o nó da chave (ou ``None``).
+        """
+        caminho = []
+        no = self.raiz
+        while no is not None:
+            if chave < no.chave:
+                caminho.append((no, True))
+                no = no.esquerda
+            elif no.chave < chave:
+                caminho.append((no, False))
+                no = no.direita
+            else:
+                break
+        return caminho, no
+
+
+class ArvoreAVLPersistente(ArvorePersistente):
+    """AVL persistente: ``inserir``/``remover`` retornam uma nova versão.
+
+    Copiam apenas o caminho da raiz até a alteração, reequilibrando cada nó
+    recriado, em O(log n) de tempo e de memória nova por versão.
+
+    Exemplo::
+
+        v1 = ArvoreAVLPersistente().inserir(10).inserir(5)
+        v2 = v1.remover(10)   # v1 continua com 5 e 10
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def construir_em_lote(cls, chaves) -> "ArvoreAVLPersistente":
+        """Constrói uma versão balanceada a partir de um iterável.
+
+        Chaves já ordenadas são montadas em O(n); as demais são ordenadas e
+        deduplicadas antes, o que leva o total a O(n log n).
+
+        Args:
+            chaves: Iterável de chaves (ordenado ou não, com ou sem repetições).
+
+        Returns:
+            ArvoreAVLPersistente: Nova versão contendo as chaves.
+        """
+        chaves = ArvoreBST._preparar_lote(chaves)
+
+        def montar(inicio: int, fim: int) -> NoAVLPersistente | None:
+            if inicio >= fim:
+                return None
+            meio = (inicio + fim) // 2
+            return NoAVLPersistente(
+                chaves[meio], montar(inicio, meio), montar(meio + 1, fim)
+            )
+
+        return cls(montar(0, len(chaves)))
+
+    @staticmethod
+    def _balancear(
+        chave: Chave,
+        esquerda: NoAVLPersistente | None,
+        direita: NoAVLPersistente | None,
+    ) -> NoAVLPersistente:
+        """Cria o nó de ``chave`` sobre dois filhos, rotacionando se preciso.
+
+        As alturas dos filhos podem diferir em até 2 (uma inserção ou
+        remoção abaixo); as rotações simples e duplas criam nós novos em vez
+        de religar os existentes.
+        """
+        altura_esquerda = esquerda.altura if esquerda is not None else 0
+        altura_direita = direita.altura if direita is not None else 0
+        if altura_esquerda > altura_direita + 1:
+            externo = esquerda.esquerda.altura if esquerda.esquerda else 0
+            interno = esquerda.direita.altura if esquerda.direita else 0
+            if externo >= interno:
+                return NoAVLPersistente(
+                    esquerda.chave,
+                    esquerda.esquerda,
+                    NoAVLPersistente(chave, esquerda.direita, direita),
+                )
+            meio = esquerda.direita
+            return NoAVLPersistente(
+                meio.chave,
+                NoAVLPersistente(esquerda.chave, esquerda.esquerda, meio.esquerda),
+                NoAVLPersistente(chave, meio.direita, direita),
+            )
+        if altura_direita > altura_esquerda + 1:
+            externo = direita.direita.altura if direita.direita else 0
+            interno = direita.esquerda.altura if direita.esquerda else 0
+            if externo >= interno:
+                return NoAVLPersistente(
+                    direita.chave,
+                    NoAVLPersistente(chave, esquerda, direita.esquerda),
+                    direita.direita,
+                )
+            meio = direita.esquerda
+            return NoAVLPersistente(
+                meio.chave,
+                NoAVLPersistente(chave, esquerda, meio.esquerda),
+                NoAVLPersistente(direita.chave, meio.direita, direita.direita),
+            )
+        return NoAVLPersistente(chave, esquerda, direita)
+
+    def _refazer_caminho(
+        self, caminho: list, subarvore: NoAVLPersistente | None
+    ) -> NoAVLPersistente | None:
+        """Recria os nós de ``caminho`` de baixo para cima sobre ``subarvore``."""
+        for no, foi_para_esquerda in reversed(caminho):
+            if foi_para_esquerda:
+                subarvore = self._balancear(no.chave, subarvore, no.direita)
+            else:
+                subarvore = self._balancear(no.chave, no.esquerda, subarvore)
+        return subarvore
+
+    def inserir(self, chave: Chave) -> "ArvoreAVLPersistente":
+        """Retorna uma nova versão com a ``chave``.
+
+        Args:
+            chave (Chave): Chave a inserir.
+
+        Returns:
+            ArvoreAVLPersistente: Nova versão, ou esta mesma se a chave já
+            existia.
+        """
+        caminho, no = self._caminho(chave)
+        if no is not None:
+            return self
+        return type(self)(self._refazer_caminho(caminho, NoAVLPersistente(chave)))
+
+    def remover(self, chave: Chave) -> "ArvoreAVLPersistente":
+        """Retorna uma nova versão sem a ``chave``.
+
+        Um nó com dois filhos é trocado pelo seu sucessor, removido da
+        subárvore direita com o mesmo refazer de caminho.
+
+        Args:
+            chave (Chave): Chave a remover.
+
+        Returns:
+            ArvoreAVLPersistente: Nova versão, ou esta mesma se a chave não
+            existia.
+        """
+        caminho, alvo = self._caminho(chave)
+        if alvo is None:
+            return self
+        if alvo.esquerda is None:
+            subarvore = alvo.direita
+        elif alvo.direita is None:
+            subarvore = alvo.esquerda
+        else:
+            caminho_minimo = []
+            minimo = alvo.direita
+            while minimo.esquerda is not None:
+                caminho_minimo.append((minimo, True))
+                minimo = minimo.esquerda
+            direita = self._refazer_caminho(caminho_minimo, minimo.direita)
+            subarvore = self._balancear(minimo.chave, alvo.esquerda, direita)
+        return type(self)(self._refazer_caminho(caminho, subarvore))
+
+    def validar_propriedades(self) -> bool:
+        """Confere ordem, alturas, tamanhos e |fator de balanceamento| <= 1.
+
+        Returns:
+            bool: ``True`` se a versão é uma AVL válida.
+        """
+        anterior = None
+        for no in self._em_ordem(self.raiz):
+            if anterior is not None and not anterior < no.chave:
+                return False
+            anterior = no.chave
+            altura_esquerda = no.esquerda.altura if no.esquerda else 0
+            altura_direita = no.direita.altura if no.direita else 0
+            if abs(altura_esquerda - altura_direita) > 1:
+                return False
+            if no.altura != 1 + max(altura_esquerda, altura_direita):
+                return False
+            if no.tamanho != 1 + _tamanho(no.esquerda) + _tamanho(no.direita):
+                return False
+        return True
+
+
+def _tamanho(no: NoAVLPersistente | NoRNPersistente | None) -> int:
+    return 0 if no is None else no.tamanho
+
+
+def _vermelho(no: NoRNPersistente | None) -> bool:
+    return no is not None and no.cor
+
+
+def _recolorir(no: NoRNPersistente, cor: bool) -> NoRNPersistente:
+    return NoRNPersistente(no.chave, no.esquerda, no.direita, cor)
+
+
+class ArvoreRubroNegroPersistente(ArvorePersistente):
+    """Rubro-Negra persistente (LLRB): ``inserir``/``remover`` retornam versões.
+
+    As rotações e trocas de cor criam nós novos ao longo do caminho, então
+    cada versão custa O(log n) nós novos e a anterior continua válida.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def construir_em_lote(cls, chaves) -> "ArvoreRubroNegroPersistente":
+        """Constrói uma versão com as ``chaves`` por inserções, em O(n log n).
+
+        Args:
+            chaves: Iterável de chaves.
+
+        Returns:
+            ArvoreRubroNegroPersistente: Nova versão contendo as chaves.
+        """
+        raiz = None
+        for chave in ArvoreBST._preparar_lote(chaves):
+            raiz = cls._inserir_no(raiz, chave)
+            if raiz.cor:
+                raiz = _recolorir(raiz, False)
+        return cls(raiz)
+
+    @staticmethod
+    def _rotacao_esquerda(no: NoRNPersistente) -> NoRNPersistente:
+        filho = no.direita
+        return NoRNPersistente(
+            filho.chave,
+            NoRNPersistente(no.chave, no.esquerda, filho.esquerda, True),
+            filho.direita,
+            no.cor,
+        )
+
+    @staticmethod
+    def _rotacao_direita(no: NoRNPersistente) -> NoRNPersistente:
+        filho = no.esquerda
+        return NoRNPersistente(
+            filho.chave,
+            filho.esquerda,
+            NoRNPersistente(no.chave, filho.direita, no.direita, True),
+            no.cor,
+        )
+
+    @staticmethod
+    def _inverter_cores(no: NoRNPersistente) -> NoRNPersistente:
+        return NoRNPersistente(
+            no.chave,
+            _recolorir(no.esquerda, not no.esquerda.cor),
+            _recolorir(no.direita, not no.direita.cor),
+            not no.cor,
+        )
+
+    @classmethod
+    def _consertar(cls, no: NoRNPersistente) -> NoRNPersistente:
+        """Restaura a inclinação à esquerda na subida de uma alteração."""
+        if _vermelho(no.direita) and not _vermelho(no.esquerda):
+            no = cls._rotacao_esquerda(no)
+        if _vermelho(no.esquerda) and _vermelho(no.esquerda.esquerda):
+            no = cls._rotacao_direita(no)
+        if _vermelho(no.esquerda) and _vermelho(no.direita):
+            no = cls._inverter_cores(no)
+        return no
+
+    @classmethod
+    def _inserir_no(
+        cls, no: NoRNPersistente | None, chave: Chave
+    ) -> NoRNPersistente:
+        """Insere uma ``chave`` ausente na subárvore de ``no``."""
+        if no is None:
+            return NoRNPersistente(chave)
+        if chave < no.chave:
+            no = NoRNPersistente(
+                no.chave, cls._inserir_no(no.esquerda, chave), no.direita, no.cor
+            )
+        else:
+            no = NoRNPersistente(
+                no.chave, no.esquerda, cls._inserir_no(no.direita, chave), no.cor
+            )
+        return cls._consertar(no)
+
+    @classmethod
+    def _mover_vermelho_esquerda(cls, no: NoRNPersistente) -> NoRNPersistente:
+        no = cls._inverter_cores(no)
+        if _vermelho(no.direita.esquerda):
+            no = NoRNPersistente(
+                no.chave, no.esquerda, cls._rotacao_direita(no.direita), no.cor
+            )
+            no = cls._inverter_cores(cls._rotacao_esquerda(no))
+        return no
+
+    @classmethod
+    def _mover_vermelho_direita(cls, no: NoRNPersistente) -> NoRNPersistente:
+        no = cls._inverter_cores(no)
+        if _vermelho(no.esquerda.esquerda):
+            no = cls._inverter_cores(cls._rotacao_direita(no))
+        return no
+
+    @classmethod
+    def _remover_minimo(cls, no: NoRNPersistente) -> NoRNPersistente | None:
+        if no.esquerda is None:
+            return None
+        if not _vermelho(no.esquerda) and not _vermelho(no.esquerda.esquerda):
+            no = cls._mover_vermelho_esquerda(no)
+        no = NoRNPersistente(
+            no.chave, cls._remover_minimo(no.esquerda), no.direita, no.cor
+        )
+        return cls._consertar(no)
+
+    @classmethod
+    def _remover_no(cls, no: NoRNPersistente, chave: Chave) -> NoRNPersistente | None:
+        """Remove uma ``chave`` presente na subárvore de ``no``."""
+        if chave < no.chave:
+            if not _vermelho(no.esquerda) and not _vermelho(no.esquerda.esquerda):
+                no = cls._mover_vermelho_esquerda(no)
+            no = NoRNPersistente(
+                no.chave, cls._remover_no(no.esquerda, chave), no.direita, no.cor
+            )
+            return cls._consertar(no)
+        if _vermelho(no.esquerda):
+            no = cls._rotacao_direita(no)
+        if not no.chave < chave and no.direita is None:
+            return None
+        if not _vermelho(no.direita) and not _vermelho(no.direita.esquerda):
+            no = cls._mover_vermelho_direita(no)
+        if no.chave < chave:
+            no = NoRNPersistente(
+                no.chave, no.esquerda, cls._remover_no(no.direita, chave), no.cor
+            )
+        else:
+            minimo = no.direita
+            while minimo.esquerda is not None:
+                minimo = minimo.esquerda
+            no = NoRNPersistente(
+                minimo.chave, no.esquerda, cls._remover_minimo(no.direita), no.cor
+            )
+        return cls._consertar(no)
+
+    def inserir(self, chave: Chave) -> "ArvoreRubroNegroPersistente":
+        """Retorna uma nova versão com a ``chave``.
+
+        Args:
+            chave (Chave): Chave a inserir.
+
+        Returns:
+            ArvoreRubroNegroPersistente: Nova versão, ou esta mesma se a
+            chave já existia.
+        """
+        if chave in self:
+            return self
+        raiz = self._inserir_no(self.raiz, chave)
+        if raiz.cor:
+            raiz = _recolorir(raiz, False)
+        return type(self)(raiz)
+
+    def remover(self, chave: Chave) -> "ArvoreRubroNegroPersistente":
+        """Retorna uma nova versão sem a ``chave``.
+
+        Args:
+            chave (Chave): Chave a remover.
+
+        Returns:
+            ArvoreRubroNegroPersistente: Nova versão, ou esta mesma se a
+            chave não existia.
+        """
+        if chave not in self:
+            return self
+        raiz = self.raiz
+        if not _vermelho(raiz.esquerda) and not _vermelho(raiz.direita):
+            raiz = _recolorir(raiz, True)
+        raiz = self._remover_no(raiz, chave)
+        if raiz is not None and raiz.cor:
+            raiz = _recolorir(raiz, False)
+        return type(self)(raiz)
+
+    def validar_propriedades(self) -> bool:
+        """Valida as propriedades Rubro-Negras e a inclinação à esquerda.
+
+        Verifica:
+        - Ordem das chaves e raiz preta.
+        - Nós vermelhos não têm filhos vermelhos e só são filhos esquerdos.
+        - Altura-negra igual em todos os caminhos.
+        - ``tamanho`` de cada nó igual a 1 + tamanhos dos filhos.
+
+        Returns:
+            bool: ``True`` se todas as propriedades são satisfeitas.
+        """
+        if _vermelho(self.raiz):
+            return False
+        anterior = None
+        for no in self._em_ordem(self.raiz):
+            if anterior is not None and not anterior < no.chave:
+                return False
+            anterior = no.chave
+            if _vermelho(no.direita):
+                return False
+            if no.cor and _vermelho(no.esquerda):
+                return False
+            if no.tamanho != 1 + _tamanho(no.esquerda) + _tamanho(no.direita):
+                return False
+        alturas = {}
+        for no in self._pos_ordem(self.raiz):
+            altura_esquerda = alturas.pop(no.esquerda, 0)
+            altura_direita = alturas.pop(no.direita, 0)
+            if altura_esquerda != altura_direita:
+                return False
+            alturas[no] = altura_esquerda + (0 if no.cor else 1)
+        return True
@@ -0,0 +1,354 @@
+"""Execução não interativa de rastros de operações (texto ou binário).
+
+Um rastro é uma sequência de operações lida sob demanda de um arquivo ou
+da entrada padrão e aplicada em lotes a uma árvore. O consumo de memória
+do leitor não depende do tamanho do rastro (só a própria árvore cresce),
+então rastros de produção com centenas de milhões de operações podem ser
+reexecutados com ``python main.py rastro.txt``.
+
+Formato texto, uma operação por linha (linhas vazias e ``#`` são ignorados)::
+
+    i 42        inserir 42
+    b 42        buscar 42          -> escreve 1 (achou) ou 0
+    r 42        remover 42
+    f 10 20     chaves em [10, 20) -> escreve as chaves numa linha
+    m           todas as chaves    -> escreve as chaves numa linha
+
+Formato binário: ``MAGICO`` seguido de registros com um byte de código e
+zero, um ou dois inteiros de 64 bits (little-endian), conforme a operação.
+É reconhecido automaticamente pelos primeiros bytes.
+"""
+
+import io
+import struct
+import time
+from collections import deque
+from collections.abc import Iterator
+
+MAGICO = b"ARVR\x01"
+TAMANHO_BLOCO = 1 << 16
+TAMANHO_LOTE = 4096
+# A partir daqui uma sequência de buscas vale o custo de ordenar as chaves
+# em ``contem_muitos``; sequências curtas saem mais baratas uma a uma.
+LIMITE_BUSCAS_EM_LOTE = 512
+
+INSERIR = 1
+BUSCAR = 2
+REMOVER = 3
+INTERVALO = 4
+MOSTRAR = 5
+
+NOMES = {
+    INSERIR: "inserir",
+    BUSCAR: "buscar",
+    REMOVER: "remover",
+    INTERVALO: "intervalo",
+    MOSTRAR: "mostrar",
+}
+CODIGOS_TEXTO = {"i": INSERIR, "b": BUSCAR, "r": REMOVER, "f": INTERVALO, "m": MOSTRAR}
+LETRAS = {codigo: letra for letra, codigo in CODIGOS_TEXTO.items()}
+ARGUMENTOS = {INSERIR: 1, BUSCAR: 1, REMOVER: 1, INTERVALO: 2, MOSTRAR: 0}
+
+_CHAVE = struct.Struct("<q")
+_DUAS_CHAVES = struct.Struct("<qq")
+
+# Operação decodificada: (codigo, a, b), com None nas chaves ausentes.
+Operacao = tuple[int, int | None, int | None]
+
+
+def ler_texto(linhas) -> Iterator[Operacao]:
+    """Decodifica operações no formato texto, linha a linha.
+
+    Args:
+        linhas: Iterável de linhas (por exemplo, um arquivo de texto).
+
+    Yields:
+        Operacao: Cada operação, na ordem do rastro.
+
+    Raises:
+        ValueError: Se uma linha tiver operação ou chaves inválidas.
+    """
+    codigos = CODIGOS_TEXTO
+    for numero, linha in enumerate(linhas, 1):
+        partes = linha.split()
+        if not partes or partes[0].startswith("#"):
+            continue
+        codigo = codigos.get(partes[0])
+        if codigo is None or len(partes) != ARGUMENTOS[codigo] + 1:
+            raise ValueError(f"Linha {numero}: operação inválida: {linha.strip()!r}.")
+        try:
+            chaves = [int(parte) for parte in partes[1:]]
+        except ValueError:
+            raise ValueError(
+                f"Linha {numero}: chave inválida: {linha.strip()!r}."
+            ) from None
+        chaves += [None] * (2 - len(chaves))
+        yield codigo, chaves[0], chaves[1]
+
+
+def ler_binario(arquivo) -> Iterator[Operacao]:
+    """Decodifica operações no formato binário, lendo em blocos.
+
+    O ``MAGICO`` já deve ter sido consumido (ver ``ler_rastro``). Um
+    registro cortado entre dois blocos é completado com o bloco seguinte.
+
+    Args:
+        arquivo: Arquivo binário posicionado após o ``MAGICO``.
+
+    Yields:
+        Operacao: Cada operação, na ordem do rastro.
+
+    Raises:
+        ValueError: Se houver código desconhecido ou o rastro estiver truncado.
+    """
+    desempacotar_uma = _CHAVE.unpack_from
+    desempacotar_duas = _DUAS_CHAVES.unpack_from
+    resto = b""
+    while True:
+        bloco = arquivo.read(TAMANHO_BLOCO)
+        if not bloco:
+            break
+        dados = resto + bloco if resto else bloco
+        posicao = 0
+        tamanho = len(dados)
+        while posicao < tamanho:
+            codigo = dados[posicao]
+            argumentos = ARGUMENTOS.get(codigo)
+            if argumentos is None:
+                raise ValueError(f"Rastro binário corrompido: código {codigo}.")
+            fim = posicao + 1 + 8 * argumentos
+            if fim > tamanho:
+                break
+            if argumentos == 1:
+                yield codigo, desempacotar_uma(dados, posicao + 1)[0], None
+            elif argumentos == 2:
+                yield (codigo, *desempacotar_duas(dados, posicao + 1))
+            else:
+                yield codigo, None, None
+            posicao = fim
+        resto = dados[posicao:]
+    if resto:
+        raise ValueError("Rastro binário truncado: registro incompleto no fim.")
+
+
+def ler_rastro(arquivo) -> Iterator[Operacao]:
+    """Decodifica um rastro, detectando o formato pelo ``MAGICO``.
+
+    Args:
+        arquivo: Arquivo binário com ``peek`` (``open(..., "rb")`` ou
+            ``sys.stdin.buffer``).
+
+    Returns:
+        Iterator[Operacao]: Operações na ordem do rastro.
+    """
+    if arquivo.peek(len(MAGICO))[: len(MAGICO)] == MAGICO:
+        arquivo.read(len(MAGICO))
+        return ler_binario(arquivo)
+    return ler_texto(io.TextIOWrapper(arquivo, encoding="utf-8"))
+
+
+def gravar_binario(operacoes, arquivo) -> int:
+    """Grava ``operacoes`` no formato binário, em blocos.
+
+    Útil para converter um rastro de texto uma vez e reexecutá-lo sem o
+    custo de decodificar texto.
+
+    Args:
+        operacoes: Iterável de ``Operacao``.
+        arquivo: Arquivo binário aberto para escrita.
+
+    Returns:
+        int: Quantidade de operações gravadas.
+
+    Raises:
+        ValueError: Se uma chave não couber em 64 bits.
+    """
+    arquivo.write(MAGICO)
+    buffer = bytearray()
+    quantidade = 0
+    try:
+        for codigo, a, b in operacoes:
+            buffer.append(codigo)
+            if a is not None:
+                buffer += _CHAVE.pack(a)
+            if b is not None:
+                buffer += _CHAVE.pack(b)
+            quantidade += 1
+            if len(buffer) >= TAMANHO_BLOCO:
+                arquivo.write(buffer)
+                buffer.clear()
+    except struct.error:
+        raise ValueError(
+            f"Operação {quantidade + 1}: chave fora do intervalo de 64 bits."
+        ) from None
+    arquivo.write(buffer)
+    return quantidade
+
+
+def gravar_texto(operacoes, saida) -> int:
+    """Grava ``operacoes`` no formato texto (o inverso de ``ler_texto``).
+
+    Returns:
+        int: Quantidade de operações gravadas.
+    """
+    linhas = []
+    quantidade = 0
+    for codigo, a, b in operacoes:
+        partes = [LETRAS[codigo]] + [str(chave) for chave in (a, b) if chave is not None]
+        linhas.append(" ".join(partes))
+        quantidade += 1
+        if len(linhas) == TAMANHO_LOTE:
+            saida.write("\n".join(linhas) + "\n")
+            linhas.clear()
+    if linhas:
+        saida.write("\n".join(linhas) + "\n")
+    return quantidade
+
+
+def _escrever_chaves(chaves, saida) -> None:
+    """Escreve ``chaves`` numa linha, em pedaços, sem materializar a sequência."""
+    pedaco = []
+    for chave in chaves:
+        pedaco.append(str(chave))
+        if len(pedaco) == TAMANHO_LOTE:
+            saida.write(" ".join(pedaco) + " ")
+            pedaco.clear()
+    saida.write(" ".join(pedaco) + "\n")
+
+
+class Resumo:
+    """Contagens e tempo de uma execução de rastro.
+
+    Attributes:
+        contagens (dict): Operações executadas por nome.
+        encontradas (int): Buscas que acharam a chave.
+        segundos (float): Tempo total (leitura, execução e escrita).
+        chaves_finais (int): Tamanho da árvore ao final.
+    """
+
+    __slots__ = ("contagens", "encontradas", "segundos", "chaves_finais")
+
+    def __init__(self):
+        self.contagens = dict.fromkeys(NOMES.values(), 0)
+        self.encontradas = 0
+        self.segundos = 0.0
+        self.chaves_finais = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.contagens.values())
+
+    def __str__(self) -> str:
+        detalhes = ", ".join(f"{nome}: {n:,}" for nome, n in self.contagens.items())
+        vazao = self.total / self.segundos if self.segundos else 0.0
+        return (
+            f"operações: {self.total:,} ({detalhes}; buscas encontradas: "
+            f"{self.encontradas:,})\n"
+            f"tempo: {self.segundos:.3f} s\n"
+            f"vazão: {vazao:,.0f} ops/s\n"
+            f"chaves finais: {self.chaves_finais:,}"
+        )
+
+
+def executar(
+    arvore,
+    operacoes,
+    saida=None,
+    tamanho_lote: int = TAMANHO_LOTE,
+) -> Resumo:
+    """Aplica ``operacoes`` a ``arvore`` em lotes e escreve os resultados.
+
+    As operações são consumidas ``tamanho_lote`` por vez. Dentro do lote,
+    sequências longas de buscas seguidas (``LIMITE_BUSCAS_EM_LOTE``) são
+    respondidas com uma única chamada a ``contem_muitos``, quando a árvore
+    o tem e as buscas não a reorganizam (Splay e Treap se ajustam a cada
+    ``buscar``, então recebem as buscas uma a uma). As respostas do lote
+    são escritas de uma vez em ``saida``; ``mostrar`` e ``intervalo``
+    escrevem as chaves em pedaços, sem montar listas do tamanho da árvore.
+
+    Args:
+        arvore: Qualquer árvore com ``inserir``/``buscar``/``remover`` (e
+            ``intervalo`` se o rastro tiver ``f``).
+        operacoes: Iterável de ``Operacao`` (por exemplo, ``ler_rastro``).
+        saida (optional): Arquivo de texto para os resultados; com ``None``
+            as operações são executadas do mesmo jeito, mas as respostas
+            são descartadas (só o resumo é produzido).
+        tamanho_lote (int, optional): Operações por lote.
+
+    Returns:
+        Resumo: Contagens, tempo e tamanho final.
+
+    Raises:
+        ValueError: Se ``tamanho_lote`` não for positivo, ou se o rastro
+            usar ``intervalo`` numa árvore sem ele.
+    """
+    if tamanho_lote < 1:
+        raise ValueError("tamanho_lote deve ser pelo menos 1.")
+    resumo = Resumo()
+    contagens = dict.fromkeys(NOMES, 0)
+    inserir, buscar, remover = arvore.inserir, arvore.buscar, arvore.remover
+    contem_muitos = getattr(arvore, "contem_muitos", None)
+    if getattr(arvore, "_AJUSTA_NA_BUSCA", False):
+        contem_muitos = None
+    escrever = saida.write if saida is not None else None
+    iterador = iter(operacoes)
+
+    inicio = time.perf_counter()
+    while True:
+        lote = []
+        for operacao in iterador:
+            lote.append(operacao)
+            if len(lote) == tamanho_lote:
+                break
+        if not lote:
+            break
+
+        respostas = []
+        posicao = 0
+        while posicao < len(lote):
+            codigo, a, b = lote[posicao]
+            if codigo == BUSCAR:
+                fim = posicao + 1
+                while fim < len(lote) and lote[fim][0] == BUSCAR:
+                    fim += 1
+                chaves = [lote[i][1] for i in range(posicao, fim)]
+                longa = len(chaves) >= LIMITE_BUSCAS_EM_LOTE
+                if contem_muitos is not None and longa:
+                    achados = contem_muitos(chaves)
+                else:
+                    achados = [buscar(chave) is not None for chave in chaves]
+                resumo.encontradas += sum(achados)
+                contagens[BUSCAR] += fim - posicao
+                if escrever is not None:
+                    respostas.extend("1\n" if achou else "0\n" for achou in achados)
+                posicao = fim
+                continue
+            contagens[codigo] += 1
+            posicao += 1
+            if codigo == INSERIR:
+                inserir(a)
+            elif codigo == REMOVER:
+                remover(a)
+            else:
+                if escrever is not None:
+                    escrever("".join(respostas))
+                    respostas.clear()
+                if codigo == INTERVALO:
+                    if not hasattr(arvore, "intervalo"):
+                        raise ValueError(
+                            f"{type(arvore).__name__} não suporta intervalo."
+                        )
+                    chaves = arvore.intervalo(a, b)
+                else:
+                    chaves = iter(arvore)
+                if escrever is not None:
+                    _escrever_chaves(chaves, saida)
+                else:
+                    deque(chaves, maxlen=0)
+        if escrever is not None and respostas:
+            escrever("".join(respostas))
+
+    resumo.segundos = time.perf_counter() - inicio
+    resumo.contagens = {NOMES[codigo]: n for codigo, n in contagens.items()}
+    resumo.chaves_finais = len(arvore)
+    return resumo
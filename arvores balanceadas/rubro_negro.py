@@ -5,7 +5,10 @@ garantindo altura O(log n). Suporta busca, inserção, remoção e validação
 de altura-negra.
 """
 
-from binaria_de_busca import NoBST, ArvoreBST
+from collections.abc import Callable
+
+from binaria_de_busca import ArvoreBST, Chave, NoBST
+from instrumentacao import balanceamento_instrumentado
 
 
 class NoRN(NoBST):
@@ -16,7 +19,9 @@ class NoRN(NoBST):
     - `altura_negra`: número de nós pretos no caminho mais curto até folha.
     """
 
-    def __init__(self, chave: int, cor: bool = True):
+    __slots__ = ("cor", "altura_negra")
+
+    def __init__(self, chave: Chave, cor: bool = True):
         super().__init__(chave)
         self.cor = cor
         self.altura_negra = 1
@@ -25,11 +30,16 @@ class NoRN(NoBST):
         return f"{self.chave} ({'V' if self.cor else 'P'}, AN: {self.altura_negra})"
 
     def atualizar(self) -> None:
-        """Atualiza altura-negra baseada nas subárvores.
+        """Atualiza altura-negra e tamanho da subárvore baseados nos filhos.
 
         Altura-negra é o número de nós pretos até a folha mais próxima.
         Se filhos têm alturas-negras diferentes, retorna -1 (inválido).
         """
+        self.tamanho = (
+            1
+            + (self.esquerda.tamanho if self.esquerda else 0)
+            + (self.direita.tamanho if self.direita else 0)
+        )
         altura_negra_esquerda = self.esquerda.altura_negra if self.esquerda else 1
         altura_negra_direita = self.direita.altura_negra if self.direita else 1
 
@@ -43,6 +53,16 @@ class NoRN(NoBST):
             self.altura_negra = altura_negra_esquerda + (0 if self.cor else 1)
 
 
+class NoRNMapa(NoRN):
+    """Nó Rubro-Negro do modo mapa: acrescenta o `valor` associado à chave."""
+
+    __slots__ = ("valor",)
+
+    def __init__(self, chave: Chave, cor: bool = True):
+        super().__init__(chave, cor)
+        self.valor = None
+
+
 class ArvoreRubroNegro(ArvoreBST):
     """Árvore Rubro-Negra balanceada por cores e rotações.
 
@@ -51,10 +71,103 @@ class ArvoreRubroNegro(ArvoreBST):
     - Nós vermelhos não têm filhos vermelhos.
     - Todos os caminhos raiz -> folha têm igual número de nós pretos (altura-negra).
     - Garante altura máxima 2*log(n+1).
+
+    Args:
+        mapa (bool, optional): Se ``True``, usa ``NoRNMapa`` e habilita a
+            interface de dicionário ordenado; sem ele os nós não gastam
+            memória com valores.
+        key (Callable | None, optional): Função que extrai a chave de cada
+            item inserido; implica ``mapa=True``, com o item como valor.
     """
 
-    def __init__(self):
-        super().__init__(NoRN)
+    _TIPO_ARQUIVO = 2
+    _METODOS_INSTRUMENTADOS = ArvoreBST._METODOS_INSTRUMENTADOS + (
+        "_balancear",
+        "_balancear_remocao",
+    )
+
+    def __init__(self, mapa: bool = False, key: Callable | None = None):
+        mapa = mapa or key is not None
+        super().__init__(NoRNMapa if mapa else NoRN)
+        self.mapa = mapa
+        self._usar_funcao_chave(key)
+
+    @classmethod
+    def construir_em_lote(cls, chaves) -> "ArvoreRubroNegro":
+        """Constrói uma Rubro-Negra balanceada a partir de um iterável de chaves.
+
+        Chaves ordenadas são montadas em O(n) sem rotações; as demais são
+        ordenadas e deduplicadas antes. Todos os níveis completos ficam
+        pretos e, se o último nível estiver incompleto, seus nós ficam
+        vermelhos, mantendo a altura-negra uniforme.
+
+        Args:
+            chaves: Iterável de chaves (ordenado ou não, com ou sem repetições).
+
+        Returns:
+            ArvoreRubroNegro: Nova árvore contendo as chaves.
+        """
+        arvore = cls()
+        chaves = arvore._preparar_lote(chaves)
+        arvore.raiz = arvore._construir_balanceada(chaves, 0, len(chaves))
+        if arvore.raiz is None:
+            return arvore
+
+        quantidade = len(chaves)
+        niveis = quantidade.bit_length()
+        ultimo_nivel_incompleto = quantidade != (1 << niveis) - 1
+
+        nivel = [arvore.raiz]
+        profundidade = 0
+        while nivel:
+            vermelho = ultimo_nivel_incompleto and profundidade == niveis - 1
+            proximo = []
+            for no in nivel:
+                no.cor = vermelho
+                if no.esquerda is not None:
+                    proximo.append(no.esquerda)
+                if no.direita is not None:
+                    proximo.append(no.direita)
+            nivel = proximo
+            profundidade += 1
+
+        for no in arvore._pos_ordem(arvore.raiz):
+            no.atualizar()
+        return arvore
+
+    def _estado_no(self, no: NoRN) -> int:
+        """A Rubro-Negra grava a cor de cada nó no instantâneo."""
+        return int(no.cor)
+
+    def _restaurar_estado(self, no: NoRN, estado: int) -> None:
+        no.cor = bool(estado)
+
+    def _restaurar_metadados(self, raiz: NoRN | None) -> None:
+        """Recalcula tamanho e altura-negra de baixo para cima após carregar."""
+        for no in self._pos_ordem(raiz):
+            no.atualizar()
+
+    def _rotacao_direita(self, no_atual: NoRN) -> None:
+        """Rotação à direita com atualização de altura-negra/tamanho.
+
+        Args:
+            no_atual (NoRN): Nó pivô da rotação.
+        """
+        novo_pai = no_atual.esquerda
+        super()._rotacao_direita(no_atual)
+        no_atual.atualizar()
+        novo_pai.atualizar()
+
+    def _rotacao_esquerda(self, no_atual: NoRN) -> None:
+        """Rotação à esquerda com atualização de altura-negra/tamanho.
+
+        Args:
+            no_atual (NoRN): Nó pivô da rotação.
+        """
+        novo_pai = no_atual.direita
+        super()._rotacao_esquerda(no_atual)
+        no_atual.atualizar()
+        novo_pai.atualizar()
 
     def _cor_vermelha(self, no: NoRN | None) -> bool:
         """Verifica se ``no`` é vermelho (nós nulos são pretos).
@@ -67,6 +180,12 @@ class ArvoreRubroNegro(ArvoreBST):
         """
         return no.cor if no else False
 
+    def _atualizar_caminho(self, no: NoRN | None) -> None:
+        """Recalcula altura-negra e tamanho de ``no`` até a raiz."""
+        while no is not None:
+            no.atualizar()
+            no = no.pai
+
     def _balancear(self, no: NoRN) -> None:
         """Corrige violações de cores após inserção (cascata bottom-up).
 
@@ -77,194 +196,279 @@ class ArvoreRubroNegro(ArvoreBST):
         Args:
             no (NoRN): Nó inserido; começa detecção de violação.
         """
-
-        while no.pai is not None and self._cor_vermelha(no.pai):
+        inserido = no
+        while no.pai is not None and no.pai.cor:
             pai = no.pai
             avo = pai.pai
 
-            if pai == avo.esquerda:
+            if pai is avo.esquerda:
                 tio = avo.direita
-            else:
-                tio = avo.esquerda
-
-            if self._cor_vermelha(tio):
+                if self._cor_vermelha(tio):
+                    pai.cor = False
+                    tio.cor = False
+                    avo.cor = True
+                    tio.atualizar()
+                    no = avo
+                    continue
+                if no is pai.direita:
+                    self._rotacao_esquerda(pai)
+                    pai = no
                 pai.cor = False
-                tio.cor = False
                 avo.cor = True
-
-                pai.atualizar()
-                tio.atualizar()
-
-                no = avo
-
+                self._rotacao_direita(avo)
+                break
             else:
-                if no == pai.direita:
-                    no = pai
-                    self._rotacao_esquerda(no)
-                    no.atualizar()
-                    pai = no.pai
-                    avo = pai.pai
-
+                tio = avo.esquerda
+                if self._cor_vermelha(tio):
+                    pai.cor = False
+                    tio.cor = False
+                    avo.cor = True
+                    tio.atualizar()
+                    no = avo
+                    continue
+                if no is pai.esquerda:
+                    self._rotacao_direita(pai)
+                    pai = no
                 pai.cor = False
                 avo.cor = True
-                self._rotacao_direita(avo)
-                pai.atualizar()
-                avo.atualizar()
+                self._rotacao_esquerda(avo)
+                break
 
         self.raiz.cor = False
-        if self.raiz:
-            self.raiz.atualizar()
+        self._atualizar_caminho(inserido)
 
-    def inserir(self, chave: int) -> None:
+    def inserir(self, chave: Chave) -> bool:
         """Insere uma ``chave`` e balanceia cores/rotações se necessário.
 
         Novo nó é inicializado vermelho; em seguida, ``_balancear()`` garante
         propriedades RB.
 
         Args:
-            chave (int): Chave a inserir.
+            chave (Chave): Chave a inserir.
+
+        Returns:
+            bool: ``True`` se a chave era nova, ``False`` se já existia.
         """
         novo_no = super()._inserir(chave)
-        if novo_no:
-            self._balancear(novo_no)
+        if novo_no is None:
+            return False
+        self._balancear(novo_no)
+        return True
+
+    def _vazia(self) -> "ArvoreRubroNegro":
+        return type(self)(self.mapa, self.key)
+
+    def _definir_raiz(self, raiz: NoRN | None) -> None:
+        """Instala ``raiz`` garantindo que ela seja preta."""
+        super()._definir_raiz(raiz)
+        if raiz is not None and raiz.cor:
+            raiz.cor = False
+            raiz.atualizar()
+
+    def _juntar_nos(
+        self, esquerda: NoRN | None, meio: NoRN, direita: NoRN | None
+    ) -> NoRN:
+        """Join Rubro-Negro guiado pela ``altura_negra`` já mantida nos nós.
+
+        Com as duas raízes pretas, desce pela borda da subárvore de maior
+        altura-negra até um nó preto ``c`` (ou nulo) com a altura-negra da
+        outra, troca ``c`` por ``meio`` vermelho (com ``c`` e a outra
+        subárvore como filhos) e corrige um eventual vermelho-vermelho com a
+        mesma cascata da inserção.
+        """
+        for raiz in (esquerda, direita):
+            if raiz is not None and raiz.cor:
+                raiz.cor = False
+                raiz.atualizar()
+        altura_esquerda = esquerda.altura_negra if esquerda else 1
+        altura_direita = direita.altura_negra if direita else 1
+        meio.cor = True
+
+        if altura_esquerda > altura_direita:
+            pai, c = None, esquerda
+            while c is not None and (c.cor or c.altura_negra > altura_direita):
+                pai, c = c, c.direita
+            super()._juntar_nos(c, meio, direita)
+            meio.pai = pai
+            pai.direita = meio
+            raiz = esquerda
+        elif altura_direita > altura_esquerda:
+            pai, c = None, direita
+            while c is not None and (c.cor or c.altura_negra > altura_esquerda):
+                pai, c = c, c.esquerda
+            super()._juntar_nos(esquerda, meio, c)
+            meio.pai = pai
+            pai.esquerda = meio
+            raiz = direita
+        else:
+            super()._juntar_nos(esquerda, meio, direita)
+            meio.atualizar()
+            return meio
+
+        meio.atualizar()
+        self._ajustar_tamanhos(pai, meio.tamanho - (c.tamanho if c else 0))
+        self.raiz = raiz
+        self._balancear(meio)
+        return self.raiz
+
+    def _reequilibrar_insercao(self, novo_no: NoRN) -> None:
+        self._balancear(novo_no)
+
+    def _trocar_com_sucessor(self, no: NoRN, sucessor: NoRN) -> None:
+        """Troca posições com o sucessor levando junto a cor e a altura-negra."""
+        super()._trocar_com_sucessor(no, sucessor)
+        no.cor, sucessor.cor = sucessor.cor, no.cor
+        no.altura_negra, sucessor.altura_negra = sucessor.altura_negra, no.altura_negra
 
-    def remover(self, chave: int) -> None:
-        """Remove a ``chave`` e balanceia cores/altura-negra se necessário.
+    def _remover_e_reequilibrar(self, no_a_remover: NoRN) -> None:
+        """Remove o nó e balanceia cores/altura-negra se necessário.
 
-        Usa método herdado ``_remover()`` e, se uma remoção afetou
-        altura-negra, chama ``_balancear_remocao()`` para restaurar
-        propriedades RB (especialmente altura-negra).
+        O nó (ou, se tiver dois filhos, a posição do sucessor com quem
+        troca de lugar) sai da árvore; se era preto, ``_balancear_remocao()``
+        restaura a altura-negra a partir do filho que ocupou seu lugar.
 
         Args:
-            chave (int): Chave a remover.
+            no_a_remover (NoRN): Nó a remover.
         """
-        pai_do_removido = super()._remover(chave)
-        if pai_do_removido:
-            self._balancear_remocao(pai_do_removido)
+        if no_a_remover.esquerda is not None and no_a_remover.direita is not None:
+            self._trocar_com_sucessor(no_a_remover, self._sucessor(no_a_remover))
+        filho = (
+            no_a_remover.esquerda
+            if no_a_remover.esquerda is not None
+            else no_a_remover.direita
+        )
+        pai_do_removido = self._remover_no(no_a_remover)
 
-        if self.raiz:
-            self.raiz.cor = False
-            self.raiz.atualizar()
+        if not no_a_remover.cor:
+            self._balancear_remocao(filho, pai_do_removido)
+        self._atualizar_caminho(filho if filho is not None else pai_do_removido)
 
-    def _balancear_remocao(self, no: NoRN | None) -> None:
+    def _balancear_remocao(self, no: NoRN | None, pai: NoRN | None) -> None:
         """Corrige violações de altura-negra após remoção (cascata bottom-up).
 
-        Se nó é preto com apenas 1 filho, rotações/recolorações restauram
-        propriedades. Se raiz, garante que é preta.
+        ``no`` ocupa a posição de um nó preto removido e carrega um preto
+        extra. Irmão vermelho vira preto por rotação; irmão preto com
+        filhos pretos é recolorido e o problema sobe; irmão preto com
+        filho vermelho resolve com uma ou duas rotações.
 
         Args:
-            no (NoRN | None): Nó pai do removido; inicia cascata de correção.
+            no (NoRN | None): Filho que ocupou o lugar do removido (pode ser nulo).
+            pai (NoRN | None): Pai dessa posição.
         """
-        while no is not None and no != self.raiz:
-            if no.esquerda and not self._cor_vermelha(no):
-                irmao = no.direita
-                if irmao and self._cor_vermelha(irmao):
+        while no is not self.raiz and not self._cor_vermelha(no):
+            if no is pai.esquerda:
+                irmao = pai.direita
+                if irmao.cor:
                     irmao.cor = False
-                    no.cor = True
-                    self._rotacao_esquerda(no)
-                    no.atualizar()
+                    pai.cor = True
+                    self._rotacao_esquerda(pai)
+                    irmao = pai.direita
+                if not self._cor_vermelha(irmao.esquerda) and not self._cor_vermelha(
+                    irmao.direita
+                ):
+                    irmao.cor = True
                     irmao.atualizar()
-                    irmao = no.direita
-                if irmao:
-                    if not self._cor_vermelha(
-                        irmao.esquerda
-                    ) and not self._cor_vermelha(irmao.direita):
-                        irmao.cor = True
-                        irmao.atualizar()
-                        no = no.pai
-                    else:
-                        if not self._cor_vermelha(irmao.direita):
-                            if irmao.esquerda:
-                                irmao.esquerda.cor = False
-                            irmao.cor = True
-                            self._rotacao_direita(irmao)
-                            irmao.atualizar()
-                            irmao = no.direita
-                        if irmao:
-                            irmao.cor = no.cor
-                            no.cor = False
-                            if irmao.direita:
-                                irmao.direita.cor = False
-                            self._rotacao_esquerda(no)
-                            no.atualizar()
-                            irmao.atualizar()
-                            no = self.raiz
+                    no = pai
+                    pai = no.pai
+                    continue
+                if not self._cor_vermelha(irmao.direita):
+                    irmao.esquerda.cor = False
+                    irmao.esquerda.atualizar()
+                    irmao.cor = True
+                    self._rotacao_direita(irmao)
+                    irmao = pai.direita
+                irmao.cor = pai.cor
+                pai.cor = False
+                irmao.direita.cor = False
+                irmao.direita.atualizar()
+                self._rotacao_esquerda(pai)
             else:
-                no = no.pai
-        if self.raiz:
-            self.raiz.cor = False
-            self.raiz.atualizar()
+                irmao = pai.esquerda
+                if irmao.cor:
+                    irmao.cor = False
+                    pai.cor = True
+                    self._rotacao_direita(pai)
+                    irmao = pai.esquerda
+                if not self._cor_vermelha(irmao.esquerda) and not self._cor_vermelha(
+                    irmao.direita
+                ):
+                    irmao.cor = True
+                    irmao.atualizar()
+                    no = pai
+                    pai = no.pai
+                    continue
+                if not self._cor_vermelha(irmao.esquerda):
+                    irmao.direita.cor = False
+                    irmao.direita.atualizar()
+                    irmao.cor = True
+                    self._rotacao_esquerda(irmao)
+                    irmao = pai.esquerda
+                irmao.cor = pai.cor
+                pai.cor = False
+                irmao.esquerda.cor = False
+                irmao.esquerda.atualizar()
+                self._rotacao_direita(pai)
+            no = self.raiz
+
+        if no is not None:
+            no.cor = False
+
+    def ativar_instrumentacao(self, gancho=None) -> None:
+        """Como na BST; os dois balanceamentos também contam recolorações."""
+        super().ativar_instrumentacao(gancho)
+        self._balancear = balanceamento_instrumentado(
+            self._balancear, self._estatisticas, gancho
+        )
+        self._balancear_remocao = balanceamento_instrumentado(
+            self._balancear_remocao, self._estatisticas, gancho
+        )
 
     def _contar_pretos(self, no: NoRN | None) -> int:
-        """Conta nós pretos no caminho da raiz até ``no`` (incluindo ``no``).
+        """Conta nós pretos no caminho mais à esquerda a partir de ``no``.
 
         Args:
-            no (NoRN | None): Nó final do caminho.
+            no (NoRN | None): Nó inicial do caminho.
 
         Returns:
-            int: Quantidade de nós pretos (1 se ``no`` é ``None``).
+            int: Quantidade de nós pretos, contando o nulo final como preto
+            (1 se ``no`` é ``None``).
         """
-        if no is None:
-            return 1
-        return (1 if not no.cor else 0) + self._contar_pretos(no.esquerda)
-
-    def _altura_negra(self, no: NoRN | None) -> int:
-        """Retorna altura-negra de ``no`` (nós pretos até folha mais próxima).
-
-        Todos os caminhos de ``no`` até folha devem ter mesma altura-negra
-        para árvore RB válida.
-
-        Args:
-            no (NoRN | None): Raiz da subárvore a medir.
-
-        Returns:
-            int: Altura-negra, ou -1 se inválida (caminhos diferentes).
-        """
-        if no is None:
-            return 1
-        altura_negra_esquerdaura = self._altura_negra(no.esquerda)
-        altura_negra_direitaura = self._altura_negra(no.direita)
-        if (
-            altura_negra_esquerdaura == -1
-            or altura_negra_direitaura == -1
-            or altura_negra_esquerdaura != altura_negra_direitaura
-        ):
-            return -1
-        return altura_negra_esquerdaura + (1 if not no.cor else 0)
-
-    def validar_propriedades(self) -> bool:
-        """Valida todas as propriedades de uma Árvore Rubro-Negra.
-
-        Verifica:
-        - Raiz é preta.
-        - Nós vermelhos não têm filhos vermelhos.
-        - Altura-negra igual em todos os caminhos.
-
-        Returns:
-            bool: ``True`` se todas as propriedades são satisfeitas.
+        pretos = 1
+        while no is not None:
+            if not no.cor:
+                pretos += 1
+            no = no.esquerda
+        return pretos
+
+    def _verificar_raiz(self) -> str | None:
+        """Acrescenta a regra da raiz preta."""
+        mensagem = super()._verificar_raiz()
+        if mensagem is None and self.raiz is not None and self.raiz.cor:
+            return f"raiz {self.raiz.chave!r} vermelha"
+        return mensagem
+
+    def _verificar_no(self, no: NoRN) -> str | None:
+        """Acrescenta as regras de cor e a ``altura_negra`` em cache.
+
+        Conferir em cada nó que os filhos têm a mesma altura-negra em cache
+        e que a do nó é a deles mais a sua própria cor equivale, somado
+        sobre a árvore toda, a todos os caminhos terem o mesmo número de
+        nós pretos.
         """
-        if self.raiz is None:
-            return True
-        if self.raiz.cor:
-            return False
-        if not self._validar_vermelho(self.raiz):
-            return False
-        return self._altura_negra(self.raiz) >= 1
-
-    def _validar_vermelho(self, no: NoRN | None) -> bool:
-        """Verifica se nós vermelhos não têm filhos vermelhos (recursivo).
-
-        Args:
-            no (NoRN | None): Nó a verificar.
-
-        Returns:
-            bool: ``True`` se nenhuma violação encontrada.
-        """
-        if no is None:
-            return True
-        if self._cor_vermelha(no):
-            if self._cor_vermelha(no.esquerda) or self._cor_vermelha(no.direita):
-                return False
-        return self._validar_vermelho(no.esquerda) and self._validar_vermelho(
-            no.direita
-        )
+        mensagem = super()._verificar_no(no)
+        if mensagem is not None:
+            return mensagem
+        esquerda, direita = no.esquerda, no.direita
+        if no.cor and (self._cor_vermelha(esquerda) or self._cor_vermelha(direita)):
+            return f"nó vermelho {no.chave!r} com filho vermelho"
+        altura_negra_esquerda = esquerda.altura_negra if esquerda else 1
+        altura_negra_direita = direita.altura_negra if direita else 1
+        if altura_negra_esquerda != altura_negra_direita:
+            return f"altura-negra diferente entre os filhos de {no.chave!r}"
+        altura_negra = altura_negra_esquerda + (0 if no.cor else 1)
+        if no.altura_negra != altura_negra:
+            return (
+                f"altura-negra {no.altura_negra} em cache em {no.chave!r}, "
+                f"real {altura_negra}"
+            )
+        return None
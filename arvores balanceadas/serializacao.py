@@ -0,0 +1,189 @@
+"""Formato binário de instantâneos das árvores (``salvar``/``carregar``).
+
+Layout (little-endian):
+
+- cabeçalho: ``b"ARVB"``, versão (1 byte), tipo da árvore (1 byte),
+  formato das chaves (1 byte), 1 byte reservado e a quantidade de nós
+  (8 bytes);
+- um byte por nó em pré-ordem: bit 0 = tem filho esquerdo, bit 1 = tem
+  filho direito, bits 2-7 = estado do nó (altura na AVL, cor na
+  Rubro-Negra, zero na BST);
+- as chaves em ordem crescente, como inteiros de 64 bits
+  (``CHAVES_INT64``) ou, se alguma não couber nisso, como uma lista em
+  ``pickle`` (``CHAVES_PICKLE``).
+
+Ler um bloco em ``pickle`` pode executar código arbitrário embutido no
+arquivo, então ``ler_chaves`` só o aceita com ``permitir_pickle=True``,
+para instantâneos de origem confiável.
+
+Com o formato dos filhos em pré-ordem e as chaves em ordem, a forma exata
+da árvore é reconstruída em O(n) sem comparações nem rotações.
+"""
+
+import pickle
+import struct
+import sys
+from array import array
+
+MAGICO = b"ARVB"
+VERSAO = 1
+CABECALHO = struct.Struct("<4sBBBxQ")
+TAMANHO_BLOCO = 1 << 16
+
+CHAVES_INT64 = 0
+CHAVES_PICKLE = 1
+
+TEM_ESQUERDA = 1
+TEM_DIREITA = 2
+DESLOCAMENTO_ESTADO = 2
+
+
+def escrever_cabecalho(
+    arquivo, tipo: int, quantidade: int, formato_chaves: int = CHAVES_INT64
+) -> None:
+    """Grava o cabeçalho do instantâneo.
+
+    Args:
+        arquivo: Arquivo binário aberto para escrita.
+        tipo (int): Código do tipo de árvore.
+        quantidade (int): Número de nós.
+        formato_chaves (int, optional): ``CHAVES_INT64`` ou ``CHAVES_PICKLE``.
+    """
+    arquivo.write(CABECALHO.pack(MAGICO, VERSAO, tipo, formato_chaves, quantidade))
+
+
+def ler_cabecalho(arquivo, tipo: int) -> tuple[int, int]:
+    """Lê e valida o cabeçalho do instantâneo.
+
+    Args:
+        arquivo: Arquivo binário aberto para leitura.
+        tipo (int): Código do tipo de árvore esperado.
+
+    Returns:
+        tuple[int, int]: Número de nós e formato das chaves.
+
+    Raises:
+        ValueError: Se o arquivo não for um instantâneo válido deste tipo.
+    """
+    dados = arquivo.read(CABECALHO.size)
+    if len(dados) != CABECALHO.size:
+        raise ValueError("Arquivo truncado: cabeçalho incompleto.")
+    magico, versao, tipo_arquivo, formato_chaves, quantidade = CABECALHO.unpack(dados)
+    if magico != MAGICO:
+        raise ValueError("Arquivo não é um instantâneo de árvore.")
+    if versao != VERSAO:
+        raise ValueError(f"Versão de instantâneo não suportada: {versao}.")
+    if tipo_arquivo != tipo:
+        raise ValueError(
+            f"Instantâneo de outro tipo de árvore (tipo {tipo_arquivo}, "
+            f"esperado {tipo})."
+        )
+    if formato_chaves not in (CHAVES_INT64, CHAVES_PICKLE):
+        raise ValueError(f"Formato de chaves desconhecido: {formato_chaves}.")
+    return quantidade, formato_chaves
+
+
+def codificar_chaves(chaves) -> tuple[int, object]:
+    """Escolhe a forma compacta das chaves: ``array`` de int64 ou ``list``.
+
+    Args:
+        chaves: Iterável de chaves.
+
+    Returns:
+        tuple[int, object]: Formato (``CHAVES_INT64`` ou ``CHAVES_PICKLE``)
+        e as chaves como ``array("q")`` ou ``list``.
+    """
+    chaves = list(chaves)
+    try:
+        return CHAVES_INT64, array("q", chaves)
+    except (TypeError, OverflowError):
+        return CHAVES_PICKLE, chaves
+
+
+def escrever_chaves(arquivo, formato_chaves: int, chaves) -> None:
+    """Grava as chaves retornadas por ``codificar_chaves``."""
+    if formato_chaves == CHAVES_INT64:
+        _gravar_bloco(arquivo, chaves)
+    else:
+        pickle.dump(chaves, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def ler_chaves(
+    arquivo, formato_chaves: int, quantidade: int, permitir_pickle: bool = False
+):
+    """Lê ``quantidade`` chaves gravadas por ``escrever_chaves``.
+
+    Args:
+        arquivo: Arquivo binário aberto para leitura.
+        formato_chaves (int): ``CHAVES_INT64`` ou ``CHAVES_PICKLE``.
+        quantidade (int): Número de chaves.
+        permitir_pickle (bool, optional): Aceita chaves em ``pickle``, que
+            podem executar código ao serem lidas; só para arquivos confiáveis.
+
+    Raises:
+        ValueError: Se o arquivo terminar antes ou estiver corrompido, ou
+            se as chaves estiverem em ``pickle`` sem ``permitir_pickle``.
+    """
+    if formato_chaves == CHAVES_INT64:
+        return ler_vetor(arquivo, "q", quantidade)
+    if not permitir_pickle:
+        raise ValueError(
+            "As chaves do instantâneo estão em pickle, que pode executar código "
+            "ao ser lido; use permitir_pickle=True só com arquivos confiáveis."
+        )
+    try:
+        chaves = pickle.load(arquivo)
+    except (EOFError, pickle.UnpicklingError):
+        raise ValueError("Arquivo truncado: faltam dados dos nós.") from None
+    if not isinstance(chaves, list) or len(chaves) != quantidade:
+        raise ValueError("Instantâneo corrompido: lista de chaves inválida.")
+    return chaves
+
+
+def escrever_vetor(arquivo, codigo: str, valores) -> None:
+    """Grava ``valores`` em blocos de ``TAMANHO_BLOCO`` itens.
+
+    Args:
+        arquivo: Arquivo binário aberto para escrita.
+        codigo (str): Código de tipo do ``array`` (``"B"`` ou ``"q"``).
+        valores: Iterável de inteiros, consumido sob demanda.
+    """
+    bloco = array(codigo)
+    for valor in valores:
+        bloco.append(valor)
+        if len(bloco) == TAMANHO_BLOCO:
+            _gravar_bloco(arquivo, bloco)
+            bloco = array(codigo)
+    if bloco:
+        _gravar_bloco(arquivo, bloco)
+
+
+def _gravar_bloco(arquivo, bloco: array) -> None:
+    if sys.byteorder == "big":
+        bloco = array(bloco.typecode, bloco)
+        bloco.byteswap()
+    bloco.tofile(arquivo)
+
+
+def ler_vetor(arquivo, codigo: str, quantidade: int) -> array:
+    """Lê ``quantidade`` itens diretamente para um ``array``.
+
+    Args:
+        arquivo: Arquivo binário aberto para leitura.
+        codigo (str): Código de tipo do ``array``.
+        quantidade (int): Número de itens.
+
+    Returns:
+        array: Itens lidos.
+
+    Raises:
+        ValueError: Se o arquivo terminar antes.
+    """
+    vetor = array(codigo)
+    try:
+        vetor.fromfile(arquivo, quantidade)
+    except (EOFError, ValueError):
+        raise ValueError("Arquivo truncado: faltam dados dos nós.") from None
+    if sys.byteorder == "big":
+        vetor.byteswap()
+    return vetor
@@ -0,0 +1,289 @@
+"""Estruturas e operações de Árvore Splay (autoajustável).
+
+Cada acesso (busca, inserção, remoção) traz o nó alcançado até a raiz com
+as rotações da BST, em passos zig, zig-zig e zig-zag. Sem nenhum campo de
+balanceamento, as chaves mais acessadas ficam perto da raiz: o custo
+amortizado é O(log n) por operação e, sob acessos concentrados (Zipf),
+proporcional à entropia da distribuição, não a log n.
+
+Em Python cada rotação custa bem mais que um passo de descida, e afunilar
+toda busca pode sair mais caro que a própria busca. Com ``probabilidade``
+menor que 1 só uma fração das buscas afunila (splay aleatorizado, de Albers
+e Karpinski): as chaves quentes, sorteadas com frequência, continuam
+subindo, com uma fração das rotações.
+"""
+
+from collections.abc import Callable
+from random import random
+
+from binaria_de_busca import ArvoreBST, Chave, NoBST
+from instrumentacao import buscar_instrumentado
+
+
+class NoSplayMapa(NoBST):
+    """Nó Splay do modo mapa: acrescenta o `valor` associado à chave.
+
+    Sem modo mapa a Splay usa o próprio ``NoBST``, pois não guarda nenhum
+    estado de balanceamento.
+    """
+
+    __slots__ = ("valor",)
+
+    def __init__(self, chave: Chave):
+        super().__init__(chave)
+        self.valor = None
+
+
+class ArvoreSplay(ArvoreBST):
+    """Árvore Splay: BST que leva cada nó acessado até a raiz.
+
+    ``buscar``, ``in``, ``get``, ``inserir`` e ``remover`` reorganizam a
+    árvore; as consultas ordenadas (``piso``, ``teto``, ``intervalo``,
+    ``rank``...) e as operações ``*_perto`` apenas leem. Como as buscas
+    alteram a estrutura, a árvore não deve ser lida por várias threads ao
+    mesmo tempo (``ArvoreConcorrente`` serve só a AVL e a Rubro-Negra).
+
+    Args:
+        mapa (bool, optional): Se ``True``, usa ``NoSplayMapa`` e habilita a
+            interface de dicionário ordenado.
+        key (Callable | None, optional): Função que extrai a chave de cada
+            item inserido; implica ``mapa=True``, com o item como valor.
+        probabilidade (float, optional): Chance de cada busca afunilar o nó
+            alcançado; com ``1.0`` (padrão) toda busca afunila. Inserções
+            sempre afunilam o nó e remoções, o pai da posição removida.
+
+    Raises:
+        ValueError: Se ``probabilidade`` não estiver em ``(0, 1]``.
+    """
+
+    _TIPO_ARQUIVO = 3
+    _AJUSTA_NA_BUSCA = True
+
+    def __init__(
+        self,
+        mapa: bool = False,
+        key: Callable | None = None,
+        probabilidade: float = 1.0,
+    ):
+        if not 0.0 < probabilidade <= 1.0:
+            raise ValueError("probabilidade deve estar em (0, 1].")
+        mapa = mapa or key is not None
+        super().__init__(NoSplayMapa if mapa else NoBST)
+        self.mapa = mapa
+        self.probabilidade = probabilidade
+        self._usar_funcao_chave(key)
+
+    @classmethod
+    def construir_em_lote(cls, chaves, probabilidade: float = 1.0) -> "ArvoreSplay":
+        """Constrói uma Splay balanceada a partir de um iterável de chaves.
+
+        Args:
+            chaves: Iterável de chaves (ordenado ou não, com ou sem repetições).
+            probabilidade (float, optional): Chance de afunilar nas buscas.
+
+        Returns:
+            ArvoreSplay: Nova árvore contendo as chaves.
+        """
+        arvore = cls(probabilidade=probabilidade)
+        chaves = arvore._preparar_lote(chaves)
+        arvore._definir_raiz(arvore._construir_balanceada(chaves, 0, len(chaves)))
+        return arvore
+
+    def _afunilar(self, no: NoBST) -> None:
+        """Leva ``no`` até a raiz (splay) com rotações duplas de baixo para cima.
+
+        Zig-zig (nó e pai do mesmo lado) gira primeiro o avô e depois o pai,
+        o que encurta pela metade o caminho percorrido; zig-zag gira o pai e
+        depois o avô; zig é a rotação final, quando o pai é a raiz.
+
+        Args:
+            no (NoBST): Nó a levar até a raiz.
+        """
+        while no.pai is not None:
+            pai = no.pai
+            avo = pai.pai
+            if avo is None:
+                if no is pai.esquerda:
+                    self._rotacao_direita(pai)
+                else:
+                    self._rotacao_esquerda(pai)
+            elif no is pai.esquerda:
+                if pai is avo.esquerda:
+                    self._rotacao_direita(avo)
+                    self._rotacao_direita(pai)
+                else:
+                    self._rotacao_direita(pai)
+                    self._rotacao_esquerda(avo)
+            elif pai is avo.direita:
+                self._rotacao_esquerda(avo)
+                self._rotacao_esquerda(pai)
+            else:
+                self._rotacao_esquerda(pai)
+                self._rotacao_direita(avo)
+
+    def _acessar(self, chave: Chave) -> NoBST | None:
+        """Desce até ``chave`` e afunila o nó encontrado ou o último visitado.
+
+        Returns:
+            NoBST | None: Nó com a ``chave`` (agora na raiz), ou ``None``.
+        """
+        no_atual = self.raiz
+        ultimo = None
+        while no_atual is not None:
+            if chave < no_atual.chave:
+                ultimo, no_atual = no_atual, no_atual.esquerda
+            elif no_atual.chave < chave:
+                ultimo, no_atual = no_atual, no_atual.direita
+            else:
+                self._afunilar(no_atual)
+                return no_atual
+        if ultimo is not None:
+            self._afunilar(ultimo)
+        return None
+
+    def buscar(self, chave: Chave) -> NoBST | None:
+        """Busca ``chave`` e leva o nó (ou o último visitado, se faltar) à raiz.
+
+        Com ``probabilidade`` menor que 1, as buscas não sorteadas só descem.
+
+        Args:
+            chave (Chave): Chave desejada.
+
+        Returns:
+            NoBST | None: Nó encontrado, ou ``None`` se não existir.
+        """
+        if self.probabilidade < 1.0 and not random() < self.probabilidade:
+            return self._buscar(self.raiz, chave)
+        return self._acessar(chave)
+
+    def ativar_instrumentacao(self, gancho=None) -> None:
+        """Como na BST; a busca contada continua afunilando o nó alcançado.
+
+        As comparações registradas são as da descida antes do afunilamento,
+        que reaproveita o nó alcançado por essa mesma descida.
+        """
+        super().ativar_instrumentacao(gancho)
+
+        def afunilar(encontrado: NoBST | None, ultimo: NoBST | None) -> None:
+            if self.probabilidade < 1.0 and not random() < self.probabilidade:
+                return
+            alvo = encontrado if encontrado is not None else ultimo
+            if alvo is not None:
+                self._afunilar(alvo)
+
+        self.buscar = buscar_instrumentado(self, gancho, afunilar)
+
+    def inserir(self, chave: Chave) -> bool:
+        """Insere uma ``chave`` e a leva até a raiz (mesmo se já existia).
+
+        Args:
+            chave (Chave): Chave a inserir.
+
+        Returns:
+            bool: ``True`` se a chave era nova, ``False`` se já existia.
+        """
+        return self._localizar_ou_inserir(chave)[1]
+
+    def _localizar_ou_inserir(
+        self, chave: Chave, inicio: NoBST | None = None
+    ) -> tuple[NoBST, bool]:
+        """Como na BST, afunilando também o nó que já existia."""
+        no, inserido = super()._localizar_ou_inserir(chave, inicio)
+        if not inserido:
+            self._afunilar(no)
+        return no, inserido
+
+    def _reequilibrar_insercao(self, novo_no: NoBST) -> None:
+        self._afunilar(novo_no)
+
+    def _remover_e_reequilibrar(self, no: NoBST) -> None:
+        """Remove ``no`` e afunila o pai da posição removida.
+
+        Em geral a busca de ``remover`` já trouxe ``no`` até a raiz, e a
+        troca com o sucessor desce só pela subárvore direita, cujo caminho
+        é então encurtado pelo afunilamento.
+        """
+        pai_do_removido = self._remover_no(no)
+        if pai_do_removido is not None:
+            self._afunilar(pai_do_removido)
+
+    def _verificar_vizinhanca(self, chave: Chave) -> str | None:
+        """Confere a árvore inteira: o afunilamento reorganiza todo o caminho.
+
+        Esse caminho pode ter O(n) nós, então o modo de depuração da Splay
+        custa O(n) por operação.
+        """
+        mensagem = self._verificar_raiz()
+        if mensagem is not None:
+            return mensagem
+        for no in self._em_ordem(self.raiz):
+            mensagem = self._verificar_no(no)
+            if mensagem is not None:
+                return mensagem
+        return None
+
+    def _vazia(self) -> "ArvoreSplay":
+        return type(self)(self.mapa, self.key, self.probabilidade)
+
+    def _dividir_nos(
+        self, no: NoBST | None, chave: Chave
+    ) -> tuple[NoBST | None, NoBST | None, NoBST | None]:
+        """Split por afunilamento: a ``chave`` (ou vizinha) vai à raiz e é cortada.
+
+        Em vez de descer e juntar os pedaços como a BST, traz a ``chave`` à
+        raiz e corta ali, o que também aproveita o ajuste da Splay. Usa
+        ``self.raiz`` como área de trabalho.
+        """
+        if no is None:
+            return None, None, None
+        self.raiz = no
+        self._acessar(chave)
+        raiz = self.raiz
+        esquerda, direita = self._separar(raiz)
+        if chave < raiz.chave:
+            return esquerda, None, self._juntar_nos(None, raiz, direita)
+        if raiz.chave < chave:
+            return self._juntar_nos(esquerda, raiz, None), None, direita
+        return esquerda, raiz, direita
+
+    def _dividir_ultimo(self, no: NoBST) -> tuple[NoBST | None, NoBST]:
+        """Afunila o maior nó da subárvore solta de ``no`` e o separa."""
+        self.raiz = no
+        while no.direita is not None:
+            no = no.direita
+        self._afunilar(no)
+        esquerda, _ = self._separar(no)
+        return esquerda, no
+
+    def _centralizar(self, no: NoBST | None) -> NoBST | None:
+        """Afunila a mediana da subárvore solta de ``no`` até a raiz dela.
+
+        As operações de conjunto da BST dividem o problema pelos filhos da
+        raiz; com a mediana na raiz as metades ficam equilibradas e o número
+        de subproblemas fica O(log n) em profundidade mesmo numa Splay
+        degenerada.
+        """
+        if no is None or no.tamanho <= self._LIMITE_SEQUENCIAL:
+            return no
+        self.raiz = no
+        k = no.tamanho // 2
+        while True:
+            tamanho_esquerda = no.esquerda.tamanho if no.esquerda else 0
+            if k < tamanho_esquerda:
+                no = no.esquerda
+            elif k > tamanho_esquerda:
+                k -= tamanho_esquerda + 1
+                no = no.direita
+            else:
+                break
+        self._afunilar(no)
+        return no
+
+    def _passo_uniao(self, a: NoBST | None, b: NoBST | None) -> tuple:
+        return super()._passo_uniao(self._centralizar(a), b)
+
+    def _passo_intersecao(self, a: NoBST | None, b: NoBST | None) -> tuple:
+        return super()._passo_intersecao(self._centralizar(a), b)
+
+    def _passo_diferenca(self, a: NoBST | None, b: NoBST | None) -> tuple:
+        return super()._passo_diferenca(a, self._centralizar(b))
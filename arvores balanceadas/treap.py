@@ -0,0 +1,254 @@
+"""Estruturas e operações de Treap (árvore + heap de prioridades aleatórias).
+
+Cada nó recebe uma `prioridade` sorteada e a árvore é, ao mesmo tempo, uma
+BST pelas chaves e um heap de máximo pelas prioridades; as rotações da BST
+restauram o heap. A altura esperada é O(log n), qualquer que seja a ordem
+das inserções.
+
+As buscas bem-sucedidas sorteiam uma nova prioridade e ficam com a maior
+(treap ponderada de Seidel e Aragon): depois de ``k`` acessos a prioridade
+de um nó é o máximo de ``k + 1`` sorteios, então as chaves mais acessadas
+sobem para perto da raiz e o acesso esperado custa O(log(W / w)), com ``w``
+os acessos da chave e ``W`` o total. Quanto mais acessado o nó, mais rara
+fica uma nova rotação.
+"""
+
+from collections.abc import Callable
+from random import random
+
+from binaria_de_busca import ArvoreBST, Chave, NoBST
+from instrumentacao import buscar_instrumentado
+
+
+class NoTreap(NoBST):
+    """Nó de uma Treap.
+
+    Herda de ``NoBST`` e adiciona a `prioridade`, sorteada em ``[0, 1)`` na
+    criação; o pai tem sempre prioridade maior ou igual à dos filhos.
+    """
+
+    __slots__ = ("prioridade",)
+
+    def __init__(self, chave: Chave):
+        super().__init__(chave)
+        self.prioridade = random()
+
+    def __str__(self) -> str:
+        return f"{self.chave} (Prioridade: {self.prioridade:.4f})"
+
+
+class NoTreapMapa(NoTreap):
+    """Nó Treap do modo mapa: acrescenta o `valor` associado à chave."""
+
+    __slots__ = ("valor",)
+
+    def __init__(self, chave: Chave):
+        super().__init__(chave)
+        self.valor = None
+
+
+class Treap(ArvoreBST):
+    """Treap: BST pelas chaves e heap de máximo pelas prioridades.
+
+    Inserção sobe o nó novo por rotações enquanto a prioridade dele for
+    maior que a do pai; remoção desce o nó pelo filho de maior prioridade
+    até que tenha no máximo um filho. ``buscar`` (e ``in``, ``get``...)
+    pode promover a chave encontrada; como altera a árvore, a Treap não
+    deve ser lida por várias threads ao mesmo tempo.
+
+    Args:
+        mapa (bool, optional): Se ``True``, usa ``NoTreapMapa`` e habilita a
+            interface de dicionário ordenado.
+        key (Callable | None, optional): Função que extrai a chave de cada
+            item inserido; implica ``mapa=True``, com o item como valor.
+    """
+
+    _TIPO_ARQUIVO = 4
+    _AJUSTA_NA_BUSCA = True
+
+    def __init__(self, mapa: bool = False, key: Callable | None = None):
+        mapa = mapa or key is not None
+        super().__init__(NoTreapMapa if mapa else NoTreap)
+        self.mapa = mapa
+        self._usar_funcao_chave(key)
+
+    @classmethod
+    def construir_em_lote(cls, chaves) -> "Treap":
+        """Constrói uma Treap balanceada a partir de um iterável de chaves.
+
+        A forma é montada em O(n) sem rotações e as prioridades são
+        sorteadas depois, compatíveis com ela (ver ``_sortear_prioridades``).
+
+        Args:
+            chaves: Iterável de chaves (ordenado ou não, com ou sem repetições).
+
+        Returns:
+            Treap: Nova árvore contendo as chaves.
+        """
+        arvore = cls()
+        chaves = arvore._preparar_lote(chaves)
+        arvore._definir_raiz(arvore._construir_balanceada(chaves, 0, len(chaves)))
+        arvore._sortear_prioridades(arvore.raiz)
+        return arvore
+
+    def _sortear_prioridades(self, raiz: NoTreap | None) -> None:
+        """Sorteia prioridades que respeitam o heap numa forma já montada.
+
+        Desce em pré-ordem dando a cada nó o máximo de ``tamanho`` sorteios
+        uniformes abaixo da prioridade do pai (``limite * U ** (1 / tamanho)``):
+        é a distribuição que a raiz de cada subárvore teria numa Treap com
+        essa forma, então as inserções seguintes não são favorecidas nem
+        prejudicadas.
+
+        Args:
+            raiz (NoTreap | None): Raiz da árvore, com ``tamanho`` correto.
+        """
+        for no in self._pre_ordem(raiz):
+            limite = no.pai.prioridade if no.pai is not None else 1.0
+            no.prioridade = limite * random() ** (1 / no.tamanho)
+
+    def _restaurar_metadados(self, raiz: NoTreap | None) -> None:
+        """Recalcula o tamanho e sorteia as prioridades, que não são gravadas."""
+        super()._restaurar_metadados(raiz)
+        self._sortear_prioridades(raiz)
+
+    def _subir(self, no: NoTreap) -> None:
+        """Gira ``no`` para cima enquanto sua prioridade superar a do pai.
+
+        Args:
+            no (NoTreap): Nó recém-inserido ou promovido.
+        """
+        pai = no.pai
+        while pai is not None and pai.prioridade < no.prioridade:
+            if no is pai.esquerda:
+                self._rotacao_direita(pai)
+            else:
+                self._rotacao_esquerda(pai)
+            pai = no.pai
+
+    def _descer(self, no: NoTreap) -> None:
+        """Gira ``no`` para baixo enquanto algum filho tiver prioridade maior.
+
+        Args:
+            no (NoTreap): Nó possivelmente acima do lugar certo no heap.
+        """
+        while True:
+            esquerda, direita = no.esquerda, no.direita
+            maior = esquerda
+            if direita is not None and (
+                esquerda is None or esquerda.prioridade < direita.prioridade
+            ):
+                maior = direita
+            if maior is None or not no.prioridade < maior.prioridade:
+                return
+            if maior is esquerda:
+                self._rotacao_direita(no)
+            else:
+                self._rotacao_esquerda(no)
+
+    def _promover(self, no: NoTreap) -> None:
+        """Sorteia uma nova prioridade para ``no`` e fica com a maior.
+
+        Args:
+            no (NoTreap): Nó acessado.
+        """
+        prioridade = random()
+        if no.prioridade < prioridade:
+            no.prioridade = prioridade
+            self._subir(no)
+
+    def buscar(self, chave: Chave) -> NoTreap | None:
+        """Busca ``chave`` e promove o nó encontrado (ver ``_promover``).
+
+        Args:
+            chave (Chave): Chave desejada.
+
+        Returns:
+            NoTreap | None: Nó encontrado, ou ``None`` se não existir.
+        """
+        no = self._buscar(self.raiz, chave)
+        if no is not None:
+            self._promover(no)
+        return no
+
+    def ativar_instrumentacao(self, gancho=None) -> None:
+        """Como na BST; a busca contada continua promovendo o nó encontrado."""
+        super().ativar_instrumentacao(gancho)
+
+        def promover(encontrado: NoTreap | None, _ultimo: NoTreap | None) -> None:
+            if encontrado is not None:
+                self._promover(encontrado)
+
+        self.buscar = buscar_instrumentado(self, gancho, promover)
+
+    def inserir(self, chave: Chave) -> bool:
+        """Insere uma ``chave`` e a sobe até o lugar dela no heap.
+
+        Args:
+            chave (Chave): Chave a inserir.
+
+        Returns:
+            bool: ``True`` se a chave era nova, ``False`` se já existia.
+        """
+        novo_no = self._inserir(chave)
+        if novo_no is None:
+            return False
+        self._subir(novo_no)
+        return True
+
+    def _reequilibrar_insercao(self, novo_no: NoTreap) -> None:
+        self._subir(novo_no)
+
+    def _remover_e_reequilibrar(self, no: NoTreap) -> None:
+        """Desce ``no`` pelo filho de maior prioridade até ter um filho e o remove.
+
+        Diferente da troca com o sucessor da BST, as prioridades das chaves
+        que ficam não mudam, e a árvore continua sendo a Treap delas.
+        """
+        while no.esquerda is not None and no.direita is not None:
+            if no.direita.prioridade < no.esquerda.prioridade:
+                self._rotacao_direita(no)
+            else:
+                self._rotacao_esquerda(no)
+        self._remover_no(no)
+
+    def _verificar_no(self, no: NoTreap) -> str | None:
+        """Acrescenta a propriedade de heap entre ``no`` e seus filhos."""
+        mensagem = super()._verificar_no(no)
+        if mensagem is not None:
+            return mensagem
+        for filho in (no.esquerda, no.direita):
+            if filho is not None and no.prioridade < filho.prioridade:
+                return f"filho de {no.chave!r} com prioridade maior que a dele"
+        return None
+
+    def _vizinhos_afetados(self, chave: Chave) -> tuple:
+        """Acrescenta o antecessor e o sucessor da ``chave``.
+
+        O nó que sobe por rotações deixa os nós por onde passou nas bordas
+        internas das suas subárvores, isto é, nos caminhos até ele a partir
+        do antecessor e do sucessor.
+        """
+        return (
+            self.piso(chave),
+            self.teto(chave),
+            self.antecessor(chave),
+            self.sucessor(chave),
+        )
+
+    def _vazia(self) -> "Treap":
+        return type(self)(self.mapa, self.key)
+
+    def _juntar_nos(
+        self, esquerda: NoTreap | None, meio: NoTreap, direita: NoTreap | None
+    ) -> NoTreap:
+        """Join da Treap: ``meio`` entra como raiz e desce até o lugar no heap.
+
+        Com as duas subárvores já sendo Treaps, só ``meio`` pode violar o
+        heap, e ``_descer`` o leva para baixo em O(altura). Usa
+        ``self.raiz`` como área de trabalho.
+        """
+        super()._juntar_nos(esquerda, meio, direita)
+        self.raiz = meio
+        self._descer(meio)
+        return self.raiz
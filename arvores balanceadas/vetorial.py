@@ -0,0 +1,664 @@
+"""Motor vetorial (struct-of-arrays) para Árvores AVL e Rubro-Negra.
+
+Em vez de um objeto por nó, cada atributo fica em um ``array`` paralelo
+indexado pelo número do nó (chaves, filhos, pai e altura ou cor). O índice
+``0`` é um sentinela que faz o papel de ``None``; nós removidos entram numa
+lista livre encadeada pelo vetor ``esquerda`` e são reaproveitados.
+
+As classes expõem a mesma interface de ``ArvoreAVL`` e ``ArvoreRubroNegro``
+(``inserir``, ``remover``, ``buscar``, ``intervalo``, ``mostrar``,
+``validar_propriedades``), e ``copiar()`` é apenas
+uma cópia dos buffers. As chaves ficam num ``array`` de inteiros de 64 bits;
+ao receber a primeira chave de outro tipo (ou fora dessa faixa) o vetor de
+chaves vira uma ``list``, perdendo a compactação só nele.
+"""
+
+from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Iterator
+
+NULO = 0
+
+
+class NoVetorial:
+    """Visão leve de um nó do motor vetorial, criada sob demanda.
+
+    Não guarda dados próprios: lê a árvore pelo ``indice``. Só é válida
+    enquanto o nó não for removido.
+    """
+
+    __slots__ = ("arvore", "indice")
+
+    def __init__(self, arvore: "ArvoreVetorial", indice: int):
+        self.arvore = arvore
+        self.indice = indice
+
+    @property
+    def chave(self) -> int:
+        return self.arvore.chaves[self.indice]
+
+    def __str__(self) -> str:
+        return self.arvore._descrever(self.indice)
+
+
+class ArvoreVetorial(ABC):
+    """Base do motor vetorial: armazenamento, rotações, busca e percursos.
+
+    Subclasses acrescentam o vetor de balanceamento em ``_vetores_extras``
+    e implementam ``_apos_inserir``/``_remover_no`` e ``_verificar_no``.
+    """
+
+    _CODIGO_INDICE = "i"
+
+    def __init__(self):
+        self.chaves = array("q", [0])
+        self.esquerda = array(self._CODIGO_INDICE, [NULO])
+        self.direita = array(self._CODIGO_INDICE, [NULO])
+        self.pai = array(self._CODIGO_INDICE, [NULO])
+        self.raiz = NULO
+        self._livre = NULO
+        self._quantidade = 0
+
+    def _vetores_extras(self) -> list:
+        """Retorna pares ``(vetor, valor_inicial)`` dos atributos da subclasse."""
+        return []
+
+    def _novo(self, chave: int) -> int:
+        """Aloca um nó (da lista livre ou no fim dos vetores) e retorna seu índice."""
+        if self._livre != NULO:
+            indice = self._livre
+            self._livre = self.esquerda[indice]
+            try:
+                self.chaves[indice] = chave
+            except (TypeError, OverflowError):
+                self.chaves = list(self.chaves)
+                self.chaves[indice] = chave
+            self.esquerda[indice] = NULO
+            self.direita[indice] = NULO
+            self.pai[indice] = NULO
+            for vetor, inicial in self._vetores_extras():
+                vetor[indice] = inicial
+        else:
+            indice = len(self.chaves)
+            try:
+                self.chaves.append(chave)
+            except (TypeError, OverflowError):
+                self.chaves = list(self.chaves)
+                self.chaves.append(chave)
+            self.esquerda.append(NULO)
+            self.direita.append(NULO)
+            self.pai.append(NULO)
+            for vetor, inicial in self._vetores_extras():
+                vetor.append(inicial)
+        self._quantidade += 1
+        return indice
+
+    def _liberar(self, indice: int) -> None:
+        """Devolve ``indice`` à lista livre."""
+        self.esquerda[indice] = self._livre
+        self.direita[indice] = NULO
+        self.pai[indice] = NULO
+        self._livre = indice
+        self._quantidade -= 1
+
+    def copiar(self) -> "ArvoreVetorial":
+        """Retorna uma cópia independente da árvore copiando apenas os buffers."""
+        copia = self.__class__.__new__(self.__class__)
+        for nome, valor in vars(self).items():
+            copiar = isinstance(valor, (array, list))
+            setattr(copia, nome, valor[:] if copiar else valor)
+        return copia
+
+    def __len__(self) -> int:
+        return self._quantidade
+
+    def _rotacao_esquerda(self, no_atual: int) -> None:
+        """Rotação à esquerda tendo ``no_atual`` como pivô.
+
+        Args:
+            no_atual (int): Índice do nó pivô.
+        """
+        esquerda, direita, pai = self.esquerda, self.direita, self.pai
+        novo_pai = direita[no_atual]
+        novo_filho = esquerda[novo_pai]
+        no_avo = pai[no_atual]
+
+        direita[no_atual] = novo_filho
+        if novo_filho != NULO:
+            pai[novo_filho] = no_atual
+
+        pai[novo_pai] = no_avo
+        if no_avo == NULO:
+            self.raiz = novo_pai
+        elif esquerda[no_avo] == no_atual:
+            esquerda[no_avo] = novo_pai
+        else:
+            direita[no_avo] = novo_pai
+
+        esquerda[novo_pai] = no_atual
+        pai[no_atual] = novo_pai
+
+    def _rotacao_direita(self, no_atual: int) -> None:
+        """Rotação à direita tendo ``no_atual`` como pivô.
+
+        Args:
+            no_atual (int): Índice do nó pivô.
+        """
+        esquerda, direita, pai = self.esquerda, self.direita, self.pai
+        novo_pai = esquerda[no_atual]
+        novo_filho = direita[novo_pai]
+        no_avo = pai[no_atual]
+
+        esquerda[no_atual] = novo_filho
+        if novo_filho != NULO:
+            pai[novo_filho] = no_atual
+
+        pai[novo_pai] = no_avo
+        if no_avo == NULO:
+            self.raiz = novo_pai
+        elif esquerda[no_avo] == no_atual:
+            esquerda[no_avo] = novo_pai
+        else:
+            direita[no_avo] = novo_pai
+
+        direita[novo_pai] = no_atual
+        pai[no_atual] = novo_pai
+
+    def _transplantar(self, antigo: int, novo: int) -> None:
+        """Coloca ``novo`` no lugar de ``antigo`` junto ao pai deste.
+
+        O ``pai`` de ``novo`` é atribuído mesmo quando ele é o sentinela,
+        o que a remoção rubro-negra usa para subir a partir de um nulo.
+        """
+        pai = self.pai[antigo]
+        if pai == NULO:
+            self.raiz = novo
+        elif self.esquerda[pai] == antigo:
+            self.esquerda[pai] = novo
+        else:
+            self.direita[pai] = novo
+        self.pai[novo] = pai
+
+    def _minimo(self, no: int) -> int:
+        """Retorna o índice do menor nó da subárvore de ``no``."""
+        esquerda = self.esquerda
+        while esquerda[no] != NULO:
+            no = esquerda[no]
+        return no
+
+    def _maximo(self, no: int) -> int:
+        """Retorna o índice do maior nó da subárvore de ``no``."""
+        direita = self.direita
+        while direita[no] != NULO:
+            no = direita[no]
+        return no
+
+    def _proximo(self, no: int) -> int:
+        """Retorna o nó seguinte a ``no`` em ordem, ou ``NULO``."""
+        if self.direita[no] != NULO:
+            return self._minimo(self.direita[no])
+        pai = self.pai[no]
+        while pai != NULO and no == self.direita[pai]:
+            no = pai
+            pai = self.pai[pai]
+        return pai
+
+    def _anterior(self, no: int) -> int:
+        """Retorna o nó anterior a ``no`` em ordem, ou ``NULO``."""
+        if self.esquerda[no] != NULO:
+            return self._maximo(self.esquerda[no])
+        pai = self.pai[no]
+        while pai != NULO and no == self.esquerda[pai]:
+            no = pai
+            pai = self.pai[pai]
+        return pai
+
+    def _localizar(self, chave: int) -> int:
+        """Retorna o índice do nó com ``chave``, ou ``NULO``."""
+        chaves, esquerda, direita = self.chaves, self.esquerda, self.direita
+        no = self.raiz
+        while no != NULO:
+            atual = chaves[no]
+            if chave < atual:
+                no = esquerda[no]
+            elif atual < chave:
+                no = direita[no]
+            else:
+                return no
+        return NULO
+
+    def buscar(self, chave: int) -> NoVetorial | None:
+        """Busca uma ``chave`` na árvore e retorna uma visão do nó.
+
+        Args:
+            chave (int): Chave desejada.
+
+        Returns:
+            NoVetorial | None: Visão do nó, ou ``None`` se não existir.
+        """
+        no = self._localizar(chave)
+        return NoVetorial(self, no) if no != NULO else None
+
+    def __contains__(self, chave: int) -> bool:
+        return self._localizar(chave) != NULO
+
+    def intervalo(self, a: int, b: int, reverso: bool = False) -> Iterator[int]:
+        """Itera as chaves no intervalo semiaberto ``[a, b)``.
+
+        Uma descida localiza a primeira chave e o resto segue pelos
+        vetores ``pai``, em O(log n + k) como em ``ArvoreBST.intervalo``.
+
+        Args:
+            a (int): Limite inferior (inclusivo).
+            b (int): Limite superior (exclusivo).
+            reverso (bool, optional): Se ``True``, produz em ordem decrescente.
+
+        Yields:
+            int: Chaves dentro do intervalo.
+        """
+        chaves, esquerda, direita = self.chaves, self.esquerda, self.direita
+        no = self.raiz
+        inicio = NULO
+        while no != NULO:
+            if reverso:
+                if chaves[no] < b:
+                    inicio, no = no, direita[no]
+                else:
+                    no = esquerda[no]
+            elif chaves[no] < a:
+                no = direita[no]
+            else:
+                inicio, no = no, esquerda[no]
+        no = inicio
+        if reverso:
+            while no != NULO and not chaves[no] < a:
+                yield chaves[no]
+                no = self._anterior(no)
+        else:
+            while no != NULO and chaves[no] < b:
+                yield chaves[no]
+                no = self._proximo(no)
+
+    def inserir(self, chave: int) -> bool:
+        """Insere uma ``chave`` e reequilibra a árvore se necessário.
+
+        Args:
+            chave (int): Chave a inserir.
+
+        Returns:
+            bool: ``True`` se a chave era nova.
+        """
+        chaves, esquerda, direita = self.chaves, self.esquerda, self.direita
+        pai = NULO
+        no = self.raiz
+        while no != NULO:
+            pai = no
+            atual = chaves[no]
+            if chave < atual:
+                no = esquerda[no]
+            elif atual < chave:
+                no = direita[no]
+            else:
+                return False
+
+        novo = self._novo(chave)
+        self.pai[novo] = pai
+        if pai == NULO:
+            self.raiz = novo
+        elif chave < chaves[pai]:
+            esquerda[pai] = novo
+        else:
+            direita[pai] = novo
+        self._apos_inserir(novo)
+        return True
+
+    def remover(self, chave: int) -> bool:
+        """Remove a ``chave`` e reequilibra a árvore se necessário.
+
+        Um nó com dois filhos recebe a chave do sucessor, que é quem
+        sai fisicamente da árvore.
+
+        Args:
+            chave (int): Chave a remover.
+
+        Returns:
+            bool: ``True`` se a chave existia.
+        """
+        no = self._localizar(chave)
+        if no == NULO:
+            return False
+        if self.esquerda[no] != NULO and self.direita[no] != NULO:
+            sucessor = self._minimo(self.direita[no])
+            self.chaves[no] = self.chaves[sucessor]
+            no = sucessor
+        self._remover_no(no)
+        self._liberar(no)
+        return True
+
+    @abstractmethod
+    def _apos_inserir(self, no: int) -> None:
+        """Reequilibra a árvore depois que ``no`` foi ligado como folha."""
+
+    @abstractmethod
+    def _remover_no(self, no: int) -> None:
+        """Desliga ``no`` (com no máximo um filho) e reequilibra a árvore."""
+
+    @abstractmethod
+    def _verificar_no(self, no: int) -> bool:
+        """Confere o balanceamento de ``no``, com os filhos já verificados."""
+
+    def validar_propriedades(self) -> bool:
+        """Valida ordem, ponteiros ``pai``, contagem e o balanceamento de cada nó.
+
+        Percorre em pós-ordem com pilha explícita, então ``_verificar_no``
+        vê cada nó depois dos filhos.
+
+        Returns:
+            bool: ``True`` se todas as propriedades são satisfeitas.
+        """
+        if self.raiz != NULO and self.pai[self.raiz] != NULO:
+            return False
+        chaves = self.chaves
+        anterior = NULO
+        for no in self._em_ordem():
+            if anterior != NULO and not chaves[anterior] < chaves[no]:
+                return False
+            anterior = no
+        quantidade = 0
+        for no in self._pos_ordem():
+            quantidade += 1
+            for filho in (self.esquerda[no], self.direita[no]):
+                if filho != NULO and self.pai[filho] != no:
+                    return False
+            if not self._verificar_no(no):
+                return False
+        return quantidade == self._quantidade
+
+    def _descrever(self, no: int) -> str:
+        return f"{self.chaves[no]}"
+
+    def _pre_ordem(self) -> Iterator[int]:
+        pilha = [self.raiz] if self.raiz != NULO else []
+        while pilha:
+            no = pilha.pop()
+            yield no
+            if self.direita[no] != NULO:
+                pilha.append(self.direita[no])
+            if self.esquerda[no] != NULO:
+                pilha.append(self.esquerda[no])
+
+    def _em_ordem(self) -> Iterator[int]:
+        pilha = []
+        no = self.raiz
+        while pilha or no != NULO:
+            while no != NULO:
+                pilha.append(no)
+                no = self.esquerda[no]
+            no = pilha.pop()
+            yield no
+            no = self.direita[no]
+
+    def _pos_ordem(self) -> Iterator[int]:
+        pilha = []
+        ultimo = NULO
+        no = self.raiz
+        while pilha or no != NULO:
+            while no != NULO:
+                pilha.append(no)
+                no = self.esquerda[no]
+            topo = pilha[-1]
+            direita = self.direita[topo]
+            if direita != NULO and direita != ultimo:
+                no = direita
+            else:
+                ultimo = pilha.pop()
+                yield ultimo
+
+    def __iter__(self) -> Iterator[int]:
+        chaves = self.chaves
+        for no in self._em_ordem():
+            yield chaves[no]
+
+    def mostrar(self, ordem: str = "em_ordem") -> list:
+        """Retorna visões dos nós conforme a ordem solicitada.
+
+        Args:
+            ordem (str, optional): Uma entre ``"pre_ordem"``, ``"em_ordem"`` (padrão)
+                ou ``"pos_ordem"``.
+
+        Returns:
+            list: Nós (``NoVetorial``) na ordem escolhida.
+
+        Raises:
+            ValueError: Se ``ordem`` não for uma das opções válidas.
+        """
+        if ordem == "pre_ordem":
+            percurso = self._pre_ordem()
+        elif ordem == "em_ordem":
+            percurso = self._em_ordem()
+        elif ordem == "pos_ordem":
+            percurso = self._pos_ordem()
+        else:
+            raise ValueError(
+                "Ordem inválida. Use 'pre_ordem', 'em_ordem' ou 'pos_ordem'."
+            )
+        return [NoVetorial(self, no) for no in percurso]
+
+
+class ArvoreAVLVetorial(ArvoreVetorial):
+    """Árvore AVL sobre o motor vetorial; alturas ficam em ``array('b')``."""
+
+    def __init__(self):
+        super().__init__()
+        self.alturas = array("b", [0])
+
+    def _vetores_extras(self) -> list:
+        return [(self.alturas, 1)]
+
+    def _atualizar(self, no: int) -> None:
+        alturas = self.alturas
+        altura_esquerda = alturas[self.esquerda[no]]
+        altura_direita = alturas[self.direita[no]]
+        alturas[no] = 1 + (
+            altura_esquerda if altura_esquerda > altura_direita else altura_direita
+        )
+
+    def _fator_balanceamento(self, no: int) -> int:
+        return self.alturas[self.esquerda[no]] - self.alturas[self.direita[no]]
+
+    def _rotacao_esquerda(self, no_atual: int) -> None:
+        novo_pai = self.direita[no_atual]
+        super()._rotacao_esquerda(no_atual)
+        self._atualizar(no_atual)
+        self._atualizar(novo_pai)
+
+    def _rotacao_direita(self, no_atual: int) -> None:
+        novo_pai = self.esquerda[no_atual]
+        super()._rotacao_direita(no_atual)
+        self._atualizar(no_atual)
+        self._atualizar(novo_pai)
+
+    def _reequilibrar(self, no: int) -> None:
+        """Reequilibra de ``no`` até a raiz com rotações simples ou duplas."""
+        while no != NULO:
+            self._atualizar(no)
+            fator = self._fator_balanceamento(no)
+            if fator > 1:
+                if self._fator_balanceamento(self.esquerda[no]) < 0:
+                    self._rotacao_esquerda(self.esquerda[no])
+                self._rotacao_direita(no)
+            elif fator < -1:
+                if self._fator_balanceamento(self.direita[no]) > 0:
+                    self._rotacao_direita(self.direita[no])
+                self._rotacao_esquerda(no)
+            no = self.pai[no]
+
+    def _apos_inserir(self, no: int) -> None:
+        self._reequilibrar(self.pai[no])
+
+    def _remover_no(self, no: int) -> None:
+        filho = self.esquerda[no] if self.esquerda[no] != NULO else self.direita[no]
+        pai = self.pai[no]
+        self._transplantar(no, filho)
+        self.pai[NULO] = NULO
+        self._reequilibrar(pai)
+
+    def _verificar_no(self, no: int) -> bool:
+        """Confere a altura em cache e o fator de balanceamento de ``no``."""
+        alturas = self.alturas
+        esperada = 1 + max(alturas[self.esquerda[no]], alturas[self.direita[no]])
+        return alturas[no] == esperada and abs(self._fator_balanceamento(no)) <= 1
+
+    def _descrever(self, no: int) -> str:
+        return (
+            f"{self.chaves[no]} (Altura: {self.alturas[no]}, "
+            f"FB: {self._fator_balanceamento(no)})"
+        )
+
+
+class ArvoreRubroNegroVetorial(ArvoreVetorial):
+    """Árvore Rubro-Negra sobre o motor vetorial; cores em ``array('b')``.
+
+    Cor ``1`` é vermelho e ``0`` é preto; o sentinela é preto.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.cores = array("b", [0])
+
+    def _vetores_extras(self) -> list:
+        return [(self.cores, 1)]
+
+    def _apos_inserir(self, no: int) -> None:
+        """Corrige violações de cor após inserção (casos do tio e rotações)."""
+        cores, pai = self.cores, self.pai
+        esquerda, direita = self.esquerda, self.direita
+        while cores[pai[no]]:
+            mae = pai[no]
+            avo = pai[mae]
+            if mae == esquerda[avo]:
+                tio = direita[avo]
+                if cores[tio]:
+                    cores[mae] = cores[tio] = 0
+                    cores[avo] = 1
+                    no = avo
+                    continue
+                if no == direita[mae]:
+                    no = mae
+                    self._rotacao_esquerda(no)
+                    mae = pai[no]
+                cores[mae] = 0
+                cores[avo] = 1
+                self._rotacao_direita(avo)
+            else:
+                tio = esquerda[avo]
+                if cores[tio]:
+                    cores[mae] = cores[tio] = 0
+                    cores[avo] = 1
+                    no = avo
+                    continue
+                if no == esquerda[mae]:
+                    no = mae
+                    self._rotacao_direita(no)
+                    mae = pai[no]
+                cores[mae] = 0
+                cores[avo] = 1
+                self._rotacao_esquerda(avo)
+        cores[self.raiz] = 0
+
+    def _remover_no(self, no: int) -> None:
+        filho = self.esquerda[no] if self.esquerda[no] != NULO else self.direita[no]
+        self._transplantar(no, filho)
+        if not self.cores[no]:
+            self._balancear_remocao(filho)
+        self.pai[NULO] = NULO
+
+    def _balancear_remocao(self, no: int) -> None:
+        """Elimina o "preto extra" deixado em ``no`` após a remoção."""
+        cores, pai = self.cores, self.pai
+        esquerda, direita = self.esquerda, self.direita
+        while no != self.raiz and not cores[no]:
+            mae = pai[no]
+            if no == esquerda[mae]:
+                irmao = direita[mae]
+                if cores[irmao]:
+                    cores[irmao] = 0
+                    cores[mae] = 1
+                    self._rotacao_esquerda(mae)
+                    irmao = direita[mae]
+                if not cores[esquerda[irmao]] and not cores[direita[irmao]]:
+                    cores[irmao] = 1
+                    no = mae
+                else:
+                    if not cores[direita[irmao]]:
+                        cores[esquerda[irmao]] = 0
+                        cores[irmao] = 1
+                        self._rotacao_direita(irmao)
+                        irmao = direita[mae]
+                    cores[irmao] = cores[mae]
+                    cores[mae] = 0
+                    cores[direita[irmao]] = 0
+                    self._rotacao_esquerda(mae)
+                    no = self.raiz
+            else:
+                irmao = esquerda[mae]
+                if cores[irmao]:
+                    cores[irmao] = 0
+                    cores[mae] = 1
+                    self._rotacao_direita(mae)
+                    irmao = esquerda[mae]
+                if not cores[esquerda[irmao]] and not cores[direita[irmao]]:
+                    cores[irmao] = 1
+                    no = mae
+                else:
+                    if not cores[esquerda[irmao]]:
+                        cores[direita[irmao]] = 0
+                        cores[irmao] = 1
+                        self._rotacao_esquerda(irmao)
+                        irmao = esquerda[mae]
+                    cores[irmao] = cores[mae]
+                    cores[mae] = 0
+                    cores[esquerda[irmao]] = 0
+                    self._rotacao_direita(mae)
+                    no = self.raiz
+        cores[no] = 0
+
+    def _altura_negra(self, no: int) -> int:
+        """Altura-negra de ``no`` pela convenção de ``NoRN`` (nulo conta 1)."""
+        altura = 1
+        while no != NULO:
+            altura += 0 if self.cores[no] else 1
+            no = self.esquerda[no]
+        return altura
+
+    def _verificar_no(self, no: int) -> bool:
+        """Confere que um nó vermelho não tem filho vermelho."""
+        cores = self.cores
+        return not (
+            cores[no] and (cores[self.esquerda[no]] or cores[self.direita[no]])
+        )
+
+    def validar_propriedades(self) -> bool:
+        """Valida a estrutura, raiz preta, ausência de vermelho-vermelho e altura-negra.
+
+        Returns:
+            bool: ``True`` se todas as propriedades são satisfeitas.
+        """
+        if self.cores[self.raiz] or not super().validar_propriedades():
+            return False
+        esperada = self._altura_negra(self.raiz)
+        pilha = [(self.raiz, 1)] if self.raiz != NULO else []
+        while pilha:
+            no, pretos = pilha.pop()
+            pretos += 0 if self.cores[no] else 1
+            for filho in (self.esquerda[no], self.direita[no]):
+                if filho == NULO:
+                    if pretos != esperada:
+                        return False
+                else:
+                    pilha.append((filho, pretos))
+        return True
+
+    def _descrever(self, no: int) -> str:
+        cor = "V" if self.cores[no] else "P"
+        return f"{self.chaves[no]} ({cor}, AN: {self._altura_negra(no)})"